@@ -0,0 +1,62 @@
+import base64
+import binascii
+import json
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from consultas import CARREGAR_BENEFICIARIOS
+from models import FuncionarioDB, HorizonteSequencia
+
+# 🔁 Feed de alterações (`changed_since`): funcionários gravados depois de um token
+# O token guarda a sequência (e, no meio de uma transação grande, o último id) já entregue ao cliente.
+# Só entram sequências abaixo do horizonte (models.HorizonteSequencia): uma transação ainda em
+# andamento não pode confirmar depois uma alteração atrás do token. O custo depende de quantos
+# funcionários mudaram, não do tamanho do quadro (índice sequencia, id)
+Posicao = Tuple[int, Optional[int]]  # (sequência, último id entregue dela ou None = todos)
+
+def codificar_token(sequencia: int, ultimo_id: Optional[int] = None) -> str:
+    dados = {"seq": sequencia} if ultimo_id is None else {"seq": sequencia, "id": ultimo_id}
+    bruto = json.dumps(dados, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+def decodificar_token(token: str) -> Posicao:
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        sequencia, ultimo_id = dados["seq"], dados.get("id")
+        if not isinstance(sequencia, int) or not (ultimo_id is None or isinstance(ultimo_id, int)):
+            raise ValueError("token inválido")
+        return sequencia, ultimo_id
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token de alterações inválido")
+
+async def token_atual(db: AsyncSession) -> str:
+    """Token que marca "tudo até agora": o cliente o pega antes de carregar a lista completa."""
+    return codificar_token(await db.scalar(select(HorizonteSequencia() - 1)))
+
+def consulta_alteracoes(posicao: Posicao, limit: int) -> Select:
+    """Até `limit` + 1 funcionários gravados depois da posição e abaixo do horizonte (o extra indica se há mais)."""
+    sequencia, ultimo_id = posicao
+    depois = FuncionarioDB.sequencia > sequencia
+    if ultimo_id is not None:
+        depois = or_(depois, and_(FuncionarioDB.sequencia == sequencia, FuncionarioDB.id > ultimo_id))
+    return (
+        select(FuncionarioDB).options(CARREGAR_BENEFICIARIOS).where(depois, FuncionarioDB.sequencia < HorizonteSequencia())
+        .order_by(FuncionarioDB.sequencia, FuncionarioDB.id).limit(limit + 1)
+    )
+
+async def alteracoes_desde(db: AsyncSession, token: str, limit: int) -> Tuple[List[FuncionarioDB], str, bool]:
+    """
+    Funcionários gravados depois do token, ordenados por (sequência, id).
+    :return: (funcionários, token para a próxima consulta, se há mais alterações além de `limit`).
+    """
+    registros = (await db.scalars(consulta_alteracoes(decodificar_token(token), limit))).all()
+    if not registros:
+        return [], token, False
+
+    mais = len(registros) > limit
+    registros = registros[:limit]
+    ultimo = registros[-1]
+    # Com mais linhas da mesma sequência pela frente, o token guarda o id; senão, a sequência inteira foi entregue
+    return list(registros), codificar_token(ultimo.sequencia, ultimo.id if mais else None), mais
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from typing import Optional
+from pydantic import ValidationError
+from sqlalchemy import Update, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import AtualizacaoLote, FiltroFuncionarios, FuncionarioDB, FuncionarioUpdate
+
+# 📦 Atualização em lote: um único UPDATE ... WHERE no banco, em vez de um PUT por funcionário
+# CPF é único (não faz sentido em lote) e beneficiários ficam em outra tabela
+CAMPOS_LOTE = [c for c in FuncionarioUpdate.model_fields if c not in ("cpf", "beneficiarios")]
+
+def _condicoes(filtro: FiltroFuncionarios) -> list:
+    condicoes = []
+    if filtro.departamento:
+        condicoes.append(FuncionarioDB.departamento == filtro.departamento)
+    if filtro.cargo:
+        condicoes.append(FuncionarioDB.cargo == filtro.cargo)
+    if filtro.ativo is not None:
+        condicoes.append(FuncionarioDB.ativo == filtro.ativo)
+    if filtro.ids:
+        condicoes.append(FuncionarioDB.id.in_(filtro.ids))
+    return condicoes
+
+def _valor_validado(campo: str, valor) -> object:
+    """Valida e converte o valor com as mesmas regras do PUT (FuncionarioUpdate)."""
+    if campo not in CAMPOS_LOTE:
+        raise ValueError(f"Campo não pode ser alterado em lote: {campo}")
+    if valor is None and not FuncionarioDB.__table__.columns[campo].nullable:
+        raise ValueError(f"Campo obrigatório não pode ser vazio: {campo}")
+    try:
+        return getattr(FuncionarioUpdate.model_validate({campo: valor}), campo)
+    except ValidationError as e:
+        raise ValueError(f"{campo}: {e.errors()[0]['msg']}")
+
+def montar_atualizacao(pedido: AtualizacaoLote) -> Update:
+    """
+    Monta o UPDATE da operação pedida sobre os funcionários do filtro.
+    :raises ValueError: Campo inexistente, protegido ou com valor inválido.
+    """
+    if pedido.operacao == "definir_campo":
+        valores = {pedido.campo: _valor_validado(pedido.campo, pedido.valor)}
+    elif pedido.operacao == "reajustar_salario":
+        fator = Decimal(str(100 + pedido.percentual)) / 100
+        valores = {"salario": func.round(FuncionarioDB.salario * fator, 2)}
+    else:
+        valores = {"departamento": pedido.departamento}
+
+    valores["versao"] = FuncionarioDB.versao + 1  # Invalida ETags e If-Match; atualizado_em tem onupdate
+    # synchronize_session=False: nenhum objeto da sessão precisa refletir a alteração
+    consulta = update(FuncionarioDB).where(*_condicoes(pedido.filtro)).values(valores).execution_options(synchronize_session=False)
+    return consulta.returning(FuncionarioDB.id) if pedido.retornar_ids else consulta
+
+async def executar_atualizacao(db: AsyncSession, pedido: AtualizacaoLote) -> dict:
+    """
+    Executa a atualização em uma única transação.
+    :return: Dicionário no formato de `ResultadoLote`.
+    """
+    resultado = await db.execute(montar_atualizacao(pedido))
+    ids: Optional[list] = sorted(resultado.scalars().all()) if pedido.retornar_ids else None
+    afetados = len(ids) if ids is not None else resultado.rowcount
+    await db.commit()
+    return {"afetados": afetados, "ids": ids}
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import insert
+
+import database
+from auth import UsuarioAutenticado
+from metricas import Contador, Medidor, registro
+from models import AuditoriaFuncionarioDB, BeneficiarioBase, FuncionarioDB
+
+logger = logging.getLogger(__name__)
+
+# 📝 Auditoria das alterações de funcionários com gravação atrasada (write-behind)
+# As rotas só enfileiram a diferença; a tarefa iniciada no lifespan grava em lote, fora da transação
+# da requisição. Com a fila cheia a rota espera (contrapressão) em vez de descartar registros
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+AUDIT_FLUSH_INTERVAL_MS = float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", 200))
+
+auditoria_gravados = registro.registrar(Contador(
+    "rh_auditoria_gravados_total", "Registros de auditoria gravados"))
+auditoria_falhas = registro.registrar(Contador(
+    "rh_auditoria_falhas_total", "Registros de auditoria perdidos por erro na gravação"))
+auditoria_pendentes = registro.registrar(Medidor(
+    "rh_auditoria_pendentes", "Registros de auditoria aguardando gravação"))
+
+_FIM = object()  # Sentinela de encerramento: a tarefa grava o que restou e termina
+
+def _valor(valor: Any) -> Any:
+    """Valor em formato JSON (Decimal como número, datas em ISO 8601)."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+def _beneficiarios(beneficiarios: Iterable) -> List[dict]:
+    return [
+        {campo: _valor(getattr(b, campo)) for campo in BeneficiarioBase.model_fields}
+        for b in beneficiarios
+    ]
+
+def diferencas(funcionario: FuncionarioDB, dados: Dict[str, Any],
+               beneficiarios: Optional[List[BeneficiarioBase]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Campos que `dados` (o `model_dump(exclude_unset=True)` do FuncionarioUpdate) realmente altera.
+    Chamar antes de aplicar os valores ao objeto; os beneficiários precisam estar carregados.
+    :return: {campo: {"anterior": valor atual, "novo": valor pedido}}.
+    """
+    alteracoes = {}
+    for campo, novo in dados.items():
+        anterior = _valor(getattr(funcionario, campo))
+        if anterior != _valor(novo):
+            alteracoes[campo] = {"anterior": anterior, "novo": _valor(novo)}
+    if beneficiarios is not None:
+        anteriores, novos = _beneficiarios(funcionario.beneficiarios), _beneficiarios(beneficiarios)
+        if anteriores != novos:
+            alteracoes["beneficiarios"] = {"anterior": anteriores, "novo": novos}
+    return alteracoes
+
+class FilaAuditoria:
+    """Fila limitada em memória, esvaziada em lotes (um INSERT por lote) por uma tarefa em segundo plano."""
+
+    def __init__(self, tamanho: int = AUDIT_QUEUE_SIZE):
+        self.tamanho = tamanho
+        self._fila: Optional[asyncio.Queue] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        registro.coletar_ao_exportar(lambda: auditoria_pendentes.definir(valor=self.pendentes))
+
+    @property
+    def pendentes(self) -> int:
+        return self._fila.qsize() if self._fila is not None else 0
+
+    def _em_execucao(self) -> bool:
+        """A tarefa de gravação está ativa e pertence ao event loop atual."""
+        return (self._tarefa is not None and not self._tarefa.done()
+                and self._tarefa.get_loop() is asyncio.get_running_loop())
+
+    def iniciar(self) -> None:
+        """Cria a fila e a tarefa de gravação no event loop atual (chamado no startup)."""
+        if self._tarefa is not None and not self._tarefa.done():
+            return  # Já iniciada por outra instância do app neste processo (ex.: testes)
+        self._fila = asyncio.Queue(maxsize=self.tamanho)
+        self._tarefa = asyncio.create_task(self._gravar_continuamente(), name="auditoria")
+
+    async def encerrar(self) -> None:
+        """Grava tudo o que ainda está na fila e finaliza a tarefa (chamado no shutdown)."""
+        if not self._em_execucao():
+            return
+        await self._fila.put(_FIM)
+        await self._tarefa
+        self._tarefa = None
+
+    async def registrar(self, funcionario_id: int, acao: str, alteracoes: Dict[str, Any],
+                        usuario: Optional[UsuarioAutenticado]) -> None:
+        """Enfileira um registro de auditoria; a gravação acontece em até AUDIT_FLUSH_INTERVAL_MS."""
+        item = {
+            "funcionario_id": funcionario_id,
+            "acao": acao,
+            "alteracoes": alteracoes,
+            "usuario_id": usuario.id if usuario else None,
+            "usuario_email": usuario.email if usuario else None,
+            "alterado_em": datetime.utcnow(),
+        }
+        if not self._em_execucao():
+            await self._gravar([item])  # Sem a tarefa (scripts, app sem lifespan): grava na hora
+            return
+        await self._fila.put(item)
+
+    async def _gravar(self, itens: List[dict]) -> None:
+        try:
+            async with database.async_engine.begin() as conexao:
+                await conexao.execute(insert(AuditoriaFuncionarioDB), itens)
+            auditoria_gravados.incrementar(valor=len(itens))
+        except Exception as e:
+            auditoria_falhas.incrementar(valor=len(itens))
+            logger.error(f"❌ {len(itens)} registros de auditoria não gravados: {e}")
+
+    def _retirar_disponiveis(self, itens: list) -> list:
+        while len(itens) < AUDIT_BATCH_SIZE and not self._fila.empty():
+            itens.append(self._fila.get_nowait())
+        return itens
+
+    async def _gravar_continuamente(self) -> None:
+        encerrando = False
+        while not (encerrando and self._fila.empty()):
+            if encerrando:
+                itens = self._retirar_disponiveis([])
+            else:
+                itens = [await self._fila.get()]
+                if itens[0] is not _FIM:
+                    await asyncio.sleep(AUDIT_FLUSH_INTERVAL_MS / 1000)  # Junta as alterações do intervalo
+                self._retirar_disponiveis(itens)
+            encerrando = encerrando or any(item is _FIM for item in itens)
+            itens = [item for item in itens if item is not _FIM]
+            if itens:
+                await self._gravar(itens)
+
+fila_auditoria = FilaAuditoria()
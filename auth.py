@@ -1,13 +1,18 @@
 from datetime import datetime, timedelta
+import asyncio
 import os
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional, Tuple
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
 from models import TokenData
-from database import get_db, UsuarioRH as UsuarioRHDB
-from sqlalchemy.orm import Session
+from database import sessao_leitura, sessao_primario, UsuarioRH as UsuarioRHDB
+from cache import CacheTTL
+from instrumentacao import acrescentar_orcamento_sql
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
 
 # 🔐 Carregando Configurações Seguras do .env
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -17,8 +22,44 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY não está definida no .env!")
 
+# 🗃️ Cache de tokens decodificados e de usuários autenticados
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 60))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", 4096))
+# Janela (em segundos desde a emissão) em que id/nível do token são aceitos sem consultar o banco; 0 desativa
+AUTH_TRUST_TOKEN_CLAIMS_SECONDS = float(os.getenv("AUTH_TRUST_TOKEN_CLAIMS_SECONDS", 0))
+
+cache_tokens = CacheTTL(tamanho_maximo=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+cache_usuarios = CacheTTL(tamanho_maximo=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
 # 🔒 Configuração de Criptografia de Senha
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Custo fixo (mínimo = máximo): hashes com outro custo são refeitos no próximo login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# passlib e jose só são importados no primeiro uso: não pesam na inicialização dos workers
+_pwd_context = None
+
+class TokenInvalido(Exception):
+    """Token JWT malformado, com assinatura inválida ou expirado."""
+
+def _obter_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=BCRYPT_ROUNDS,
+            bcrypt__min_rounds=BCRYPT_ROUNDS,
+            bcrypt__max_rounds=BCRYPT_ROUNDS
+        )
+    return _pwd_context
+
+# ⚙️ Hash de senha fora do event loop (pool de processos limitado)
+PASSWORD_HASH_OFFLOAD = os.getenv("PASSWORD_HASH_OFFLOAD", "true").lower() == "true"
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+LOGIN_MAX_CONCURRENCY = int(os.getenv("LOGIN_MAX_CONCURRENCY", PASSWORD_HASH_WORKERS * 2))
+
+_executor_senhas: Optional[ProcessPoolExecutor] = None
+limite_login = asyncio.Semaphore(LOGIN_MAX_CONCURRENCY)
 
 # 🔑 Configuração do OAuth2 para autenticação via Swagger
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/rh/login", scheme_name="Bearer")
@@ -26,12 +67,50 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/rh/login", scheme_name="B
 # 🔑 Função para criar hash de senha
 def criar_hash_senha(senha: str) -> str:
     """Gera um hash seguro para a senha."""
-    return pwd_context.hash(senha)
+    return _obter_pwd_context().hash(senha)
 
 # 🔍 Função para verificar senha
 def verificar_senha(senha: str, hash_senha: str) -> bool:
     """Verifica se a senha fornecida corresponde ao hash armazenado."""
-    return pwd_context.verify(senha, hash_senha)
+    return _obter_pwd_context().verify(senha, hash_senha)
+
+def _verificar_e_atualizar(senha: str, hash_senha: str) -> Tuple[bool, Optional[str]]:
+    """Verifica a senha e, se o hash estiver com custo desatualizado, devolve um novo hash."""
+    return _obter_pwd_context().verify_and_update(senha, hash_senha)
+
+def _obter_executor_senhas() -> ProcessPoolExecutor:
+    global _executor_senhas
+    if _executor_senhas is None:
+        _executor_senhas = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    return _executor_senhas
+
+def encerrar_executor_senhas() -> None:
+    """Finaliza o pool de processos de hash (chamado no shutdown da aplicação)."""
+    global _executor_senhas
+    if _executor_senhas is not None:
+        _executor_senhas.shutdown(wait=False, cancel_futures=True)
+        _executor_senhas = None
+
+async def _executar_hash(funcao, *args):
+    if not PASSWORD_HASH_OFFLOAD:
+        return await run_in_threadpool(funcao, *args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_obter_executor_senhas(), funcao, *args)
+
+async def criar_hash_senha_async(senha: str) -> str:
+    """Gera o hash da senha no pool de processos, sem bloquear o event loop."""
+    return await _executar_hash(criar_hash_senha, senha)
+
+async def verificar_senha_async(senha: str, hash_senha: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha no pool de processos.
+    :return: Tupla (senha válida, novo hash se o custo do pwd_context mudou ou None).
+    """
+    return await _executar_hash(_verificar_e_atualizar, senha, hash_senha)
+
+# 🔎 Consulta do usuário pelo email (login e validação do token)
+def consulta_usuario(email: str):
+    return select(UsuarioRHDB).where(UsuarioRHDB.email == email)
 
 # 🏷️ Função para criar token JWT
 def criar_access_token(data: dict) -> str:
@@ -41,20 +120,101 @@ def criar_access_token(data: dict) -> str:
     :return: Token JWT como string.
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    
+    agora = datetime.utcnow()
+    expire = agora + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": agora})
+
+    from jose import jwt
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# 👤 Usuário autenticado (cópia imutável, independente da sessão do banco)
+class UsuarioAutenticado(NamedTuple):
+    id: int
+    email: str
+    nome: str
+    nivel_acesso: str
+
+    @classmethod
+    def de_registro(cls, usuario: UsuarioRHDB) -> "UsuarioAutenticado":
+        return cls(id=usuario.id, email=usuario.email, nome=usuario.nome, nivel_acesso=usuario.nivel_acesso)
+
+def _decodificar_token(token: str) -> dict:
+    """
+    Decodifica o JWT, reaproveitando tokens já validados enquanto não expiram.
+    :raises TokenInvalido: Token inválido ou expirado.
+    """
+    payload = cache_tokens.obter(token)
+    if payload is None:
+        from jose import JWTError, jwt
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError as e:
+            raise TokenInvalido(str(e))
+        cache_tokens.definir(token, payload, ttl=payload.get("exp", 0) - time.time())
+    elif payload.get("exp", 0) <= time.time():
+        cache_tokens.invalidar(token)
+        raise TokenInvalido("Token expirado")
+    return payload
+
+def _usuario_das_claims(payload: dict) -> Optional[UsuarioAutenticado]:
+    """Monta o usuário a partir das claims do token, se estiver dentro da janela de confiança."""
+    if AUTH_TRUST_TOKEN_CLAIMS_SECONDS <= 0:
+        return None
+    emitido_em = payload.get("iat")
+    if payload.get("id") is None or emitido_em is None:
+        return None
+    if time.time() - emitido_em > AUTH_TRUST_TOKEN_CLAIMS_SECONDS:
+        return None
+    return UsuarioAutenticado(
+        id=payload["id"],
+        email=payload["sub"],
+        nome=payload.get("nome", ""),
+        nivel_acesso=payload["nivel"]
+    )
+
+def invalidar_usuario(email: Optional[str]) -> None:
+    """Remove um usuário do cache (chamado quando o cadastro é criado, alterado ou removido)."""
+    if email:
+        cache_usuarios.invalidar(email)
+
+def estatisticas_cache_auth() -> dict:
+    """Contadores de acerto/falha dos caches de autenticação."""
+    return {
+        "tokens": cache_tokens.estatisticas(),
+        "usuarios": cache_usuarios.estatisticas(),
+        "confiar_claims_segundos": AUTH_TRUST_TOKEN_CLAIMS_SECONDS,
+    }
+
+# Invalida só após o commit: no flush, uma leitura concorrente ainda vê a linha antiga e a devolveria ao cache
+@event.listens_for(UsuarioRHDB, "after_insert")
+@event.listens_for(UsuarioRHDB, "after_update")
+@event.listens_for(UsuarioRHDB, "after_delete")
+def _registrar_usuario_alterado(mapper, connection, target):
+    historico = inspect(target).attrs.email.history
+    alterados = object_session(target).info.setdefault("usuarios_alterados", set())
+    alterados.update(email for email in [target.email, *(historico.deleted or ())] if email)
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_usuarios_alterados(sessao):
+    for email in sessao.info.pop("usuarios_alterados", ()):
+        invalidar_usuario(email)
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_usuarios_alterados(sessao):
+    sessao.info.pop("usuarios_alterados", None)
+
 # 🔓 Função para obter usuário atual com base no token JWT
 async def get_usuario_atual(
-    token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> Optional[UsuarioRHDB]:
+    request: Request,
+    token: str = Depends(oauth2_scheme)
+) -> UsuarioAutenticado:
     """
     Obtém o usuário autenticado com base no token JWT.
+    Tokens decodificados e usuários resolvidos ficam em cache por AUTH_CACHE_TTL_SECONDS,
+    evitando uma consulta ao banco por requisição. Sem cache, a consulta usa uma sessão própria,
+    fechada antes da rota: a requisição nunca espera uma segunda conexão segurando a primeira.
+    :param request: Requisição (identifica o cliente para o roteamento de leituras).
     :param token: Token JWT do usuário.
-    :param db: Sessão do banco de dados.
     :return: Usuário autenticado.
     """
     credentials_exception = HTTPException(
@@ -65,7 +225,7 @@ async def get_usuario_atual(
     
     try:
         # Decodifica o token JWT
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decodificar_token(token)
         email: Optional[str] = payload.get("sub")
         nivel_acesso: Optional[str] = payload.get("nivel")
 
@@ -74,21 +234,35 @@ async def get_usuario_atual(
 
         token_data = TokenData(email=email, nivel_acesso=nivel_acesso)
 
-    except JWTError as e:
+    except TokenInvalido as e:
         print(f"[ERRO JWT] {str(e)}")  # Log de erro
         raise credentials_exception
+
+    usuario = _usuario_das_claims(payload) or cache_usuarios.obter(token_data.email)
+    if usuario:
+        return usuario
     
     # Verifica se o usuário existe no banco de dados
-    usuario = db.query(UsuarioRHDB).filter(UsuarioRHDB.email == token_data.email).first()
+    consulta = consulta_usuario(token_data.email)
+    async with sessao_leitura(request) as db:
+        na_replica = db.info.get("replica") is not None
+        registro = await db.scalar(consulta)
+    if not registro and na_replica:
+        # Cadastro recente que a réplica ainda não recebeu: confirma no primário (um comando a mais)
+        acrescentar_orcamento_sql(1)
+        async with sessao_primario() as primario:
+            registro = await primario.scalar(consulta)
     
-    if not usuario:
+    if not registro:
         print(f"[ERRO] Usuário não encontrado: {token_data.email}")  # Log para debug
         raise credentials_exception
-        
+
+    usuario = UsuarioAutenticado.de_registro(registro)
+    cache_usuarios.definir(token_data.email, usuario)
     return usuario
 
 # 🔐 Função para verificar se o usuário é administrador
-async def get_usuario_admin(usuario_atual: UsuarioRHDB = Depends(get_usuario_atual)) -> UsuarioRHDB:
+async def get_usuario_admin(usuario_atual: UsuarioAutenticado = Depends(get_usuario_atual)) -> UsuarioAutenticado:
     """
     Verifica se o usuário autenticado tem permissão de administrador.
     :param usuario_atual: Usuário autenticado.
@@ -0,0 +1,41 @@
+"""Utilitários compartilhados pelos benchmarks (banco SQLite temporário e estatísticas)."""
+import os
+import statistics
+import sys
+import tempfile
+from typing import Dict, List
+
+os.environ.setdefault("SECRET_KEY", "chave_de_benchmark_com_pelo_menos_32_caracteres")
+
+
+def preparar_banco(caminho: str = None, url: str = None) -> str:
+    """
+    Aponta a aplicação para o banco dos benchmarks e cria as tabelas: `url` (ou BENCH_DATABASE_URL,
+    ex.: um PostgreSQL local) ou, sem ela, um SQLite em `caminho` ou num diretório temporário.
+    Chamadas seguintes não trocam de banco (os engines já foram criados). Retorna o caminho ou a URL.
+    """
+    if "database" in sys.modules:
+        return os.environ["DATABASE_URL"]
+    url = url or os.getenv("BENCH_DATABASE_URL")
+    if url:
+        os.environ["DATABASE_URL"] = caminho = url
+    else:
+        caminho = caminho or os.path.join(tempfile.mkdtemp(prefix="bench_rh_"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{caminho}"
+
+    import database
+    import models  # noqa: F401 - registra as tabelas no metadata
+    database.Base.metadata.create_all(bind=database.engine)
+    return caminho
+
+
+def percentis(amostras_ms: List[float]) -> Dict[str, float]:
+    """Resumo p50/p95/p99 de uma lista de latências em milissegundos."""
+    if not amostras_ms:
+        return {"n": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordenadas = sorted(amostras_ms)
+
+    def p(q: float) -> float:
+        return round(ordenadas[min(len(ordenadas) - 1, int(q * len(ordenadas)))], 2)
+
+    return {"n": len(ordenadas), "media": round(statistics.fmean(ordenadas), 2), "p50": p(0.50), "p95": p(0.95), "p99": p(0.99)}
@@ -0,0 +1,69 @@
+"""
+Benchmark do índice de busca de funcionários (/funcionarios/search) em memória.
+
+Monta o índice com N funcionários sintéticos e mede a latência de consultas típicas
+(prefixo, nome completo, CPF, cargo, erro de digitação). Meta: p99 < 10 ms com 100k.
+
+Uso: python -m benchmarks.bench_busca [--funcionarios 100000] [--repeticoes 200]
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks._ambiente import percentis
+from busca import IndiceBusca
+
+PRIMEIROS_NOMES = [
+    "Ana", "João", "Maria", "José", "Antônio", "Francisca", "Carlos", "Paulo", "Pedro", "Lucas",
+    "Luiz", "Marcos", "Luís", "Gabriel", "Rafael", "Daniel", "Márcia", "Juliana", "Fernanda", "Patrícia",
+    "Aline", "Sandra", "Camila", "Amanda", "Bruna", "Letícia", "Júlia", "Beatriz", "Helena", "Conceição",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+    "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas",
+]
+CARGOS = ["Analista", "Assistente", "Coordenador", "Gerente", "Técnico", "Auxiliar", "Diretor", "Desenvolvedor"]
+DEPARTAMENTOS = ["TI", "RH", "Financeiro", "Vendas", "Operações", "Jurídico", "Logística", "Marketing"]
+
+CONSULTAS = ["ana", "joao silva", "concei", "maria oliveira santos", "123.456", "gerente vendas", "fereira", "desenvolvedor ti"]
+
+
+def registros_sinteticos(quantidade: int):
+    for i in range(1, quantidade + 1):
+        cpf = f"{random.randrange(10**11):011d}"
+        yield {
+            "id": i,
+            "nome": " ".join([random.choice(PRIMEIROS_NOMES), *random.sample(SOBRENOMES, 2)]),
+            "cpf": f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}",
+            "cargo": random.choice(CARGOS),
+            "departamento": random.choice(DEPARTAMENTOS),
+            "ativo": random.random() > 0.1,
+        }
+
+
+def main(funcionarios: int, repeticoes: int) -> None:
+    random.seed(42)
+    indice = IndiceBusca()
+    inicio = time.perf_counter()
+    indice.carregar(registros_sinteticos(funcionarios))
+    carga = time.perf_counter() - inicio
+
+    resultado = {"funcionarios": funcionarios, "carga_segundos": round(carga, 2), "consultas": {}}
+    for consulta in CONSULTAS:
+        latencias = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            indice.buscar(consulta, limit=20, ativo=True)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        resultado["consultas"][consulta] = percentis(latencias)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funcionarios", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+    main(args.funcionarios, args.repeticoes)
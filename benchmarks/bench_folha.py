@@ -0,0 +1,87 @@
+"""
+Benchmark da folha de pagamento (GET /folha): cálculo vetorizado em NumPy contra um laço
+ingênuo sobre objetos FuncionarioDB, medindo a leitura do banco e o cálculo separadamente.
+
+Uso: python -m benchmarks.bench_folha [--funcionarios 100000] [--repeticoes 5]
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+
+from benchmarks._ambiente import percentis, preparar_banco
+from benchmarks.gerador import popular
+
+preparar_banco()
+
+import database  # noqa: E402
+from folha import (  # noqa: E402
+    COLUNAS_FOLHA, FGTS_ALIQUOTA, FGTS_ALIQUOTA_APRENDIZ, FOLHA_SALARIO_MINIMO,
+    calcular_folha, carregar_colunas, consolidar_folha, obter_folha
+)
+from models import FuncionarioDB  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+
+def folha_por_objeto() -> dict:
+    """Versão ingênua: carrega objetos ORM completos e acumula funcionário a funcionário."""
+    totais = defaultdict(lambda: defaultdict(float))
+    with database.SessionLocal() as db:
+        for f in db.query(FuncionarioDB).filter(FuncionarioDB.ativo == True):
+            horista = "hora" in (f.tipo_pagamento or "").lower()
+            base = float(f.salario) * f.horas_mensais if horista else float(f.salario)
+            periculosidade = base * float(f.adicional_periculosidade or 0) / 100
+            insalubridade = FOLHA_SALARIO_MINIMO * float(f.adicional_insalubridade or 0) / 100
+            bruto = base + periculosidade + insalubridade
+            aliquota = FGTS_ALIQUOTA_APRENDIZ if "aprendiz" in (f.tipo_contrato or "").lower() else FGTS_ALIQUOTA
+            for chave in (f.departamento, None):
+                totais[chave]["funcionarios"] += 1
+                totais[chave]["bruto"] += bruto
+                totais[chave]["fgts"] += bruto * aliquota
+    return totais
+
+
+def medir(funcao, repeticoes: int):
+    latencias, resultado = [], None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return percentis(latencias), resultado
+
+
+def main(funcionarios: int, repeticoes: int) -> None:
+    popular(funcionarios)
+
+    with database.SessionLocal() as db:
+        linhas = db.execute(select(*COLUNAS_FOLHA).where(FuncionarioDB.ativo == True)).all()
+    colunas = carregar_colunas(linhas)
+
+    async def endpoint():
+        async with database.AsyncSessionLocal() as db:
+            return await obter_folha(db)
+
+    ingenuo, totais = medir(folha_por_objeto, repeticoes)
+    vetorizado, folha = medir(lambda: asyncio.run(endpoint()), repeticoes)
+    calculo, _ = medir(lambda: consolidar_folha(colunas, calcular_folha(colunas)), repeticoes)
+    transposicao, _ = medir(lambda: carregar_colunas(linhas), repeticoes)
+
+    diferenca = abs(totais[None]["bruto"] - folha["total"]["bruto"])
+    print(json.dumps({
+        "funcionarios": funcionarios,
+        "laco_por_objeto_ms": ingenuo,
+        "obter_folha_ms": vetorizado,
+        "somente_calculo_numpy_ms": calculo,
+        "somente_transposicao_ms": transposicao,
+        "aceleracao_p50": round(ingenuo["p50"] / vetorizado["p50"], 1),
+        "diferenca_bruto_total": round(diferenca, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funcionarios", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    main(args.funcionarios, args.repeticoes)
@@ -0,0 +1,67 @@
+"""
+Benchmark da importação em lote: gera um arquivo NDJSON/CSV sintético e mede linhas/segundo.
+
+Uso: python -m benchmarks.bench_importacao [--linhas 100000] [--lote 1000] [--formato ndjson]
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+from benchmarks._ambiente import preparar_banco
+from benchmarks.gerador import funcionarios
+
+preparar_banco()
+
+import database  # noqa: E402
+from importacao import importar_funcionarios  # noqa: E402
+
+
+def gerar_arquivo(linhas: int, formato: str) -> str:
+    caminho = os.path.join(tempfile.mkdtemp(prefix="bench_import_"), f"funcionarios.{formato}")
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        if formato == "ndjson":
+            for registro in funcionarios(linhas):
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        else:
+            escritor = None
+            for registro in funcionarios(linhas):
+                registro["beneficiarios"] = json.dumps(registro["beneficiarios"], ensure_ascii=False)
+                if escritor is None:
+                    escritor = csv.DictWriter(arquivo, fieldnames=list(registro))
+                    escritor.writeheader()
+                escritor.writerow(registro)
+    return caminho
+
+
+def main(linhas: int, lote: int, formato: str) -> None:
+    caminho = gerar_arquivo(linhas, formato)
+    db = database.SessionLocal()
+    try:
+        with open(caminho, "rb") as arquivo:
+            inicio = time.perf_counter()
+            relatorio = importar_funcionarios(db, arquivo, formato, lote)
+            duracao = time.perf_counter() - inicio
+    finally:
+        db.close()
+
+    print(json.dumps({
+        "formato": formato,
+        "linhas": linhas,
+        "tamanho_lote": lote,
+        "importados": relatorio["importados"],
+        "rejeitados": relatorio["rejeitados"],
+        "segundos": round(duracao, 2),
+        "linhas_por_segundo": round(relatorio["importados"] / duracao, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--lote", type=int, default=1000)
+    parser.add_argument("--formato", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+    main(args.linhas, args.lote, args.formato)
@@ -0,0 +1,80 @@
+"""
+Benchmark de throughput do login com e sem o pool de processos de hash.
+
+Dispara logins concorrentes enquanto uma rota leve (/health) é chamada em paralelo,
+e mostra p50/p99 de ambas: sem offload, o bcrypt segura as demais requisições.
+
+Uso: python -m benchmarks.bench_login [--logins 40] [--concorrencia 20]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._ambiente import percentis, preparar_banco
+
+preparar_banco()
+
+import httpx  # noqa: E402
+import auth  # noqa: E402
+from main import app  # noqa: E402
+
+EMAIL, SENHA = "bench@rh.com", "senha_bench"
+
+
+async def _cronometrar(cliente: httpx.AsyncClient, metodo: str, url: str, **kwargs) -> float:
+    inicio = time.perf_counter()
+    resposta = await cliente.request(metodo, url, **kwargs)
+    resposta.raise_for_status()
+    return (time.perf_counter() - inicio) * 1000
+
+
+async def _rodada(cliente: httpx.AsyncClient, total_logins: int, concorrencia: int) -> dict:
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias_login, latencias_health = [], []
+    terminou = asyncio.Event()
+
+    async def login():
+        async with semaforo:
+            latencias_login.append(await _cronometrar(
+                cliente, "POST", "/api/v1/rh/login", data={"username": EMAIL, "password": SENHA}
+            ))
+
+    async def health():
+        while not terminou.is_set():
+            latencias_health.append(await _cronometrar(cliente, "GET", "/health"))
+            await asyncio.sleep(0.01)
+
+    tarefa_health = asyncio.create_task(health())
+    inicio = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(total_logins)))
+    duracao = time.perf_counter() - inicio
+    terminou.set()
+    await tarefa_health
+
+    return {
+        "logins_por_segundo": round(total_logins / duracao, 2),
+        "login_ms": percentis(latencias_login),
+        "health_ms": percentis(latencias_health),
+    }
+
+
+async def main(total_logins: int, concorrencia: int) -> None:
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        await cliente.post("/api/v1/rh/cadastrar", json={"email": EMAIL, "nome": "Bench", "senha": SENHA})
+
+        for offload in (False, True):
+            auth.PASSWORD_HASH_OFFLOAD = offload
+            await _rodada(cliente, min(4, total_logins), concorrencia)  # aquecimento
+            resultado = await _rodada(cliente, total_logins, concorrencia)
+            print(f"offload={offload}: {resultado}")
+
+    auth.encerrar_executor_senhas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concorrencia))
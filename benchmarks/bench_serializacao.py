@@ -0,0 +1,85 @@
+"""
+Micro-benchmark da serialização de respostas de funcionários (sem banco nem HTTP):
+
+- padrao: o caminho do FastAPI com response_model (validação pydantic a partir dos atributos
+  do ORM, dump em modo JSON e json.dumps na JSONResponse);
+- orjson: a mesma validação, renderizada pela RespostaORJSON;
+- rapido: FAST_JSON_RESPONSES (linhas confiáveis lidas direto do ORM + orjson).
+
+Uso: python -m benchmarks.bench_serializacao [--tamanhos 1 100 10000] [--repeticoes 20]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks._ambiente import percentis
+from benchmarks.gerador import funcionarios as gerar_funcionarios
+from models import BeneficiarioDB, FuncionarioCreate, FuncionarioDB, PaginaFuncionarios
+from serializacao import RespostaORJSON, funcionario_confiavel
+
+PAGINA = TypeAdapter(PaginaFuncionarios)
+
+
+def funcionarios_em_memoria(quantidade: int):
+    agora = datetime.now().replace(microsecond=0)
+    funcionarios = []
+    for i, registro in enumerate(gerar_funcionarios(quantidade), start=1):
+        dados = FuncionarioCreate.model_validate(registro)
+        funcionario = FuncionarioDB(
+            **dados.model_dump(exclude={"beneficiarios"}), id=i, criado_em=agora, atualizado_em=agora, versao=1, ativo=True
+        )
+        funcionario.beneficiarios = [BeneficiarioDB(**b.model_dump()) for b in dados.beneficiarios]
+        funcionarios.append(funcionario)
+    return funcionarios
+
+
+def padrao(funcionarios) -> bytes:
+    pagina = PAGINA.validate_python({"itens": funcionarios, "next_cursor": None}, from_attributes=True)
+    return JSONResponse(PAGINA.dump_python(pagina, mode="json")).body
+
+
+def orjson_validado(funcionarios) -> bytes:
+    pagina = PAGINA.validate_python({"itens": funcionarios, "next_cursor": None}, from_attributes=True)
+    return RespostaORJSON(PAGINA.dump_python(pagina, mode="json")).body
+
+
+def rapido(funcionarios) -> bytes:
+    return RespostaORJSON({"itens": [funcionario_confiavel(f) for f in funcionarios], "next_cursor": None}).body
+
+
+CAMINHOS = {"padrao": padrao, "orjson": orjson_validado, "rapido": rapido}
+
+
+def main(tamanhos, repeticoes: int) -> None:
+    resultado = {}
+    for tamanho in tamanhos:
+        funcionarios = funcionarios_em_memoria(tamanho)
+        corpos = {nome: json.loads(caminho(funcionarios)) for nome, caminho in CAMINHOS.items()}
+        assert corpos["padrao"] == corpos["rapido"] == corpos["orjson"], "Os caminhos devem gerar o mesmo JSON"
+
+        resultado[tamanho] = {}
+        vezes = max(1, repeticoes if tamanho > 100 else repeticoes * 50)
+        for nome, caminho in CAMINHOS.items():
+            latencias = []
+            for _ in range(vezes):
+                inicio = time.perf_counter()
+                caminho(funcionarios)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            resultado[tamanho][nome] = percentis(latencias)
+        resultado[tamanho]["aceleracao_p50"] = round(
+            resultado[tamanho]["padrao"]["p50"] / max(resultado[tamanho]["rapido"]["p50"], 0.001), 1
+        )
+
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    main(args.tamanhos, args.repeticoes)
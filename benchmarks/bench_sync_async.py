@@ -0,0 +1,95 @@
+"""
+Benchmark lado a lado: handler síncrono (threadpool + SessionLocal) x assíncrono (AsyncSessionLocal)
+x assíncrono com a sessão síncrona no threadpool (SessaoEmThread, usada com DB_ASYNC_SESSIONS=false).
+
+As três rotas fazem a mesma leitura de `buscar_funcionario`. `--espera-ms` acrescenta uma
+espera de I/O por requisição (simulando uma consulta lenta), o cenário em que o limite de
+~40 threads do Starlette aparece.
+
+Uso: python -m benchmarks.bench_sync_async [--requisicoes 2000] [--concorrencia 200] [--espera-ms 20]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks._ambiente import percentis, preparar_banco
+from benchmarks.gerador import popular
+
+preparar_banco()
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+import database  # noqa: E402
+from models import FuncionarioDB, FuncionarioResponse  # noqa: E402
+
+TOTAL_FUNCIONARIOS = 1000
+
+
+def _montar_app(espera_ms: float) -> FastAPI:
+    app = FastAPI()
+    espera = espera_ms / 1000
+
+    # A sessão é fechada no próprio handler: com get_db, sob alta concorrência, o threadpool
+    # inteiro pode ficar esperando conexões que só seriam devolvidas por outra thread.
+    @app.get("/sync/funcionarios/{id}", response_model=FuncionarioResponse)
+    def buscar_sync(id: int):
+        with database.SessionLocal() as db:
+            funcionario = db.scalar(select(FuncionarioDB).options(selectinload(FuncionarioDB.beneficiarios)).where(FuncionarioDB.id == id))
+            time.sleep(espera)
+            return FuncionarioResponse.model_validate(funcionario, from_attributes=True)
+
+    @app.get("/async/funcionarios/{id}", response_model=FuncionarioResponse)
+    async def buscar_async(id: int, db: AsyncSession = Depends(database.get_async_db)):
+        funcionario = await db.scalar(select(FuncionarioDB).options(selectinload(FuncionarioDB.beneficiarios)).where(FuncionarioDB.id == id))
+        await asyncio.sleep(espera)
+        return funcionario
+
+    @app.get("/em_thread/funcionarios/{id}", response_model=FuncionarioResponse)
+    async def buscar_em_thread(id: int):
+        async with database.SessaoEmThread(database.SessionRotas()) as db:
+            funcionario = await db.scalar(select(FuncionarioDB).options(selectinload(FuncionarioDB.beneficiarios)).where(FuncionarioDB.id == id))
+            await asyncio.sleep(espera)
+            return funcionario
+
+    return app
+
+
+async def _rodada(cliente: httpx.AsyncClient, prefixo: str, requisicoes: int, concorrencia: int) -> dict:
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias = []
+
+    async def chamar():
+        async with semaforo:
+            inicio = time.perf_counter()
+            resposta = await cliente.get(f"/{prefixo}/funcionarios/{random.randint(1, TOTAL_FUNCIONARIOS)}")
+            resposta.raise_for_status()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(chamar() for _ in range(requisicoes)))
+    duracao = time.perf_counter() - inicio
+    return {"req_por_segundo": round(requisicoes / duracao, 1), "latencia_ms": percentis(latencias)}
+
+
+async def main(requisicoes: int, concorrencia: int, espera_ms: float) -> None:
+    popular(TOTAL_FUNCIONARIOS)
+
+    transporte = httpx.ASGITransport(app=_montar_app(espera_ms))
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        for prefixo in ("sync", "async", "em_thread"):
+            await _rodada(cliente, prefixo, min(50, requisicoes), concorrencia)  # aquecimento
+            print(f"{prefixo}: {await _rodada(cliente, prefixo, requisicoes, concorrencia)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--concorrencia", type=int, default=200)
+    parser.add_argument("--espera-ms", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requisicoes, args.concorrencia, args.espera_ms))
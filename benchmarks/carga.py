@@ -0,0 +1,196 @@
+"""
+Teste de carga reprodutível: popula o banco com o gerador sintético e chama a aplicação ASGI
+no próprio processo (httpx.ASGITransport, sem rede), medindo por endpoint a vazão e as
+latências p50/p95/p99. O resultado vai para um JSON que pode ser comparado com o de outra execução.
+Para rodar contra um PostgreSQL local em vez do SQLite temporário, defina BENCH_DATABASE_URL.
+
+Uso: python -m benchmarks.carga [--funcionarios 10000] [--requisicoes 500] [--concorrencia 20]
+                                [--cenarios listar_funcionarios login_rh ...]
+                                [--saida carga.json] [--comparar carga_anterior.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime
+
+from benchmarks._ambiente import percentis, preparar_banco
+
+preparar_banco()
+
+import httpx  # noqa: E402
+from benchmarks.gerador import DEPARTAMENTOS, SOBRENOMES, funcionario, popular  # noqa: E402
+import auth  # noqa: E402
+import database  # noqa: E402
+from main import app  # noqa: E402
+from models import FuncionarioDB  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+EMAIL, SENHA = "carga@rh.com", "senha_carga"
+API = "/api/v1"
+
+
+class Contexto:
+    """Estado compartilhado pelos cenários: token, maior id existente e próximo CPF a criar."""
+
+    def __init__(self, maior_id: int, semente: int):
+        self.maior_id = maior_id
+        self.rng = random.Random(semente)
+        self.proximo = maior_id + 1
+        self.cabecalhos = {}
+
+    def novo_funcionario(self) -> dict:
+        self.proximo += 1
+        return funcionario(self.proximo - 1, self.rng)
+
+
+# Cenário -> (requisição, fração de --requisicoes). O login é caro de propósito (bcrypt): roda menos vezes
+async def _login_rh(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    return await cliente.post(f"{API}/rh/login", data={"username": EMAIL, "password": SENHA})
+
+
+async def _listar_funcionarios(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    params = {"limit": 50}
+    if ctx.rng.random() < 0.5:
+        params["departamento"] = ctx.rng.choice(DEPARTAMENTOS)
+    return await cliente.get(f"{API}/funcionarios", params=params, headers=ctx.cabecalhos)
+
+
+async def _buscar_funcionario(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    return await cliente.get(f"{API}/funcionarios/{ctx.rng.randint(1, ctx.maior_id)}", headers=ctx.cabecalhos)
+
+
+async def _criar_funcionario(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    return await cliente.post(f"{API}/funcionarios", json=ctx.novo_funcionario(), headers=ctx.cabecalhos)
+
+
+async def _pesquisar_funcionarios(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    termo = ctx.rng.choice(SOBRENOMES)[:ctx.rng.randint(3, 6)]
+    return await cliente.get(f"{API}/funcionarios/search", params={"q": termo}, headers=ctx.cabecalhos)
+
+
+async def _resumo_departamentos(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    return await cliente.get(f"{API}/departamentos/resumo", headers=ctx.cabecalhos)
+
+
+async def _folha(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    return await cliente.get(f"{API}/folha", headers=ctx.cabecalhos)
+
+
+CENARIOS = {
+    "login_rh": (_login_rh, 0.1),
+    "listar_funcionarios": (_listar_funcionarios, 1.0),
+    "buscar_funcionario": (_buscar_funcionario, 1.0),
+    "criar_funcionario": (_criar_funcionario, 0.5),
+    "pesquisar_funcionarios": (_pesquisar_funcionarios, 1.0),
+    "resumo_departamentos": (_resumo_departamentos, 0.5),
+    "folha": (_folha, 0.1),
+}
+
+
+async def _rodada(cliente: httpx.AsyncClient, ctx: Contexto, requisicao, total: int, concorrencia: int) -> dict:
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias, status = [], Counter()
+
+    async def chamar():
+        async with semaforo:
+            inicio = time.perf_counter()
+            resposta = await requisicao(cliente, ctx)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            status[resposta.status_code] += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(chamar() for _ in range(total)))
+    duracao = time.perf_counter() - inicio
+    return {
+        "requisicoes": total,
+        "erros": sum(q for codigo, q in status.items() if codigo >= 400),
+        "status": {str(codigo): q for codigo, q in sorted(status.items())},
+        "req_por_segundo": round(total / duracao, 1),
+        "latencia_ms": percentis(latencias),
+    }
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def comparar(anterior: dict, atual: dict) -> None:
+    """Mostra a variação de vazão e p50/p99 de cada endpoint em relação a uma execução anterior."""
+    print(f"\n{'endpoint':<24}{'req/s':>18}{'p50 ms':>22}{'p99 ms':>22}")
+    for nome, medida in atual["endpoints"].items():
+        antes = anterior.get("endpoints", {}).get(nome)
+        if not antes:
+            continue
+
+        def coluna(a: float, b: float) -> str:
+            return f"{a:.1f}→{b:.1f} ({(b - a) / a * 100:+.0f}%)" if a else f"{a:.1f}→{b:.1f}"
+
+        print(f"{nome:<24}{coluna(antes['req_por_segundo'], medida['req_por_segundo']):>18}"
+              f"{coluna(antes['latencia_ms']['p50'], medida['latencia_ms']['p50']):>22}"
+              f"{coluna(antes['latencia_ms']['p99'], medida['latencia_ms']['p99']):>22}")
+
+
+async def executar(funcionarios: int, requisicoes: int, concorrencia: int, cenarios, semente: int) -> dict:
+    inicio = time.perf_counter()
+    popular(funcionarios, semente)
+    carga_s = time.perf_counter() - inicio
+
+    with database.SessionLocal() as db:
+        ctx = Contexto(db.scalar(select(func.max(FuncionarioDB.id))) or 0, semente)
+    resultado = {}
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://carga") as cliente:
+        await cliente.post(f"{API}/rh/cadastrar", json={"email": EMAIL, "nome": "Carga", "senha": SENHA})
+        token = (await _login_rh(cliente, ctx)).json()["access_token"]
+        ctx.cabecalhos = {"Authorization": f"Bearer {token}"}
+
+        for nome in cenarios:
+            requisicao, fracao = CENARIOS[nome]
+            total = max(1, int(requisicoes * fracao))
+            await _rodada(cliente, ctx, requisicao, max(1, total // 10), concorrencia)  # aquecimento
+            resultado[nome] = await _rodada(cliente, ctx, requisicao, total, concorrencia)
+            print(f"{nome}: {resultado[nome]['req_por_segundo']} req/s, {resultado[nome]['latencia_ms']}")
+
+    auth.encerrar_executor_senhas()
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "python": platform.python_version(),
+        "banco": database.engine.dialect.name,
+        "parametros": {
+            "funcionarios": funcionarios, "requisicoes": requisicoes, "concorrencia": concorrencia, "semente": semente,
+        },
+        "carga_inicial_s": round(carga_s, 2),
+        "endpoints": resultado,
+    }
+
+
+def main(args) -> None:
+    relatorio = asyncio.run(executar(args.funcionarios, args.requisicoes, args.concorrencia, args.cenarios, args.semente))
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultado gravado em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            comparar(json.load(arquivo), relatorio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funcionarios", type=int, default=10_000)
+    parser.add_argument("--requisicoes", type=int, default=500, help="Por cenário (o login e a folha rodam 10%%)")
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="carga.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    main(parser.parse_args())
@@ -0,0 +1,218 @@
+"""
+Gerador de dados sintéticos de RH: payloads válidos de `FuncionarioCreate` (CPF com dígitos
+verificadores, datas coerentes, beneficiários) e carga em massa no banco dos benchmarks.
+
+A mesma semente gera sempre os mesmos funcionários, para comparar execuções entre si.
+Sem `--url`, usa um SQLite temporário; com `--url postgresql://...`, um PostgreSQL local.
+
+Uso: python -m benchmarks.gerador [--funcionarios 100000] [--semente 42] [--url URL] [--limpar]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+NOMES = [
+    "Ana", "Bruno", "Camila", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+    "Larissa", "Lucas", "Mariana", "Mateus", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago",
+    "Vitória", "Gustavo", "Beatriz", "Pedro", "Juliana", "Carlos", "Fernanda", "André", "Letícia", "Rodrigo",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+    "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas",
+]
+MUNICIPIOS = [
+    ("São Paulo", "SP", "01"), ("Campinas", "SP", "13"), ("Rio de Janeiro", "RJ", "20"), ("Niterói", "RJ", "24"),
+    ("Belo Horizonte", "MG", "30"), ("Curitiba", "PR", "80"), ("Porto Alegre", "RS", "90"), ("Salvador", "BA", "40"),
+    ("Recife", "PE", "50"), ("Fortaleza", "CE", "60"), ("Goiânia", "GO", "74"), ("Florianópolis", "SC", "88"),
+]
+BAIRROS = ["Centro", "Jardim América", "Vila Nova", "Boa Vista", "Santa Cecília", "Liberdade", "Copacabana", "Savassi"]
+LOGRADOUROS = ["Rua das Flores", "Avenida Brasil", "Rua XV de Novembro", "Rua São João", "Avenida Paulista", "Rua Sete de Setembro"]
+ESTADOS_CIVIS = ["Solteiro", "Casado", "Divorciado", "União estável", "Viúvo"]
+GRAUS_INSTRUCAO = ["Ensino médio completo", "Superior incompleto", "Superior completo", "Pós-graduação"]
+# Departamento -> cargos (cargo, CBO, faixa salarial mensal)
+CARGOS = {
+    "TI": [("Desenvolvedor", "212405", (4500, 18000)), ("Analista de Suporte", "317210", (2500, 6000))],
+    "RH": [("Analista de RH", "252405", (3500, 8000)), ("Assistente de RH", "411010", (1800, 3200))],
+    "Financeiro": [("Analista Financeiro", "252525", (4000, 11000)), ("Contador", "252210", (5000, 14000))],
+    "Vendas": [("Vendedor", "521110", (1600, 4500)), ("Gerente Comercial", "142320", (8000, 20000))],
+    "Operações": [("Operador de Produção", "784205", (1600, 3000)), ("Supervisor de Produção", "410105", (3500, 7000))],
+    "Jurídico": [("Advogado", "241005", (6000, 18000)), ("Assistente Jurídico", "411005", (2200, 4000))],
+}
+DEPARTAMENTOS = list(CARGOS)
+PARENTESCOS = ["Filho(a)", "Cônjuge", "Enteado(a)", "Pai", "Mãe"]
+# Data fixa em vez de date.today(): a mesma semente gera os mesmos dados em qualquer dia
+DATA_REFERENCIA = date(2025, 1, 1)
+# Permutação de 0..10^9-1 (multiplicador primo com 10): CPFs únicos e sem cara de sequência
+_MULTIPLICADOR_CPF, _DESLOCAMENTO_CPF = 738_560_211, 123_456_789
+
+
+def digitos_cpf(base: str) -> str:
+    """Dois dígitos verificadores do CPF para os 9 dígitos de `base`."""
+    digitos = [int(c) for c in base]
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(0 if soma % 11 < 2 else 11 - soma % 11)
+    return f"{digitos[9]}{digitos[10]}"
+
+
+def cpf(i: int) -> str:
+    """CPF válido e formatado, único para cada `i` (até 10^9)."""
+    base = f"{(i * _MULTIPLICADOR_CPF + _DESLOCAMENTO_CPF) % 1_000_000_000:09d}"
+    return f"{base[:3]}.{base[3:6]}.{base[6:]}-{digitos_cpf(base)}"
+
+
+def _data(rng: random.Random, inicio: date, fim: date) -> date:
+    return inicio + timedelta(days=rng.randint(0, max(0, (fim - inicio).days)))
+
+
+def _nome(rng: random.Random, sobrenome: Optional[str] = None) -> str:
+    return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {sobrenome or rng.choice(SOBRENOMES)}"
+
+
+def funcionario(i: int, rng: Optional[random.Random] = None) -> dict:
+    """
+    Payload JSON de `FuncionarioCreate` para o funcionário `i`.
+    :param rng: Gerador aleatório; o mesmo estado produz o mesmo funcionário.
+    :return: Dicionário com datas em ISO 8601, pronto para POST /funcionarios ou importação.
+    """
+    rng = rng or random.Random(i)
+    hoje = DATA_REFERENCIA
+    sobrenome = rng.choice(SOBRENOMES)
+    nascimento = _data(rng, date(hoje.year - 65, 1, 1), date(hoje.year - 18, 12, 31))
+    admissao = _data(rng, date(max(nascimento.year + 18, 2000), 1, 1), hoje)
+    municipio, uf, prefixo_cep = rng.choice(MUNICIPIOS)
+    departamento = rng.choice(DEPARTAMENTOS)
+    cargo, cbo, (piso, teto) = rng.choice(CARGOS[departamento])
+
+    tipo_contrato, tipo_pagamento, horas, salario = "CLT", "Mensal", 220, rng.uniform(piso, teto)
+    sorteio = rng.random()
+    if sorteio < 0.10:
+        tipo_pagamento, salario = "Por hora", rng.uniform(10, 80)
+    elif sorteio < 0.13:
+        tipo_contrato, horas, salario = "Aprendiz", 120, rng.uniform(700, 1200)
+
+    beneficiarios = []
+    for _ in range(rng.choices((0, 1, 2, 3), weights=(50, 25, 17, 8))[0]):
+        parentesco = rng.choice(PARENTESCOS)
+        menor = parentesco in ("Filho(a)", "Enteado(a)")
+        beneficiarios.append({
+            "nome": _nome(rng, sobrenome), "parentesco": parentesco,
+            "data_nascimento": _data(rng, hoje - timedelta(days=365 * 20), hoje).isoformat() if menor else None,
+        })
+
+    nome = _nome(rng, sobrenome)
+    return {
+        "cpf": cpf(i), "nome": nome, "data_nascimento": nascimento.isoformat(),
+        "municipio_nascimento": municipio, "uf_nascimento": uf,
+        "nome_mae": f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}", "nome_pai": f"{rng.choice(NOMES)} {sobrenome}",
+        "nacionalidade": "Brasileira", "estado_civil": rng.choice(ESTADOS_CIVIS),
+        "rg_numero": f"{rng.randint(10_000_000, 99_999_999)}-{rng.randint(0, 9)}",
+        "rg_data_emissao": _data(rng, nascimento + timedelta(days=365 * 16), hoje).isoformat(), "rg_orgao_emissor": "SSP",
+        "ctps_numero": f"{rng.randint(1_000_000, 9_999_999)}", "ctps_serie": f"{rng.randint(1, 999):03d}", "ctps_uf": uf,
+        "ctps_data_emissao": _data(rng, nascimento + timedelta(days=365 * 16), admissao).isoformat(),
+        "titulo_eleitor": f"{rng.randint(10**11, 10**12 - 1)}", "titulo_zona": f"{rng.randint(1, 400):03d}",
+        "titulo_secao": f"{rng.randint(1, 999):04d}", "pis": f"{rng.randint(10**10, 10**11 - 1)}",
+        "pis_data_cadastro": admissao.isoformat(), "cbo": cbo,
+        "endereco": rng.choice(LOGRADOUROS), "endereco_numero": str(rng.randint(1, 3000)),
+        "bairro": rng.choice(BAIRROS), "municipio": municipio, "uf": uf,
+        "cep": f"{prefixo_cep}{rng.randint(0, 999):03d}-{rng.randint(0, 999):03d}",
+        "telefone": f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+        "email": f"func{i}@empresa.com.br", "cargo": cargo, "funcao": cargo, "departamento": departamento,
+        "data_admissao": admissao.isoformat(), "salario": round(salario, 2), "tipo_pagamento": tipo_pagamento,
+        "horas_mensais": horas, "tipo_contrato": tipo_contrato,
+        "adicional_periculosidade": 30 if rng.random() < 0.15 else 0,
+        "adicional_insalubridade": rng.choice([0, 0, 0, 10, 20, 40]),
+        "grau_instrucao": rng.choice(GRAUS_INSTRUCAO), "fgts_data_opcao": admissao.isoformat(),
+        "beneficiarios": beneficiarios,
+    }
+
+
+def funcionarios(quantidade: int, semente: int = 42, inicio: int = 1) -> Iterator[dict]:
+    """Sequência reprodutível de payloads para os ids `inicio` .. `inicio + quantidade - 1`."""
+    rng = random.Random(semente)
+    for i in range(inicio, inicio + quantidade):
+        yield funcionario(i, rng)
+
+
+def _lotes(quantidade: int, semente: int, tamanho_lote: int, inicio: int) -> Iterator[List[dict]]:
+    lote = []
+    for id, dados in enumerate(funcionarios(quantidade, semente, inicio), start=inicio):
+        dados["id"] = id
+        lote.append(dados)
+        if len(lote) == tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def popular(quantidade: int, semente: int = 42, tamanho_lote: int = 5000) -> Tuple[int, int]:
+    """
+    Insere `quantidade` funcionários (e seus beneficiários) no banco configurado, validando cada
+    um com `FuncionarioCreate` e gravando por lotes com executemany, sem objetos ORM.
+    Os ids continuam a partir do maior existente e são enviados explicitamente, o que dispensa
+    o RETURNING (o SQLite não o agrupa num executemany) para ligar os beneficiários.
+    :return: (funcionários, beneficiários) inseridos.
+    """
+    import database
+    from models import BeneficiarioDB, FuncionarioCreate, FuncionarioDB
+    from sqlalchemy import func, insert, select, text
+
+    total_beneficiarios = 0
+    with database.SessionLocal() as db:
+        inicio = (db.scalar(select(func.max(FuncionarioDB.id))) or 0) + 1
+        for lote in _lotes(quantidade, semente, tamanho_lote, inicio):
+            validados = [(dados["id"], FuncionarioCreate.model_validate(dados)) for dados in lote]
+            db.execute(insert(FuncionarioDB), [{**f.model_dump(exclude={"beneficiarios"}), "id": id} for id, f in validados])
+            beneficiarios = [{**b.model_dump(), "funcionario_id": id} for id, f in validados for b in f.beneficiarios]
+            if beneficiarios:
+                db.execute(insert(BeneficiarioDB), beneficiarios)
+            total_beneficiarios += len(beneficiarios)
+            db.commit()
+        if db.get_bind().dialect.name == "postgresql":  # A sequência não avança com ids explícitos
+            db.execute(text("SELECT setval(pg_get_serial_sequence('funcionarios', 'id'), (SELECT max(id) FROM funcionarios))"))
+            db.commit()
+    return quantidade, total_beneficiarios
+
+
+def limpar() -> None:
+    """Apaga funcionários e beneficiários do banco configurado (não toca nos usuários do RH)."""
+    import database
+    from models import BeneficiarioDB, FuncionarioDB
+    from sqlalchemy import delete
+
+    with database.engine.begin() as conexao:
+        conexao.execute(delete(BeneficiarioDB))
+        conexao.execute(delete(FuncionarioDB))
+
+
+def main(quantidade: int, semente: int, url: Optional[str], apagar: bool) -> None:
+    from benchmarks._ambiente import preparar_banco
+
+    destino = preparar_banco(url=url)
+    if apagar:
+        limpar()
+    inicio = time.perf_counter()
+    inseridos, beneficiarios = popular(quantidade, semente)
+    duracao = time.perf_counter() - inicio
+    print(json.dumps({
+        "banco": destino,
+        "funcionarios": inseridos,
+        "beneficiarios": beneficiarios,
+        "segundos": round(duracao, 2),
+        "linhas_por_segundo": round(inseridos / duracao, 1),
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funcionarios", type=int, default=100_000, help="De 1 mil a 1 milhão")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--url", help="URL do banco (padrão: SQLite temporário)")
+    parser.add_argument("--limpar", action="store_true", help="Apaga os funcionários existentes antes de inserir")
+    args = parser.parse_args()
+    main(args.funcionarios, args.semente, args.url, args.limpar)
@@ -0,0 +1,272 @@
+import asyncio
+import bisect
+import heapq
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+import database
+from models import FuncionarioDB
+
+# 🔎 Índice de busca em memória (prefixo + trigramas) para nome, CPF, cargo e departamento
+# Mantido pelas escritas de routes_funcionarios; recarregado do banco após BUSCA_INDICE_TTL_SECONDS
+BUSCA_INDICE_TTL_SECONDS = float(os.getenv("BUSCA_INDICE_TTL_SECONDS", 300))
+
+PESOS_CAMPOS = {"nome": 3.0, "cpf": 3.0, "cargo": 1.5, "departamento": 1.0}
+CAMPOS_RESULTADO = ("id", "nome", "cpf", "cargo", "departamento", "ativo")
+QUALIDADE_EXATA, QUALIDADE_PREFIXO, QUALIDADE_APROXIMADA = 1.0, 0.8, 0.6
+SIMILARIDADE_MINIMA = 0.5
+MAX_TERMOS_POR_PREFIXO = 2000
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas e sem acentos ("João" -> "joao")."""
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+def tokenizar(texto: Optional[str]) -> List[str]:
+    return re.findall(r"\w+", normalizar(texto))
+
+def trigramas(termo: str) -> Set[str]:
+    marcado = f"  {termo} "
+    return {marcado[i:i + 3] for i in range(len(marcado) - 2)}
+
+class IndiceBusca:
+    """
+    Índice invertido sobre o vocabulário: cada termo aponta, por peso de campo, para o conjunto
+    de funcionários que o contêm. A busca por prefixo usa o vocabulário ordenado (bisect) e a
+    busca aproximada compara trigramas apenas do vocabulário, bem menor que o número de
+    funcionários. A seleção dos melhores resultados percorre os níveis de nota em ordem
+    decrescente com operações de conjunto, sem ordenar todos os casamentos.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._limpar()
+        self._geracao = 0  # Incrementada a cada invalidação
+        self._pendentes: Optional[List[dict]] = None  # Escritas feitas durante uma recarga (None = sem recarga)
+
+    def _limpar(self) -> None:
+        self._documentos: Dict[int, dict] = {}
+        self._termos_documento: Dict[int, Dict[str, float]] = {}
+        self._postagens: Dict[str, Dict[float, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        self._vocabulario: List[str] = []
+        self._trigramas: Dict[str, Set[str]] = defaultdict(set)
+        self.carregado_em: Optional[float] = None
+
+    @property
+    def precisa_carregar(self) -> bool:
+        return self.carregado_em is None or time.monotonic() - self.carregado_em > BUSCA_INDICE_TTL_SECONDS
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    # ✍️ Manutenção
+    def iniciar_carga(self) -> int:
+        """
+        Passa a guardar as escritas para reaplicá-las ao índice recarregado; chamar antes de ler o banco.
+        :return: Geração atual, a informar em `carregar`.
+        """
+        with self._lock:
+            self._pendentes = []
+            return self._geracao
+
+    def carregar(self, registros: Iterable[dict], geracao: Optional[int] = None) -> None:
+        """
+        Reconstrói o índice a partir de registros com as chaves de CAMPOS_RESULTADO. O índice novo é
+        montado sem o lock (buscas e escritas seguem no atual) e entra no lugar dele de uma vez, com as
+        escritas feitas desde `iniciar_carga`. Se houve invalidação no meio, a próxima busca recarrega.
+        """
+        novo = IndiceBusca()
+        for registro in registros:
+            novo._indexar(registro, ordenar=False)
+        novo._vocabulario.sort()
+
+        with self._lock:
+            for registro in self._pendentes or ():
+                novo._remover(registro["id"])
+                novo._indexar(registro, ordenar=True)
+            self._pendentes = None
+            self._documentos, self._termos_documento = novo._documentos, novo._termos_documento
+            self._postagens, self._vocabulario, self._trigramas = novo._postagens, novo._vocabulario, novo._trigramas
+            self.carregado_em = time.monotonic() if geracao in (None, self._geracao) else None
+
+    def cancelar_carga(self) -> None:
+        """A recarga falhou: para de guardar as escritas."""
+        with self._lock:
+            self._pendentes = None
+
+    def atualizar(self, registro: dict) -> None:
+        """Insere ou substitui um funcionário no índice."""
+        with self._lock:
+            if self._pendentes is not None:
+                self._pendentes.append(registro)  # Recarga em andamento: reaplicada ao índice novo
+            if self.carregado_em is None:
+                return  # Ainda não carregado: a primeira busca lê tudo do banco
+            self._remover(registro["id"])
+            self._indexar(registro, ordenar=True)
+
+    def invalidar(self) -> None:
+        """Força a recarga completa na próxima busca (ex.: após importações em lote)."""
+        with self._lock:
+            self._geracao += 1
+            self.carregado_em = None
+
+    def _indexar(self, registro: dict, ordenar: bool) -> None:
+        id = registro["id"]
+        self._documentos[id] = {campo: registro.get(campo) for campo in CAMPOS_RESULTADO}
+        pesos: Dict[str, float] = {}
+        for campo, peso in PESOS_CAMPOS.items():
+            termos = tokenizar(registro.get(campo))
+            if campo == "cpf" and registro.get(campo):
+                termos.append(re.sub(r"\D", "", registro[campo]))  # CPF também sem pontuação
+            for termo in termos:
+                pesos[termo] = max(peso, pesos.get(termo, 0.0))
+
+        for termo, peso in pesos.items():
+            if termo not in self._postagens:
+                self._adicionar_termo(termo, ordenar)
+            self._postagens[termo][peso].add(id)
+        self._termos_documento[id] = pesos
+
+    def _remover(self, id: int) -> None:
+        self._documentos.pop(id, None)
+        for termo, peso in self._termos_documento.pop(id, {}).items():
+            postagens = self._postagens[termo]
+            postagens[peso].discard(id)
+            if not postagens[peso]:
+                del postagens[peso]
+            if not postagens:
+                self._remover_termo(termo)
+
+    def _adicionar_termo(self, termo: str, ordenar: bool) -> None:
+        if ordenar:
+            bisect.insort(self._vocabulario, termo)
+        else:
+            self._vocabulario.append(termo)
+        for trigrama in trigramas(termo):
+            self._trigramas[trigrama].add(termo)
+
+    def _remover_termo(self, termo: str) -> None:
+        del self._postagens[termo]
+        posicao = bisect.bisect_left(self._vocabulario, termo)
+        if posicao < len(self._vocabulario) and self._vocabulario[posicao] == termo:
+            del self._vocabulario[posicao]
+        for trigrama in trigramas(termo):
+            self._trigramas[trigrama].discard(termo)
+
+    # 🔍 Consulta
+    def _termos_semelhantes(self, termo: str) -> Dict[str, float]:
+        """Termos do vocabulário que casam com o termo buscado, com a qualidade do casamento."""
+        encontrados: Dict[str, float] = {}
+        inicio = bisect.bisect_left(self._vocabulario, termo)
+        for candidato in self._vocabulario[inicio:inicio + MAX_TERMOS_POR_PREFIXO]:
+            if not candidato.startswith(termo):
+                break
+            encontrados[candidato] = QUALIDADE_EXATA if candidato == termo else QUALIDADE_PREFIXO
+
+        if len(termo) >= 3 and not termo.isdigit():  # Números (CPF) só casam por prefixo
+            trigramas_termo = trigramas(termo)
+            comuns = Counter()
+            for trigrama in trigramas_termo:
+                comuns.update(self._trigramas.get(trigrama, ()))
+            for candidato, quantidade in comuns.items():
+                if candidato in encontrados:
+                    continue
+                # Coeficiente de Dice sobre os trigramas
+                similaridade = 2 * quantidade / (len(trigramas_termo) + len(trigramas(candidato)))
+                if similaridade >= SIMILARIDADE_MINIMA:
+                    encontrados[candidato] = QUALIDADE_APROXIMADA * similaridade
+        return encontrados
+
+    def _niveis(self, termo: str) -> List[Tuple[float, Set[int]]]:
+        """Conjuntos de funcionários que casam com o termo, agrupados por nota, da maior para a menor."""
+        niveis = [
+            (qualidade * peso, ids)
+            for candidato, qualidade in self._termos_semelhantes(termo).items()
+            for peso, ids in self._postagens[candidato].items()
+        ]
+        return sorted(niveis, key=lambda nivel: nivel[0], reverse=True)
+
+    def _aceito(self, id: int, ativo: Optional[bool]) -> bool:
+        return ativo is None or self._documentos[id]["ativo"] == ativo
+
+    def buscar(self, texto: str, limit: int = 20, ativo: Optional[bool] = None) -> List[dict]:
+        """
+        Busca sem acentos por prefixo e aproximada; todos os termos da consulta precisam casar.
+        A nota de cada termo é a do melhor casamento (qualidade x peso do campo) e as notas somam.
+        :return: Funcionários ordenados por relevância (campo `relevancia`).
+        """
+        termos = list(dict.fromkeys(tokenizar(texto)))
+        if not termos:
+            return []
+
+        with self._lock:
+            niveis_por_termo = [self._niveis(termo) for termo in termos]
+            if not all(niveis_por_termo):
+                return []
+
+            if len(niveis_por_termo) == 1:
+                # Um termo: percorre os níveis do maior para o menor e para ao atingir o limite
+                resultado: List[Tuple[int, float]] = []
+                vistos: Set[int] = set()
+                for nota, ids in niveis_por_termo[0]:
+                    for id in sorted(ids - vistos):
+                        if self._aceito(id, ativo):
+                            resultado.append((id, nota))
+                            if len(resultado) >= limit:
+                                break
+                    if len(resultado) >= limit:
+                        break
+                    vistos |= ids
+            else:
+                # Vários termos: intersecção dos conjuntos primeiro, nota só para os candidatos
+                conjuntos = sorted((set().union(*(ids for _, ids in niveis)) for niveis in niveis_por_termo), key=len)
+                candidatos = set.intersection(*conjuntos)
+                pontuacao = dict.fromkeys(candidatos, 0.0)
+                for niveis in niveis_por_termo:
+                    pendentes = set(candidatos)
+                    for nota, ids in niveis:
+                        for id in pendentes & ids:
+                            pontuacao[id] += nota
+                        pendentes -= ids
+                        if not pendentes:
+                            break
+                aceitos = (id for id in candidatos if self._aceito(id, ativo))
+                resultado = [(id, pontuacao[id]) for id in heapq.nsmallest(limit, aceitos, key=lambda id: (-pontuacao[id], id))]
+
+            return [{**self._documentos[id], "relevancia": round(nota, 3)} for id, nota in resultado]
+
+indice_busca = IndiceBusca()
+_carga_indice = asyncio.Lock()
+
+def registro_do_funcionario(funcionario: FuncionarioDB) -> dict:
+    return {campo: getattr(funcionario, campo) for campo in CAMPOS_RESULTADO}
+
+async def garantir_indice() -> IndiceBusca:
+    """
+    Carrega (ou recarrega, após o TTL) o índice a partir do banco, uma única vez por vez.
+    Lê do primário: o índice é compartilhado e não pode partir de uma réplica atrasada.
+    Durante uma recarga pelo TTL, as buscas usam o índice anterior em vez de esperar.
+    """
+    if indice_busca.precisa_carregar:
+        if _carga_indice.locked() and indice_busca.carregado_em is not None:
+            return indice_busca  # Recarga pelo TTL já em andamento: responde com o índice atual
+        async with _carga_indice:
+            if indice_busca.precisa_carregar:
+                colunas = [getattr(FuncionarioDB, campo) for campo in CAMPOS_RESULTADO]
+                geracao = indice_busca.iniciar_carga()
+                try:
+                    async with database.sessao_primario() as db:
+                        registros = (await db.execute(select(*colunas))).mappings().all()
+                    # Montar o índice é CPU: roda fora do event loop
+                    await run_in_threadpool(indice_busca.carregar, registros, geracao)
+                except BaseException:
+                    indice_busca.cancelar_carga()
+                    raise
+    return indice_busca
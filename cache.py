@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_AUSENTE = object()
+
+class CacheTTL:
+    """
+    Cache em memória com limite de tamanho (LRU) e tempo de vida por entrada.
+    Seguro para uso entre threads (rotas síncronas rodam no threadpool).
+    """
+
+    def __init__(self, tamanho_maximo: int = 1024, ttl: float = 60.0):
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self.acertos = 0
+        self.falhas = 0
+        self._dados: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        """Retorna o valor em cache (ou `padrao` se ausente/expirado)."""
+        with self._lock:
+            item = self._dados.get(chave, _AUSENTE)
+            if item is _AUSENTE or item[1] < time.monotonic():
+                if item is not _AUSENTE:
+                    del self._dados[chave]
+                self.falhas += 1
+                return padrao
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def definir(self, chave: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        """Armazena um valor; `ttl` sobrescreve o tempo de vida padrão."""
+        expira_em = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._dados[chave] = (valor, expira_em)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+
+    def invalidar(self, chave: Hashable) -> None:
+        with self._lock:
+            self._dados.pop(chave, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._dados.clear()
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "entradas": len(self._dados),
+                "tamanho_maximo": self.tamanho_maximo,
+                "ttl_segundos": self.ttl,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,44 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Iterable, Optional, Tuple
+from fastapi import Response, status
+
+# 🏷️ Requisições condicionais (ETag / Last-Modified)
+# no-cache: o navegador guarda a resposta, mas sempre revalida com If-None-Match (resposta 304 sem corpo)
+CACHE_CONTROL = "private, no-cache"
+
+def etag_funcionario(id: int, versao: int) -> str:
+    """ETag forte de um funcionário: muda a cada escrita, pois toda escrita incrementa a versão."""
+    return f'"f{id}-v{versao}"'
+
+def etag_lista(parametros: tuple, versoes: Iterable[Tuple[int, int]]) -> str:
+    """ETag forte de uma página: resumo dos parâmetros da consulta e dos pares (id, versão) retornados."""
+    resumo = hashlib.blake2b(repr(parametros).encode(), digest_size=16)
+    for id, versao in versoes:
+        resumo.update(f"{id}:{versao};".encode())
+    return f'"l{resumo.hexdigest()}"'
+
+def etag_confere(cabecalho: Optional[str], etag: str) -> bool:
+    """Compara o ETag com If-None-Match/If-Match (lista separada por vírgulas, `*` ou prefixo W/)."""
+    if not cabecalho:
+        return False
+    candidatos = [c.strip() for c in cabecalho.split(",")]
+    return "*" in candidatos or any(c.removeprefix("W/") == etag for c in candidatos)
+
+def data_http(momento: Optional[datetime]) -> Optional[str]:
+    if momento is None:
+        return None
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=timezone.utc)  # TIMESTAMP do banco é gravado em UTC
+    return format_datetime(momento.astimezone(timezone.utc), usegmt=True)
+
+def cabecalhos_validacao(etag: str, ultima_alteracao: Optional[datetime]) -> dict:
+    cabecalhos = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if ultima_alteracao is not None:
+        cabecalhos["Last-Modified"] = data_http(ultima_alteracao)
+    return cabecalhos
+
+def nao_modificado(etag: str, ultima_alteracao: Optional[datetime]) -> Response:
+    """Resposta 304 com os mesmos validadores, sem corpo."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos_validacao(etag, ultima_alteracao))
@@ -0,0 +1,38 @@
+from typing import Optional
+from sqlalchemy import Select, select
+from sqlalchemy.orm import selectinload
+
+from models import AuditoriaFuncionarioDB, FuncionarioDB
+from paginacao import aplicar_cursor
+
+# 🔎 Consultas de funcionários usadas pelas rotas
+# Montadas só aqui para que tests/test_planos.py verifique exatamente o SQL que as rotas executam
+
+# Beneficiários sempre em uma consulta extra por página/bloco (selectinload), nunca uma por funcionário
+CARREGAR_BENEFICIARIOS = selectinload(FuncionarioDB.beneficiarios)
+
+def filtrar_funcionarios(query, departamento: Optional[str], ativo: Optional[bool]):
+    """Aplica os filtros da listagem a um `select()` ou a um `Query` da sessão síncrona."""
+    if departamento:
+        query = query.filter(FuncionarioDB.departamento == departamento)
+    if ativo is not None:
+        query = query.filter(FuncionarioDB.ativo == ativo)
+    return query
+
+def pagina_funcionarios(consulta: Select, departamento: Optional[str], ativo: Optional[bool],
+                        cursor: Optional[str], limit: int) -> Select:
+    """
+    Página da listagem: filtros + paginação keyset por id.
+    :param consulta: `select()` com as colunas ou a entidade desejadas.
+    """
+    return aplicar_cursor(filtrar_funcionarios(consulta, departamento, ativo), FuncionarioDB.id, cursor, limit)
+
+def consulta_funcionario(id: int, recarregar: bool = False) -> Select:
+    """Seleciona um funcionário com os beneficiários já carregados (sem lazy load no modo async)."""
+    consulta = select(FuncionarioDB).options(CARREGAR_BENEFICIARIOS).where(FuncionarioDB.id == id)
+    return consulta.execution_options(populate_existing=True) if recarregar else consulta
+
+def consulta_historico(funcionario_id: int, cursor: Optional[str], limit: int) -> Select:
+    """Auditoria de um funcionário, da alteração mais recente para a mais antiga."""
+    consulta = select(AuditoriaFuncionarioDB).where(AuditoriaFuncionarioDB.funcionario_id == funcionario_id)
+    return aplicar_cursor(consulta, AuditoriaFuncionarioDB.id, cursor, limit, decrescente=True)
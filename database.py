@@ -1,29 +1,247 @@
-from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event, inspect, select, Column, Integer, String, TIMESTAMP, func
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.schema import CreateIndex
 from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from instrumentacao import PoolFilaAssincronaMedida, PoolFilaMedida
+from replicas import Replica, Roteador, SessaoRoteada
+import asyncio
+import hashlib
 import os
+from typing import Optional
 
 # Carregar variáveis de ambiente do .env
 load_dotenv()
 
-# Criar URL do banco de dados com valores padrão para evitar erros
-DATABASE_URL = f"postgresql://{os.getenv('POSTGRES_USER', 'user')}:{os.getenv('POSTGRES_PASSWORD', 'password')}" \
+# Criar URL do banco de dados: DATABASE_URL tem prioridade; senão monta a URL do PostgreSQL
+DATABASE_URL = os.getenv("DATABASE_URL") or \
+               f"postgresql://{os.getenv('POSTGRES_USER', 'user')}:{os.getenv('POSTGRES_PASSWORD', 'password')}" \
                f"@{os.getenv('POSTGRES_HOST', 'localhost')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'database')}"
 
-# Criar o motor do SQLAlchemy (com echo=True para depuração)
-engine = create_engine(DATABASE_URL, echo=True)
+# 🔀 Réplicas de leitura (URLs separadas por vírgula); vazio = tudo no primário (DATABASE_URL)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
 
-# Criar sessão do banco de dados
+# ⚙️ Ajustes do motor (via .env)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower()  # false | true (SQL) | debug (SQL + linhas retornadas)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+# 🗂️ Esquema na inicialização: "verificar" (só recria se a assinatura do modelo mudou),
+# "criar" (create_all + colunas e índices a cada boot) ou "nenhum" (migrações aplicadas fora do app)
+DB_SCHEMA_STARTUP = os.getenv("DB_SCHEMA_STARTUP", "verificar").lower()
+
+# 🔄 Sessões das rotas: "true" usa o driver assíncrono (asyncpg/aiosqlite); "false", o driver síncrono no
+# threadpool. "auto": assíncrono, exceto no SQLite, onde o aiosqlite (uma troca de thread por operação) é
+# mais lento que o sqlite3 (ver benchmarks/bench_sync_async.py)
+DB_ASYNC_SESSIONS = os.getenv("DB_ASYNC_SESSIONS", "auto").lower()
+
+# Drivers assíncronos equivalentes (asyncpg para PostgreSQL, aiosqlite para SQLite)
+DRIVERS_ASSINCRONOS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def url_assincrona(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono do mesmo banco."""
+    url = make_url(url)
+    driver = DRIVERS_ASSINCRONOS.get(url.get_backend_name())
+    return url.set(drivername=driver).render_as_string(hide_password=False) if driver else str(url)
+
+def _nivel_echo():
+    return {"true": True, "info": True, "debug": "debug"}.get(DB_ECHO, False)
+
+def _opcoes_engine(url: str, assincrono: bool = False) -> dict:
+    """Opções de pool e log conforme o banco da URL."""
+    url = make_url(url)
+    opcoes = {"echo": _nivel_echo(), "pool_pre_ping": DB_POOL_PRE_PING}
+
+    if url.get_backend_name() == "sqlite":
+        opcoes["connect_args"] = {"check_same_thread": False} if url.get_driver_name() == "pysqlite" else {}
+        if url.database in (None, "", ":memory:"):
+            return opcoes  # Banco em memória usa um pool próprio, sem tamanho configurável
+
+    opcoes.update(
+        poolclass=PoolFilaAssincronaMedida if assincrono else PoolFilaMedida,  # Mede a espera por conexão
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return opcoes
+
+def _configurar_sqlite(engine: Engine) -> None:
+    """Aplica os PRAGMAs de desempenho a cada nova conexão SQLite (WAL, synchronous=NORMAL, mmap, busy timeout)."""
+    @event.listens_for(engine, "connect")
+    def _pragmas(conexao_dbapi, registro_conexao):
+        cursor = conexao_dbapi.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+def criar_engine(url: str = DATABASE_URL) -> Engine:
+    """Cria o motor síncrono com as configurações do ambiente."""
+    novo_engine = create_engine(url, **_opcoes_engine(url))
+    if novo_engine.dialect.name == "sqlite":
+        _configurar_sqlite(novo_engine)
+    return novo_engine
+
+def criar_engine_assincrono(url: str = DATABASE_URL) -> AsyncEngine:
+    """Cria o motor assíncrono equivalente ao da URL informada."""
+    url_async = url_assincrona(url)
+    novo_engine = create_async_engine(url_async, **_opcoes_engine(url_async, assincrono=True))
+    if novo_engine.dialect.name == "sqlite":
+        _configurar_sqlite(novo_engine.sync_engine)
+    return novo_engine
+
+# Criar os motores do SQLAlchemy (síncrono e assíncrono)
+engine = criar_engine()
+async_engine = criar_engine_assincrono()
+
+roteador = Roteador([
+    Replica(f"replica{posicao}", criar_engine(url), criar_engine_assincrono(url))
+    for posicao, url in enumerate(DATABASE_REPLICA_URLS, start=1)
+])
+
+# Criar sessões do banco de dados
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+# Sessões de leitura: consultas na réplica escolhida pelo roteador, escritas no primário (SessaoRoteada)
+AsyncSessionLeitura = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=SessaoRoteada, autoflush=False, expire_on_commit=False
+)
+
+# Sessões síncronas das rotas (DB_ASYNC_SESSIONS desligado), com as mesmas opções das assíncronas
+SessionRotas = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+SessionLeitura = sessionmaker(bind=engine, class_=SessaoRoteada, autoflush=False, expire_on_commit=False)
+
+SESSOES_ASSINCRONAS = DB_ASYNC_SESSIONS == "true" or (DB_ASYNC_SESSIONS == "auto" and engine.dialect.name != "sqlite")
+
+# Transações em thread abertas ao mesmo tempo, no máximo o que o pool comporta: as excedentes esperam
+# no event loop. Threads paradas esperando conexão ocupariam o threadpool de quem precisa devolvê-las
+_vagas_sessoes = asyncio.Semaphore(DB_POOL_SIZE + DB_MAX_OVERFLOW)
+
+class SessaoEmThread:
+    """
+    Sessão síncrona com a interface da AsyncSession usada pelas rotas: cada operação roda no
+    threadpool, como nas rotas síncronas, e as rotas async funcionam sem o driver assíncrono.
+    A vaga do pool é reservada na primeira operação da transação e devolvida no commit, rollback
+    ou fechamento, como a conexão: uma sessão aberta e ociosa não prende vaga de ninguém.
+    """
+
+    def __init__(self, sessao: Session):
+        self.sessao = sessao
+        self._com_vaga = False
+
+    async def _executar(self, funcao, *args, reservar: bool = True, **kwargs):
+        if reservar and not self._com_vaga:
+            await _vagas_sessoes.acquire()
+            self._com_vaga = True
+        try:
+            return await run_in_threadpool(funcao, *args, **kwargs)
+        finally:
+            if self._com_vaga and not self.sessao.in_transaction():
+                self._com_vaga = False
+                _vagas_sessoes.release()
+
+    @property
+    def info(self) -> dict:
+        return self.sessao.info
+
+    def add(self, instancia) -> None:
+        self.sessao.add(instancia)
+
+    async def execute(self, comando, params=None, **kwargs):
+        # Linhas lidas ainda no threadpool, como na AsyncSession (prebuffer_rows)
+        opcoes = {**kwargs.pop("execution_options", {}), "prebuffer_rows": True}
+        return await self._executar(self.sessao.execute, comando, params, execution_options=opcoes, **kwargs)
+
+    async def scalar(self, comando, params=None, **kwargs):
+        return (await self.execute(comando, params, **kwargs)).scalar()
+
+    async def scalars(self, comando, params=None, **kwargs):
+        return (await self.execute(comando, params, **kwargs)).scalars()
+
+    async def get(self, entidade, identidade, **kwargs):
+        return await self._executar(self.sessao.get, entidade, identidade, **kwargs)
+
+    async def flush(self) -> None:
+        await self._executar(self.sessao.flush)
+
+    async def commit(self) -> None:
+        await self._executar(self.sessao.commit)  # Pode ter um flush pendente (precisa de conexão)
+
+    async def rollback(self) -> None:
+        await self._executar(self.sessao.rollback, reservar=False)
+
+    async def close(self) -> None:
+        await self._executar(self.sessao.close, reservar=False)
+
+    async def __aenter__(self) -> "SessaoEmThread":
+        return self
+
+    async def __aexit__(self, *excecao) -> None:
+        await self.close()
+
+def _abrir_sessao(fabrica_assincrona, fabrica_sincrona, info: dict):
+    """Sessão das rotas no modo de DB_ASYNC_SESSIONS (use com `async with`)."""
+    if SESSOES_ASSINCRONAS:
+        return fabrica_assincrona(info=info)
+    return SessaoEmThread(fabrica_sincrona(info=info))
+
+def sessao_leitura(request: Request):
+    """
+    Sessão de leitura avulsa, fechada pelo próprio chamador (`async with`) logo após a consulta:
+    réplica disponível, ou o primário se o cliente escreveu há pouco.
+    """
+    cliente = _cliente(request)
+    info = {"cliente": cliente, "replica": roteador.escolher(cliente), "assincrono": SESSOES_ASSINCRONAS}
+    return _abrir_sessao(AsyncSessionLeitura, SessionLeitura, info)
+
+def sessao_primario():
+    """Sessão avulsa no primário (use com `async with`), no modo de DB_ASYNC_SESSIONS."""
+    return _abrir_sessao(AsyncSessionLocal, SessionRotas, {})
 
 # Criar base declarativa
 Base = declarative_base()
 
+def _cliente(request: Request) -> str:
+    """Identifica o cliente para a aderência ao primário: o token enviado ou, sem ele, o IP."""
+    return request.headers.get("authorization") or (request.client.host if request.client else "")
+
+# ✍️ Sessões que escreveram: ao confirmar, o cliente (info["cliente"]) passa a ler do primário por um tempo
+@event.listens_for(Session, "after_flush")
+def _registrar_flush(sessao, contexto_flush):
+    sessao.info["escreveu"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(estado):
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        estado.session.info["escreveu"] = True
+
+@event.listens_for(Session, "after_commit")
+def _aderir_ao_primario(sessao):
+    if sessao.info.pop("escreveu", False):
+        roteador.marcar_escrita(sessao.info.get("cliente"))
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_escrita(sessao):
+    sessao.info.pop("escreveu", None)
+
 # Função para obter a sessão do banco de dados
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    db = SessionLocal(info={"cliente": _cliente(request)})
     try:
         yield db
+    except HTTPException:
+        db.rollback()  # Resposta de erro da própria rota (404, 412...): não é falha do banco
+        raise
     except Exception as e:
         print(f"Erro na sessão do banco de dados: {e}")
         db.rollback()
@@ -31,13 +249,122 @@ def get_db():
     finally:
         db.close()
 
+# Função para obter a sessão das rotas async (AsyncSession ou SessaoEmThread, conforme DB_ASYNC_SESSIONS)
+async def get_async_db(request: Request):
+    async with _abrir_sessao(AsyncSessionLocal, SessionRotas, {"cliente": _cliente(request)}) as db:
+        try:
+            yield db
+        except HTTPException:
+            await db.rollback()  # Resposta de erro da própria rota (404, 412...): não é falha do banco
+            raise
+        except Exception as e:
+            print(f"Erro na sessão do banco de dados: {e}")
+            await db.rollback()
+            raise
+
+# Sessão assíncrona das rotas de consulta: réplica disponível, ou o primário se o cliente escreveu há pouco
+async def get_async_db_leitura(request: Request):
+    async with sessao_leitura(request) as db:
+        try:
+            yield db
+        except HTTPException:
+            await db.rollback()  # Resposta de erro da própria rota (404, 412...): não é falha do banco
+            raise
+        except Exception as e:
+            print(f"Erro na sessão do banco de dados: {e}")
+            await db.rollback()
+            raise
+
+def _adicionar_colunas_ausentes(conexao) -> None:
+    """
+    Acrescenta às tabelas existentes as colunas novas do modelo (create_all só cria tabelas).
+    Defaults constantes entram no ALTER; os demais (ex.: now()) ficam nulos nas linhas antigas.
+    """
+    inspetor = inspect(conexao)
+    for tabela in Base.metadata.sorted_tables:
+        existentes = {c["name"] for c in inspetor.get_columns(tabela.name)}
+        for coluna in tabela.columns:
+            if coluna.name in existentes:
+                continue
+            ddl = f"ALTER TABLE {tabela.name} ADD COLUMN {coluna.name} {coluna.type.compile(conexao.dialect)}"
+            padrao = getattr(coluna.server_default, "arg", None)
+            if isinstance(padrao, str):
+                ddl += f" DEFAULT '{padrao}'" + ("" if coluna.nullable else " NOT NULL")
+            conexao.exec_driver_sql(ddl)
+            print(f"➕ Coluna {tabela.name}.{coluna.name} adicionada")
+
+# Tabelas, índices e sequências que saíram dos modelos: removidos dos bancos existentes na próxima atualização do esquema
+TABELAS_REMOVIDAS = ("sequencia_alteracoes",)
+INDICES_REMOVIDOS = ("ix_funcionarios_nome_lower",)
+SEQUENCIAS_REMOVIDAS = ("funcionarios_sequencia_seq",)
+
 # Criar tabelas no banco de dados
-def criar_tabelas():
+def criar_tabelas() -> bool:
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all não cria índices novos em tabelas que já existem; IF NOT EXISTS porque
+        # a reflexão do SQLite não enxerga índices de expressão
+        with engine.begin() as conexao:
+            _adicionar_colunas_ausentes(conexao)
+            for tabela in Base.metadata.sorted_tables:
+                for indice in tabela.indexes:
+                    conexao.execute(CreateIndex(indice, if_not_exists=True))
+            for nome in INDICES_REMOVIDOS:
+                conexao.exec_driver_sql(f"DROP INDEX IF EXISTS {nome}")
+            for nome in TABELAS_REMOVIDAS:
+                conexao.exec_driver_sql(f"DROP TABLE IF EXISTS {nome}")
+            for nome in SEQUENCIAS_REMOVIDAS if conexao.dialect.supports_sequences else ():
+                conexao.exec_driver_sql(f"DROP SEQUENCE IF EXISTS {nome}")
         print("✅ Tabelas criadas com sucesso!")
+        return True
     except Exception as e:
         print(f"❌ Erro ao criar tabelas: {e}")
+        return False
+
+def assinatura_esquema() -> str:
+    """Hash das tabelas, colunas e índices declarados nos modelos; muda a cada alteração do esquema."""
+    partes = []
+    for tabela in Base.metadata.sorted_tables:
+        partes.append(f"T {tabela.name}")
+        for coluna in tabela.columns:
+            padrao = getattr(coluna.server_default, "arg", None)
+            partes.append(f"C {coluna.name} {coluna.type!r} {coluna.nullable} {padrao}")
+        for indice in sorted(tabela.indexes, key=lambda i: i.name or ""):
+            partes.append(f"I {indice.name} {indice.unique} {[str(e) for e in indice.expressions]}")
+    return hashlib.sha256("\n".join(partes).encode()).hexdigest()
+
+def _assinatura_gravada() -> Optional[str]:
+    try:
+        with engine.connect() as conexao:
+            return conexao.scalar(select(VersaoEsquema.assinatura).where(VersaoEsquema.id == 1))
+    except SQLAlchemyError:
+        return None  # Banco novo: a tabela versao_esquema ainda não existe
+
+def preparar_esquema(modo: str = DB_SCHEMA_STARTUP) -> str:
+    """
+    Prepara o esquema na inicialização conforme DB_SCHEMA_STARTUP. No modo "verificar", um único
+    SELECT compara a assinatura gravada com a dos modelos e evita o create_all (que reflete cada tabela).
+    :return: "inalterado", "atualizado", "falhou" ou "ignorado".
+    """
+    if modo == "nenhum":
+        return "ignorado"
+    assinatura = assinatura_esquema()
+    if modo == "verificar" and _assinatura_gravada() == assinatura:
+        return "inalterado"
+    if not criar_tabelas():
+        return "falhou"
+    with engine.begin() as conexao:
+        conexao.execute(VersaoEsquema.__table__.delete())
+        conexao.execute(VersaoEsquema.__table__.insert().values(id=1, assinatura=assinatura))
+    return "atualizado"
+
+# Assinatura do esquema aplicado (uma linha), conferida por preparar_esquema
+class VersaoEsquema(Base):
+    __tablename__ = "versao_esquema"
+
+    id = Column(Integer, primary_key=True)
+    assinatura = Column(String(64), nullable=False)
+    aplicada_em = Column(TIMESTAMP, server_default=func.now())
 
 # Modelo de Usuário RH
 class UsuarioRH(Base):
@@ -0,0 +1,66 @@
+import os
+import threading
+from typing import List
+from sqlalchemy import Select, case, func, select
+
+import database
+from cache import CacheTTL
+from models import FuncionarioDB
+
+# 🏢 Resumo por departamento mantido em memória
+# Invalidado a cada escrita em routes_funcionarios; o TTL cobre escritas feitas por outros workers.
+# Agregado sempre no primário: um resumo lido de uma réplica atrasada seria servido a todos até o TTL
+DEPARTAMENTOS_CACHE_TTL_SECONDS = float(os.getenv("DEPARTAMENTOS_CACHE_TTL_SECONDS", 300))
+
+_CHAVE_RESUMO = "resumo"
+cache_departamentos = CacheTTL(tamanho_maximo=1, ttl=DEPARTAMENTOS_CACHE_TTL_SECONDS)
+# Incrementada a cada invalidação: um resumo agregado antes dela não entra no cache
+_geracao = 0
+_lock_geracao = threading.Lock()
+
+def invalidar_departamentos() -> None:
+    """Descarta o resumo em cache (chamado após criar, alterar ou desativar funcionários)."""
+    global _geracao
+    with _lock_geracao:
+        _geracao += 1
+        cache_departamentos.invalidar(_CHAVE_RESUMO)
+
+def consulta_resumo_departamentos() -> Select:
+    """GROUP BY por departamento: funcionários ativos e soma dos salários dos ativos."""
+    ativo = FuncionarioDB.ativo.is_(True)
+    return (
+        select(
+            FuncionarioDB.departamento,
+            func.sum(case((ativo, 1), else_=0)).label("funcionarios_ativos"),
+            func.sum(case((ativo, FuncionarioDB.salario), else_=0)).label("folha_salarial"),
+        )
+        .where(FuncionarioDB.departamento.isnot(None), FuncionarioDB.departamento != "")
+        .group_by(FuncionarioDB.departamento)
+        .order_by(FuncionarioDB.departamento)
+    )
+
+async def obter_resumo_departamentos() -> List[dict]:
+    """
+    Retorna, por departamento, o total de funcionários ativos e a folha salarial dos ativos.
+    A tabela só é agregada (um GROUP BY) quando o cache está vazio; nas demais chamadas o
+    custo é proporcional ao número de departamentos.
+    """
+    resumo = cache_departamentos.obter(_CHAVE_RESUMO)
+    if resumo is not None:
+        return resumo
+
+    geracao = _geracao
+    async with database.sessao_primario() as db:
+        linhas = (await db.execute(consulta_resumo_departamentos())).all()
+    resumo = [
+        {
+            "departamento": linha.departamento,
+            "funcionarios_ativos": int(linha.funcionarios_ativos or 0),
+            "folha_salarial": float(linha.folha_salarial or 0),
+        }
+        for linha in linhas
+    ]
+    with _lock_geracao:
+        if geracao == _geracao:  # Uma escrita invalidou no meio da agregação: o resumo pode estar antigo
+            cache_departamentos.definir(_CHAVE_RESUMO, resumo)
+    return resumo
@@ -0,0 +1,174 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from typing import Dict, NamedTuple, Optional
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+
+from cache_http import etag_confere
+
+try:
+    import brotli  # Opcional: sem o pacote, os arquivos são servidos só com gzip
+except ImportError:
+    brotli = None
+
+# 🗜️ Arquivos estáticos do frontend: comprimidos uma vez na inicialização e com nome versionado
+# CSS e JS ganham um nome com o hash do conteúdo (styles.3fa9c2b1d0.css), citado nos HTML no lugar
+# do original, e podem ficar no cache do navegador para sempre. HTML e nomes originais revalidam (ETag/304)
+STATIC_CACHE_MAX_AGE = int(os.getenv("STATIC_CACHE_MAX_AGE", 31536000))
+STATIC_COMPRESS_MIN_SIZE = int(os.getenv("STATIC_COMPRESS_MIN_SIZE", 512))
+STATIC_RELOAD = os.getenv("STATIC_RELOAD", "false").lower() == "true"
+
+CACHE_IMUTAVEL = f"public, max-age={STATIC_CACHE_MAX_AGE}, immutable"
+CACHE_REVALIDAR = "no-cache"
+EXTENSOES_VERSIONADAS = (".css", ".js")
+# href="css/styles.css" / src="../js/auth.js" (caminhos relativos, sem query string nem fragmento)
+_REFERENCIA = re.compile(r"""(?P<prefixo>(?:href|src)=["'])(?P<url>[^"'?#:]+\.(?:css|js))(?=["'])""")
+
+class Variante(NamedTuple):
+    """Uma representação pronta do arquivo (sem compressão, gzip ou br)."""
+    corpo: bytes
+    etag: str
+
+class Arquivo(NamedTuple):
+    tipo: str
+    cache_control: str
+    variantes: Dict[str, Variante]  # Codificação ("identity", "gzip", "br") -> representação
+
+def _codificacoes_aceitas(cabecalho: str) -> Dict[str, float]:
+    """Accept-Encoding como {codificação: q}; `gzip;q=0` recusa o gzip."""
+    aceitas = {}
+    for item in cabecalho.split(","):
+        codificacao, _, parametros = item.strip().partition(";")
+        q = 1.0
+        if parametros.strip().startswith("q="):
+            try:
+                q = float(parametros.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if codificacao:
+            aceitas[codificacao.lower()] = q
+    return aceitas
+
+def _comprimir(conteudo: bytes, resumo: str) -> Dict[str, Variante]:
+    variantes = {"identity": Variante(conteudo, f'"{resumo}"')}
+    if len(conteudo) < STATIC_COMPRESS_MIN_SIZE:
+        return variantes
+    comprimidos = {"gzip": gzip.compress(conteudo, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        comprimidos["br"] = brotli.compress(conteudo, quality=11)
+    for codificacao, corpo in comprimidos.items():
+        if len(corpo) < len(conteudo):
+            variantes[codificacao] = Variante(corpo, f'"{resumo}-{codificacao}"')
+    return variantes
+
+def _tipo(caminho: str) -> str:
+    tipo = mimetypes.guess_type(caminho)[0] or "application/octet-stream"
+    return f"{tipo}; charset=utf-8" if tipo.startswith("text/") or tipo.endswith("javascript") else tipo
+
+class ArquivosEstaticos:
+    """
+    Aplicação ASGI (montada em /static) que serve da memória os arquivos de `diretorio`, escolhendo
+    br/gzip pelo Accept-Encoding e respondendo 304 quando o If-None-Match confere.
+    Com STATIC_RELOAD (desenvolvimento), relê a pasta quando algum arquivo muda.
+    """
+
+    def __init__(self, diretorio: str, recarregar: bool = STATIC_RELOAD):
+        self.diretorio = diretorio
+        self.recarregar = recarregar
+        self.arquivos: Dict[str, Arquivo] = {}
+        self.versoes: Dict[str, str] = {}  # Caminho original -> caminho versionado (css/styles.3fa9c2b1d0.css)
+        self._assinatura = None
+        self.carregar()
+
+    def _listar(self) -> Dict[str, str]:
+        caminhos = {}
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                completo = os.path.join(raiz, nome)
+                caminhos[os.path.relpath(completo, self.diretorio).replace(os.sep, "/")] = completo
+        return caminhos
+
+    def _assinatura_pasta(self, caminhos: Dict[str, str]) -> tuple:
+        return tuple(sorted((relativo, os.stat(completo).st_mtime_ns) for relativo, completo in caminhos.items()))
+
+    def carregar(self) -> None:
+        """Lê, versiona e comprime todos os arquivos; os HTML passam a citar os CSS/JS versionados."""
+        caminhos = self._listar()
+        conteudos = {}
+        for relativo, completo in caminhos.items():
+            with open(completo, "rb") as arquivo:
+                conteudos[relativo] = arquivo.read()
+
+        arquivos, versoes = {}, {}
+        for relativo, conteudo in conteudos.items():
+            if relativo.endswith(EXTENSOES_VERSIONADAS):
+                base, extensao = posixpath.splitext(relativo)
+                versoes[relativo] = f"{base}.{hashlib.blake2b(conteudo, digest_size=5).hexdigest()}{extensao}"
+
+        for relativo, conteudo in conteudos.items():
+            if relativo.endswith((".html", ".htm")):
+                conteudo = self._versionar_referencias(relativo, conteudo, versoes)
+            resumo = hashlib.blake2b(conteudo, digest_size=10).hexdigest()
+            variantes = _comprimir(conteudo, resumo)
+            arquivos[relativo] = Arquivo(_tipo(relativo), CACHE_REVALIDAR, variantes)
+            if relativo in versoes:
+                arquivos[versoes[relativo]] = Arquivo(_tipo(relativo), CACHE_IMUTAVEL, variantes)
+
+        self.arquivos, self.versoes = arquivos, versoes
+        self._assinatura = self._assinatura_pasta(caminhos) if self.recarregar else None
+
+    @staticmethod
+    def _versionar_referencias(caminho_html: str, conteudo: bytes, versoes: Dict[str, str]) -> bytes:
+        pasta = posixpath.dirname(caminho_html)
+
+        def trocar(referencia: re.Match) -> str:
+            url = referencia.group("url")
+            versionado = versoes.get(posixpath.normpath(posixpath.join(pasta, url)))
+            if versionado is None:
+                return referencia.group(0)
+            return referencia.group("prefixo") + posixpath.join(posixpath.dirname(url), posixpath.basename(versionado))
+
+        return _REFERENCIA.sub(trocar, conteudo.decode("utf-8")).encode("utf-8")
+
+    def _localizar(self, scope) -> Optional[Arquivo]:
+        caminho, raiz = scope["path"], scope.get("root_path", "")
+        if raiz and caminho.startswith(raiz):
+            caminho = caminho[len(raiz):]
+        caminho = caminho.lstrip("/")
+        if caminho == "" or caminho.endswith("/"):
+            caminho += "index.html"
+        return self.arquivos.get(caminho) or self.arquivos.get(f"{caminho}/index.html")
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] not in ("GET", "HEAD"):
+            await PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})(scope, receive, send)
+            return
+        if self.recarregar and self._assinatura_pasta(self._listar()) != self._assinatura:
+            self.carregar()
+
+        arquivo = self._localizar(scope)
+        if arquivo is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        cabecalhos = Headers(scope=scope)
+        aceitas = _codificacoes_aceitas(cabecalhos.get("accept-encoding", ""))
+        codificacao = next((c for c in ("br", "gzip") if c in arquivo.variantes and aceitas.get(c, 0) > 0), "identity")
+        variante = arquivo.variantes[codificacao]
+
+        resposta_cabecalhos = {"ETag": variante.etag, "Cache-Control": arquivo.cache_control}
+        if len(arquivo.variantes) > 1:
+            resposta_cabecalhos["Vary"] = "Accept-Encoding"
+        if etag_confere(cabecalhos.get("if-none-match"), variante.etag):
+            await Response(status_code=304, headers=resposta_cabecalhos)(scope, receive, send)
+            return
+        if codificacao != "identity":
+            resposta_cabecalhos["Content-Encoding"] = codificacao
+        corpo = variante.corpo if scope["method"] == "GET" else b""
+        resposta = Response(corpo, headers=resposta_cabecalhos, media_type=arquivo.tipo)
+        resposta.headers["Content-Length"] = str(len(variante.corpo))
+        await resposta(scope, receive, send)
@@ -0,0 +1,55 @@
+import csv
+import io
+import itertools
+import zlib
+from typing import Callable, Iterator
+from pydantic_core import to_json
+from sqlalchemy.orm import Query as ConsultaORM, Session
+
+from models import FuncionarioDB
+from paginacao import percorrer_em_blocos
+
+FORMATOS_EXPORTACAO = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+COLUNAS_EXPORTACAO = FuncionarioDB.__table__.columns.keys()
+
+# 📤 Serialização por bloco
+def _blocos_csv(blocos: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUNAS_EXPORTACAO)
+    for bloco in itertools.chain([[]], blocos):  # Bloco vazio: o cabeçalho sai antes da consulta rodar
+        escritor.writerows(bloco)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+def _blocos_ndjson(blocos: Iterator[list]) -> Iterator[bytes]:
+    for bloco in blocos:
+        yield b"".join(to_json(dict(linha._mapping)) + b"\n" for linha in bloco)
+
+def _comprimir_gzip(partes: Iterator[bytes]) -> Iterator[bytes]:
+    """Comprime em gzip à medida que os blocos são gerados."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for numero, parte in enumerate(partes):
+        comprimido = compressor.compress(parte)
+        if numero == 0:
+            comprimido += compressor.flush(zlib.Z_SYNC_FLUSH)  # Entrega o início (cabeçalho CSV) sem esperar o buffer
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+def transmitir_exportacao(
+    montar_consulta: Callable[[Session], ConsultaORM],
+    formato: str,
+    gzip: bool = False
+) -> Iterator[bytes]:
+    """
+    Gera o cadastro de funcionários em CSV ou NDJSON direto do cursor do servidor.
+    A memória usada é a de um bloco, independente da quantidade de linhas.
+    :param montar_consulta: Função que recebe a sessão e devolve a consulta (colunas de COLUNAS_EXPORTACAO).
+    :param formato: `csv` ou `ndjson`.
+    :param gzip: Comprime a saída em gzip durante a transmissão.
+    """
+    blocos = percorrer_em_blocos(montar_consulta)
+    partes = _blocos_csv(blocos) if formato == "csv" else _blocos_ndjson(blocos)
+    return _comprimir_gzip(partes) if gzip else partes
@@ -0,0 +1,106 @@
+import os
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import Float, func, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import FuncionarioDB
+
+# 💰 Estimativa da folha mensal (bruto, adicionais e FGTS) calculada em colunas NumPy
+# Periculosidade incide sobre o salário base; insalubridade sobre o salário mínimo (CLT, art. 192)
+FOLHA_SALARIO_MINIMO = float(os.getenv("FOLHA_SALARIO_MINIMO", 1518.00))
+FGTS_ALIQUOTA = 0.08
+FGTS_ALIQUOTA_APRENDIZ = 0.02
+
+def _numerica(coluna):
+    # float em vez de Decimal: evita a conversão linha a linha do tipo Numeric; nulos viram zero no banco
+    return type_coerce(func.coalesce(coluna, 0), Float).label(coluna.key)
+
+COLUNAS_FOLHA = (
+    FuncionarioDB.departamento,
+    _numerica(FuncionarioDB.salario),
+    _numerica(FuncionarioDB.horas_mensais),
+    _numerica(FuncionarioDB.adicional_periculosidade),
+    _numerica(FuncionarioDB.adicional_insalubridade),
+    func.lower(FuncionarioDB.tipo_pagamento).like("%hora%").label("horista"),
+    func.lower(FuncionarioDB.tipo_contrato).like("%aprendiz%").label("aprendiz"),
+)
+VALORES_FOLHA = ("salario_base", "adicional_periculosidade", "adicional_insalubridade", "bruto", "fgts")
+
+def carregar_colunas(linhas: List[tuple]) -> Dict[str, np.ndarray]:
+    """Transpõe as linhas de COLUNAS_FOLHA em um array por coluna."""
+    departamento, salario, horas, periculosidade, insalubridade, horista, aprendiz = (
+        zip(*linhas) if linhas else ((),) * len(COLUNAS_FOLHA)
+    )
+
+    def numerico(valores) -> np.ndarray:
+        return np.array(valores, dtype=np.float64)
+
+    return {
+        "departamento": np.array(departamento, dtype=object),
+        "salario": numerico(salario),
+        "horas_mensais": numerico(horas),
+        "adicional_periculosidade": numerico(periculosidade),
+        "adicional_insalubridade": numerico(insalubridade),
+        "horista": np.array(horista, dtype=bool),
+        "aprendiz": np.array(aprendiz, dtype=bool),
+    }
+
+def calcular_folha(colunas: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Calcula os valores de cada funcionário em uma única passada vetorizada.
+    Horistas têm `salario` como valor da hora (base = salário x horas mensais);
+    os adicionais são percentuais (30.00 = 30%).
+    :return: Um array por item de VALORES_FOLHA, alinhado com as colunas de entrada.
+    """
+    salario_base = np.where(colunas["horista"], colunas["salario"] * colunas["horas_mensais"], colunas["salario"])
+    periculosidade = salario_base * colunas["adicional_periculosidade"] / 100
+    insalubridade = FOLHA_SALARIO_MINIMO * colunas["adicional_insalubridade"] / 100
+    bruto = salario_base + periculosidade + insalubridade
+    fgts = bruto * np.where(colunas["aprendiz"], FGTS_ALIQUOTA_APRENDIZ, FGTS_ALIQUOTA)
+    return {
+        "salario_base": salario_base,
+        "adicional_periculosidade": periculosidade,
+        "adicional_insalubridade": insalubridade,
+        "bruto": bruto,
+        "fgts": fgts,
+    }
+
+def _resumo(departamento: Optional[str], funcionarios: int, totais: Dict[str, float]) -> dict:
+    return {
+        "departamento": departamento,
+        "funcionarios": funcionarios,
+        **{valor: round(float(totais[valor]), 2) for valor in VALORES_FOLHA},
+    }
+
+def consolidar_folha(colunas: Dict[str, np.ndarray], valores: Dict[str, np.ndarray]) -> dict:
+    """
+    Soma os valores da empresa e de cada departamento (np.unique + np.bincount, sem laço por funcionário).
+    :return: Dicionário no formato de `FolhaPagamento`.
+    """
+    departamentos, grupo = np.unique(colunas["departamento"].astype(str), return_inverse=True)
+    quantidades = np.bincount(grupo, minlength=len(departamentos))
+    por_departamento = {
+        valor: np.bincount(grupo, weights=valores[valor], minlength=len(departamentos)) for valor in VALORES_FOLHA
+    }
+    return {
+        "salario_minimo": FOLHA_SALARIO_MINIMO,
+        "total": _resumo(None, len(grupo), {valor: valores[valor].sum() for valor in VALORES_FOLHA}),
+        "departamentos": [
+            _resumo(departamento, int(quantidades[i]), {valor: por_departamento[valor][i] for valor in VALORES_FOLHA})
+            for i, departamento in enumerate(departamentos)
+        ],
+    }
+
+async def obter_folha(db: AsyncSession, departamento: Optional[str] = None) -> dict:
+    """
+    Busca só as colunas da folha dos funcionários ativos (sem montar objetos ORM) e consolida.
+    :param departamento: Restringe o cálculo a um departamento.
+    """
+    consulta = select(*COLUNAS_FOLHA).where(FuncionarioDB.ativo == True)
+    if departamento:
+        consulta = consulta.where(FuncionarioDB.departamento == departamento)
+    linhas = (await db.execute(consulta)).all()
+
+    colunas = carregar_colunas(linhas)
+    return consolidar_folha(colunas, calcular_folha(colunas))
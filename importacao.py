@@ -0,0 +1,142 @@
+import codecs
+import csv
+import json
+import logging
+import time
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import BeneficiarioDB, FuncionarioCreate, FuncionarioDB
+
+logger = logging.getLogger(__name__)
+
+FORMATOS_IMPORTACAO = ("csv", "ndjson")
+TAMANHO_LOTE_PADRAO = 1000
+
+# 📥 Leitura do arquivo (linha a linha, sem carregar tudo em memória)
+def detectar_formato(nome_arquivo: Optional[str], formato: Optional[str]) -> str:
+    """Usa o formato informado ou deduz pela extensão do arquivo."""
+    formato = (formato or (nome_arquivo or "").rsplit(".", 1)[-1]).lower()
+    if formato in ("jsonl", "json"):
+        formato = "ndjson"
+    if formato not in FORMATOS_IMPORTACAO:
+        raise ValueError(f"Formato não suportado: use {' ou '.join(FORMATOS_IMPORTACAO)}")
+    return formato
+
+def ler_linhas(arquivo: BinaryIO, formato: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Percorre o arquivo e produz (número da linha, dados brutos, erro de leitura).
+    No CSV, a coluna `beneficiarios` deve conter uma lista JSON e células vazias viram ausentes.
+    """
+    texto = codecs.getreader("utf-8-sig")(arquivo)
+
+    if formato == "csv":
+        leitor = csv.DictReader(texto)
+        for registro in leitor:
+            dados = {k: v for k, v in registro.items() if k and v not in ("", None)}
+            if "beneficiarios" in dados:
+                try:
+                    dados["beneficiarios"] = json.loads(dados["beneficiarios"])
+                except ValueError:
+                    yield leitor.line_num, None, "beneficiarios: JSON inválido"
+                    continue
+            yield leitor.line_num, dados, None
+        return
+
+    for numero, linha in enumerate(texto, start=1):
+        if not linha.strip():
+            continue
+        try:
+            dados = json.loads(linha)
+        except ValueError as e:
+            yield numero, None, f"JSON inválido: {e}"
+            continue
+        if not isinstance(dados, dict):
+            yield numero, None, "Cada linha deve ser um objeto JSON"
+            continue
+        yield numero, dados, None
+
+def _formatar_erros(erro: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in erro.errors()]
+
+# 💾 Inserção em lote (uma transação por lote)
+def _inserir_lote(db: Session, lote: List[Tuple[int, FuncionarioCreate]]) -> None:
+    funcionarios = [f.model_dump(exclude={"beneficiarios"}) for _, f in lote]
+    ids = db.execute(
+        insert(FuncionarioDB).returning(FuncionarioDB.id, sort_by_parameter_order=True),
+        funcionarios
+    ).scalars().all()
+
+    beneficiarios = [
+        {**b.model_dump(), "funcionario_id": funcionario_id}
+        for funcionario_id, (_, f) in zip(ids, lote)
+        for b in f.beneficiarios
+    ]
+    if beneficiarios:
+        db.execute(insert(BeneficiarioDB), beneficiarios)
+    db.commit()
+
+def _resumo_erro(erro: SQLAlchemyError) -> str:
+    """Classe e primeira linha da mensagem do driver (ex.: a constraint violada), sem o SQL nem os valores."""
+    original = getattr(erro, "orig", None) or erro
+    mensagem = str(original).strip().splitlines()
+    return f"{type(original).__name__}: {mensagem[0] if mensagem else ''}"
+
+def _gravar_lote(db: Session, lote: List[Tuple[int, FuncionarioCreate]], relatorio: dict) -> None:
+    """Grava o lote inteiro; se falhar (ex.: CPF duplicado), refaz linha a linha para isolar os erros."""
+    relatorio["lotes"] += 1
+    try:
+        _inserir_lote(db, lote)
+        relatorio["importados"] += len(lote)
+        return
+    except SQLAlchemyError as e:
+        db.rollback()
+        if len(lote) == 1:
+            relatorio["erros"].append({"linha": lote[0][0], "erros": [str(getattr(e, "orig", e))]})
+            return
+        # Só as linhas e o erro: o SQL e os parâmetros do lote trazem CPF, nomes e endereços
+        logger.warning(f"Lote das linhas {lote[0][0]}-{lote[-1][0]} com erro, repetindo linha a linha: {_resumo_erro(e)}")
+
+    for item in lote:
+        try:
+            _inserir_lote(db, [item])
+            relatorio["importados"] += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            relatorio["erros"].append({"linha": item[0], "erros": [str(getattr(e, "orig", e))]})
+
+def importar_funcionarios(db: Session, arquivo: BinaryIO, formato: str, tamanho_lote: int = TAMANHO_LOTE_PADRAO) -> dict:
+    """
+    Valida cada linha contra `FuncionarioCreate` (incluindo beneficiários) e insere em lotes.
+    Linhas inválidas não interrompem a importação: entram no relatório de erros.
+    :return: Relatório no formato de `RelatorioImportacao`.
+    """
+    inicio = time.perf_counter()
+    relatorio = {"total_linhas": 0, "importados": 0, "lotes": 0, "erros": []}
+    lote: List[Tuple[int, FuncionarioCreate]] = []
+
+    for numero, dados, erro in ler_linhas(arquivo, formato):
+        relatorio["total_linhas"] += 1
+        if erro:
+            relatorio["erros"].append({"linha": numero, "erros": [erro]})
+            continue
+        try:
+            lote.append((numero, FuncionarioCreate.model_validate(dados)))
+        except ValidationError as e:
+            relatorio["erros"].append({"linha": numero, "erros": _formatar_erros(e)})
+            continue
+
+        if len(lote) >= tamanho_lote:
+            _gravar_lote(db, lote, relatorio)
+            lote = []
+
+    if lote:
+        _gravar_lote(db, lote, relatorio)
+
+    relatorio["erros"].sort(key=lambda e: e["linha"])
+    relatorio["rejeitados"] = len(relatorio["erros"])
+    relatorio["duracao_segundos"] = round(time.perf_counter() - inicio, 3)
+    return relatorio
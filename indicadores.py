@@ -0,0 +1,231 @@
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from sqlalchemy import Integer, Select, case, cast, func, select
+
+import database
+from models import FuncionarioDB
+
+# 📈 Indicadores de pessoal: headcount, admissões/desligamentos por mês, rotatividade e faixas salariais
+# Agregados no banco (GROUP BY) e mantidos em memória; cada escrita em routes_funcionarios aplica só a
+# diferença entre o funcionário antes e depois. Escritas em lote invalidam; o TTL cobre outros workers
+INDICADORES_TTL_SECONDS = float(os.getenv("INDICADORES_TTL_SECONDS", 300))
+INDICADORES_FAIXA_SALARIAL = Decimal(os.getenv("INDICADORES_FAIXA_SALARIAL", "100.00"))
+DIMENSOES_HEADCOUNT = ("departamento", "tipo_contrato", "grau_instrucao")
+PERCENTIS_SALARIAIS = (10, 25, 50, 75, 90)
+
+Mes = Tuple[int, int]  # (ano, mês)
+
+class RegistroIndicadores(NamedTuple):
+    """O que um funcionário soma aos indicadores (mesmas chaves dos GROUP BY de `carregar_indicadores`)."""
+    ativo: bool
+    departamento: str
+    tipo_contrato: str
+    grau_instrucao: str
+    faixa_salarial: int
+    admissao: Optional[Mes]
+    demissao: Optional[Mes]
+
+def _salario_mensal_sql():
+    # Horistas guardam o valor da hora: o mensal é salário x horas (mesma regra da folha)
+    horista = func.lower(FuncionarioDB.tipo_pagamento).like("%hora%")
+    return case((horista, FuncionarioDB.salario * FuncionarioDB.horas_mensais), else_=FuncionarioDB.salario)
+
+def _faixa_salarial(salario, horas_mensais, tipo_pagamento: Optional[str]) -> int:
+    mensal = Decimal(str(salario or 0))
+    if "hora" in (tipo_pagamento or "").lower():
+        mensal *= horas_mensais or 0
+    return int(mensal // INDICADORES_FAIXA_SALARIAL)
+
+def registro_indicadores(funcionario: FuncionarioDB) -> RegistroIndicadores:
+    """Fotografia do funcionário para os indicadores (tirar antes de alterar o objeto)."""
+    def mes(data: Optional[date]) -> Optional[Mes]:
+        return (data.year, data.month) if data else None
+
+    return RegistroIndicadores(
+        ativo=bool(funcionario.ativo),
+        departamento=funcionario.departamento or "",
+        tipo_contrato=funcionario.tipo_contrato or "",
+        grau_instrucao=funcionario.grau_instrucao or "",
+        faixa_salarial=_faixa_salarial(funcionario.salario, funcionario.horas_mensais, funcionario.tipo_pagamento),
+        admissao=mes(funcionario.data_admissao),
+        demissao=mes(funcionario.data_demissao),
+    )
+
+def _somar(contador: Counter, chave, valor: int) -> None:
+    contador[chave] += valor
+    if contador[chave] <= 0:
+        del contador[chave]
+
+def _mes_anterior(mes: Mes, meses: int) -> Mes:
+    indice = mes[0] * 12 + mes[1] - 1 - meses
+    return indice // 12, indice % 12 + 1
+
+def _percentis(faixas: Counter, largura: Decimal) -> Dict[str, float]:
+    """Percentis interpolados dentro da faixa salarial (precisão de INDICADORES_FAIXA_SALARIAL)."""
+    total = sum(faixas.values())
+    resultado = {}
+    ordenadas = sorted(faixas.items())
+    for p in PERCENTIS_SALARIAIS:
+        alvo, acumulado, valor = total * p / 100, 0, 0.0
+        for faixa, quantidade in ordenadas:
+            if acumulado + quantidade >= alvo:
+                valor = (faixa + (alvo - acumulado) / quantidade) * float(largura)
+                break
+            acumulado += quantidade
+        resultado[f"p{p}"] = round(valor, 2)
+    return resultado
+
+class Indicadores:
+    """
+    Contadores agregados do quadro de pessoal. `ativos` conta os funcionários ativos por
+    (departamento, tipo de contrato, grau de instrução, faixa salarial); admissões e desligamentos
+    contam todos os funcionários pelo mês de `data_admissao` e `data_demissao`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ativos: Counter = Counter()
+        self.admissoes: Counter = Counter()
+        self.desligamentos: Counter = Counter()
+        self.carregado_em: Optional[float] = None
+        self.geracao = 0  # Incrementada a cada escrita aplicada ou invalidação (ver `carregar`)
+
+    @property
+    def precisa_carregar(self) -> bool:
+        return self.carregado_em is None or time.monotonic() - self.carregado_em > INDICADORES_TTL_SECONDS
+
+    def carregar(self, ativos: Iterable[tuple], admissoes: Iterable[tuple], desligamentos: Iterable[tuple],
+                 geracao: Optional[int] = None) -> None:
+        """
+        Substitui os contadores pelas linhas dos GROUP BY: (chaves..., quantidade).
+        :param geracao: `geracao` lida antes dos GROUP BY; se houve escrita desde então, as linhas
+            podem não incluí-la e os contadores ficam marcados para nova agregação.
+        """
+        with self._lock:
+            self.ativos = Counter({tuple(linha[:-1]): linha[-1] for linha in ativos})
+            self.admissoes = Counter({(int(ano), int(mes)): q for ano, mes, q in admissoes})
+            self.desligamentos = Counter({(int(ano), int(mes)): q for ano, mes, q in desligamentos})
+            self.carregado_em = time.monotonic() if geracao in (None, self.geracao) else None
+
+    def atualizar(self, antes: Optional[RegistroIndicadores], depois: Optional[RegistroIndicadores]) -> None:
+        """Aplica a diferença de um funcionário criado (antes=None) ou alterado, sem consultar o banco."""
+        with self._lock:
+            self.geracao += 1
+            if self.carregado_em is None:
+                return  # Ainda não carregado: a próxima leitura agrega tudo do banco
+            for registro, sinal in ((antes, -1), (depois, 1)):
+                if registro is None:
+                    continue
+                if registro.ativo:
+                    chave = (registro.departamento, registro.tipo_contrato, registro.grau_instrucao, registro.faixa_salarial)
+                    _somar(self.ativos, chave, sinal)
+                if registro.admissao:
+                    _somar(self.admissoes, registro.admissao, sinal)
+                if registro.demissao:
+                    _somar(self.desligamentos, registro.demissao, sinal)
+
+    def invalidar(self) -> None:
+        """Descarta os contadores (escritas em lote); a próxima leitura agrega de novo no banco."""
+        with self._lock:
+            self.geracao += 1
+            self.carregado_em = None
+
+    def headcount(self) -> dict:
+        """Funcionários ativos no total e por departamento, tipo de contrato e grau de instrução."""
+        with self._lock:
+            itens = list(self.ativos.items())
+        resultado = {"total": sum(q for _, q in itens)}
+        for posicao, dimensao in enumerate(DIMENSOES_HEADCOUNT):
+            grupos = Counter()
+            for chave, quantidade in itens:
+                grupos[chave[posicao]] += quantidade
+            resultado[dimensao] = [{"grupo": g, "funcionarios": q} for g, q in sorted(grupos.items())]
+        return resultado
+
+    def movimentacao(self, meses: int, ate: Optional[date] = None) -> dict:
+        """
+        Admissões, desligamentos, headcount ao fim do mês e rotatividade dos últimos `meses` meses.
+        Rotatividade = ((admissões + desligamentos) / 2) / headcount médio do mês x 100.
+        """
+        ate = ate or date.today()
+        fim = (ate.year, ate.month)
+        inicio = _mes_anterior(fim, meses - 1)
+        with self._lock:
+            admissoes, desligamentos = dict(self.admissoes), dict(self.desligamentos)
+
+        # Headcount no início do período: admitidos menos desligados antes dele
+        headcount = sum(q for m, q in admissoes.items() if m < inicio) - sum(q for m, q in desligamentos.items() if m < inicio)
+        lista, soma_headcount, total_adm, total_desl = [], 0, 0, 0
+        for deslocamento in range(meses - 1, -1, -1):
+            mes = _mes_anterior(fim, deslocamento)
+            adm, desl = admissoes.get(mes, 0), desligamentos.get(mes, 0)
+            medio = (headcount + headcount + adm - desl) / 2
+            headcount += adm - desl
+            soma_headcount += medio
+            total_adm, total_desl = total_adm + adm, total_desl + desl
+            lista.append({
+                "mes": f"{mes[0]:04d}-{mes[1]:02d}", "admissoes": adm, "desligamentos": desl, "headcount": headcount,
+                "rotatividade": round((adm + desl) / 2 / medio * 100, 2) if medio else 0.0,
+            })
+        medio_periodo = soma_headcount / meses if meses else 0
+        return {
+            "meses": lista,
+            "admissoes": total_adm,
+            "desligamentos": total_desl,
+            "rotatividade_periodo": round((total_adm + total_desl) / 2 / medio_periodo * 100, 2) if medio_periodo else 0.0,
+        }
+
+    def salarios(self) -> dict:
+        """Percentis do salário mensal dos ativos, na empresa e por departamento."""
+        with self._lock:
+            itens = list(self.ativos.items())
+        geral, por_departamento = Counter(), {}
+        for (departamento, _, _, faixa), quantidade in itens:
+            geral[faixa] += quantidade
+            por_departamento.setdefault(departamento, Counter())[faixa] += quantidade
+
+        def resumo(departamento: Optional[str], faixas: Counter) -> dict:
+            return {"departamento": departamento, "funcionarios": sum(faixas.values()), **_percentis(faixas, INDICADORES_FAIXA_SALARIAL)}
+
+        return {
+            "faixa_salarial": float(INDICADORES_FAIXA_SALARIAL),
+            "total": resumo(None, geral),
+            "departamentos": [resumo(d, f) for d, f in sorted(por_departamento.items())],
+        }
+
+indicadores = Indicadores()
+_carga_indicadores = asyncio.Lock()
+
+def _por_mes(coluna):
+    ano, mes = func.extract("year", coluna), func.extract("month", coluna)
+    return select(ano, mes, func.count()).where(coluna.isnot(None)).group_by(ano, mes)
+
+def consultas_indicadores() -> Dict[str, Select]:
+    """Os três GROUP BY que carregam os contadores: ativos por chave, admissões e desligamentos por mês."""
+    faixa = cast(func.floor(_salario_mensal_sql() / INDICADORES_FAIXA_SALARIAL), Integer)
+    chaves = [func.coalesce(getattr(FuncionarioDB, d), "") for d in DIMENSOES_HEADCOUNT] + [faixa]
+    return {
+        "ativos": select(*chaves, func.count()).where(FuncionarioDB.ativo.is_(True)).group_by(*chaves),
+        "admissoes": _por_mes(FuncionarioDB.data_admissao),
+        "desligamentos": _por_mes(FuncionarioDB.data_demissao),
+    }
+
+async def garantir_indicadores() -> Indicadores:
+    """
+    Agrega (ou reagrega, após o TTL) os indicadores no banco com três GROUP BY, uma única vez por vez.
+    Lê do primário: os contadores são compartilhados e não podem partir de uma réplica atrasada.
+    """
+    if indicadores.precisa_carregar:
+        async with _carga_indicadores:
+            if indicadores.precisa_carregar:
+                geracao = indicadores.geracao
+                async with database.sessao_primario() as db:
+                    linhas = {nome: (await db.execute(consulta)).all() for nome, consulta in consultas_indicadores().items()}
+                indicadores.carregar(linhas["ativos"], linhas["admissoes"], linhas["desligamentos"], geracao)
+    return indicadores
@@ -0,0 +1,202 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from metricas import BALDES_CONTAGEM, Contador, Histograma, Medidor, registro
+from perfilador import PROFILER_ENABLED, perfilador
+
+logger = logging.getLogger(__name__)
+
+# 🧮 Contagem de comandos SQL por requisição e orçamento por rota (detecta N+1)
+# SQL_QUERY_BUDGET: "off" (produção), "log" (avisa no log) ou "raise" (falha a requisição/teste)
+SQL_QUERY_BUDGET = os.getenv("SQL_QUERY_BUDGET", "off").lower()
+SQL_QUERY_BUDGET_DEFAULT = int(os.getenv("SQL_QUERY_BUDGET_DEFAULT", 10))
+# 📊 Métricas por rota (latência, requisições em andamento, SQL, espera do pool) em /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+ROTA_DESCONHECIDA = "desconhecida"
+
+requisicoes_total = registro.registrar(Contador(
+    "rh_http_requisicoes_total", "Requisições HTTP atendidas", ("metodo", "rota", "status")))
+duracao_requisicoes = registro.registrar(Histograma(
+    "rh_http_duracao_segundos", "Latência das requisições HTTP", ("metodo", "rota")))
+requisicoes_em_andamento = registro.registrar(Medidor(
+    "rh_http_em_andamento", "Requisições HTTP em andamento", ("metodo",)))
+comandos_por_requisicao = registro.registrar(Histograma(
+    "rh_sql_comandos_por_requisicao", "Comandos SQL executados por requisição", ("rota",), BALDES_CONTAGEM))
+tempo_sql_por_requisicao = registro.registrar(Histograma(
+    "rh_sql_duracao_por_requisicao_segundos", "Tempo gasto em comandos SQL por requisição", ("rota",)))
+comandos_sql_total = registro.registrar(Contador(
+    "rh_sql_comandos_total", "Comandos SQL executados (inclusive fora de requisições)"))
+tempo_sql_total = registro.registrar(Contador(
+    "rh_sql_duracao_segundos_total", "Tempo total gasto em comandos SQL"))
+espera_pool = registro.registrar(Histograma(
+    "rh_pool_espera_segundos", "Espera para obter uma conexão do pool", ("pool",),
+    (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)))
+conexoes_em_uso = registro.registrar(Medidor(
+    "rh_pool_conexoes_em_uso", "Conexões do pool emprestadas no momento", ("pool",)))
+
+class OrcamentoSQLExcedido(RuntimeError):
+    """Uma rota executou mais comandos SQL do que o orçamento declarado."""
+
+class ContadorSQL:
+    """Estado de uma requisição; compartilhado com as tarefas e threads filhas via contextvar."""
+
+    def __init__(self, rota: str):
+        self.rota = rota
+        self.comandos = 0
+        self.tempo_sql = 0.0
+        self.espera_pool = 0.0
+        self.orcamento: Optional[int] = SQL_QUERY_BUDGET_DEFAULT
+
+_contador_atual: ContextVar[Optional[ContadorSQL]] = ContextVar("contador_sql", default=None)
+
+# Registrados na classe Engine: valem para o engine síncrono, o assíncrono e os criados depois
+@event.listens_for(Engine, "before_cursor_execute")
+def _iniciar_comando(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_comandos", []).append(time.perf_counter())
+    contador = _contador_atual.get()
+    if contador is not None:
+        contador.comandos += 1
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finalizar_comando(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_comandos")
+    if not inicios:
+        return
+    duracao = time.perf_counter() - inicios.pop()
+    comandos_sql_total.incrementar()
+    tempo_sql_total.incrementar(valor=duracao)
+    contador = _contador_atual.get()
+    if contador is not None:
+        contador.tempo_sql += duracao
+
+# ⏳ Pools que medem a espera por uma conexão livre (o SQLAlchemy não tem evento antes do checkout)
+class _MedirEspera:
+    nome_pool = ""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera = time.perf_counter() - inicio
+            espera_pool.observar(self.nome_pool, valor=espera)
+            contador = _contador_atual.get()
+            if contador is not None:
+                contador.espera_pool += espera
+
+class PoolFilaMedida(_MedirEspera, QueuePool):
+    nome_pool = "sincrono"
+
+class PoolFilaAssincronaMedida(_MedirEspera, AsyncAdaptedQueuePool):
+    nome_pool = "assincrono"
+
+def monitorar_pools(*engines: Engine) -> None:
+    """Publica, a cada coleta de /metrics, quantas conexões de cada pool estão emprestadas."""
+    def coletar():
+        for motor in engines:
+            emprestadas = getattr(motor.pool, "checkedout", None)
+            if emprestadas is not None:
+                nome = getattr(motor.pool, "nome_pool", "") or type(motor.pool).__name__
+                conexoes_em_uso.definir(nome, valor=emprestadas())
+    registro.coletar_ao_exportar(coletar)
+
+def comandos_sql_executados() -> int:
+    """Comandos SQL executados até agora na requisição atual (0 fora de uma requisição)."""
+    contador = _contador_atual.get()
+    return contador.comandos if contador else 0
+
+def orcamento_sql(maximo: Optional[int]):
+    """
+    Dependência que declara quantos comandos SQL a rota pode executar, incluindo a autenticação.
+    Uso: `@router.get(..., dependencies=[Depends(orcamento_sql(3))])`; None dispensa o limite
+    (rotas em lote, cujo total depende do tamanho da entrada).
+    """
+    async def definir_orcamento() -> None:
+        contador = _contador_atual.get()
+        if contador is not None:
+            contador.orcamento = maximo
+    return definir_orcamento
+
+def acrescentar_orcamento_sql(quantidade: int) -> None:
+    """Amplia o orçamento da requisição atual (ex.: um comando a mais por bloco transmitido)."""
+    contador = _contador_atual.get()
+    if contador is not None and contador.orcamento is not None:
+        contador.orcamento += quantidade
+
+class InstrumentacaoMiddleware:
+    """
+    Middleware ASGI que mede cada requisição: latência e status por rota, requisições em andamento,
+    comandos e tempo de SQL, espera do pool e, com PROFILER_ENABLED, as pilhas das requisições lentas.
+    Envia `X-SQL-Queries` e `Server-Timing` (medidos até o início da resposta) e compara os comandos
+    com o orçamento da rota (SQL_QUERY_BUDGET). No modo "raise", o orçamento estourado é verificado antes
+    de enviar o início da resposta, que vira um erro 500; nas respostas transmitidas em blocos, os
+    comandos executados durante a transmissão são conferidos de novo ao final.
+    """
+
+    def __init__(self, app, modo_orcamento: str = SQL_QUERY_BUDGET, metricas: bool = METRICS_ENABLED,
+                 perfilar: bool = PROFILER_ENABLED):
+        self.app = app
+        self.modo_orcamento = modo_orcamento
+        self.metricas = metricas
+        self.perfilar = perfilar
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (self.metricas or self.perfilar or self.modo_orcamento != "off"):
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        contador = ContadorSQL(f"{metodo} {scope['path']}")
+        token = _contador_atual.set(contador)
+        requisicoes_em_andamento.somar(metodo)
+        inicio = perfilador.iniciar_requisicao() if self.perfilar else time.perf_counter()
+        status_resposta = 500
+
+        async def enviar(mensagem):
+            nonlocal status_resposta
+            if mensagem["type"] == "http.response.start":
+                if self.modo_orcamento == "raise":
+                    self._verificar_orcamento(contador)  # Antes do status: o cliente não recebe um 200
+                status_resposta = mensagem["status"]
+                tempo_ms = (time.perf_counter() - inicio) * 1000
+                mensagem["headers"] = [
+                    *mensagem.get("headers", []),
+                    (b"x-sql-queries", str(contador.comandos).encode()),
+                    (b"server-timing", (
+                        f"sql;dur={contador.tempo_sql * 1000:.1f}, pool;dur={contador.espera_pool * 1000:.1f}, "
+                        f"app;dur={tempo_ms:.1f}"
+                    ).encode()),
+                ]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _contador_atual.reset(token)
+            requisicoes_em_andamento.somar(metodo, valor=-1)
+            # Rótulo pelo molde da rota (/funcionarios/{id}), não pelo caminho, para não multiplicar as séries
+            rota = getattr(scope.get("route"), "path", ROTA_DESCONHECIDA)
+            if self.metricas:
+                requisicoes_total.incrementar(metodo, rota, str(status_resposta))
+                duracao_requisicoes.observar(metodo, rota, valor=time.perf_counter() - inicio)
+                comandos_por_requisicao.observar(rota, valor=contador.comandos)
+                tempo_sql_por_requisicao.observar(rota, valor=contador.tempo_sql)
+            if self.perfilar:
+                perfilador.finalizar_requisicao(inicio, f"{metodo} {rota}")
+
+        self._verificar_orcamento(contador)
+
+    def _verificar_orcamento(self, contador: ContadorSQL) -> None:
+        if self.modo_orcamento == "off" or contador.orcamento is None or contador.comandos <= contador.orcamento:
+            return
+        mensagem = f"{contador.rota} executou {contador.comandos} comandos SQL (orçamento: {contador.orcamento})"
+        if self.modo_orcamento == "raise":
+            raise OrcamentoSQLExcedido(mensagem)
+        logger.warning(f"⚠️ {mensagem}")
@@ -1,21 +1,56 @@
-from fastapi import FastAPI
+import time
+_INICIO = time.perf_counter()  # Antes das demais importações: mede a inicialização inteira do worker
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 import os
-from database import criar_tabelas, engine
+from database import async_engine, engine, preparar_esquema, roteador
+from auth import UsuarioAutenticado, encerrar_executor_senhas, get_usuario_atual
+from auditoria import fila_auditoria
+from estaticos import ArquivosEstaticos
+from instrumentacao import METRICS_ENABLED, InstrumentacaoMiddleware, monitorar_pools
+from metricas import TIPO_CONTEUDO_PROMETHEUS, Medidor, registro
+from serializacao import FAST_JSON_RESPONSES, RespostaORJSON
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import inspect
 
+# 🗜️ Compressão gzip das respostas da API a partir de GZIP_MINIMUM_SIZE bytes (os estáticos já vêm comprimidos)
+GZIP_ENABLED = os.getenv("GZIP_ENABLED", "true").lower() == "true"
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", 1024))
+GZIP_COMPRESSION_LEVEL = int(os.getenv("GZIP_COMPRESSION_LEVEL", 6))
+
+# ⏱️ Duração de cada fase da inicialização (impressa no startup e exportada em /metrics)
+tempo_inicializacao = registro.registrar(Medidor(
+    "rh_inicializacao_segundos", "Duração de cada fase da inicialização do worker", ("fase",)))
+fases_inicializacao = {}
+
+def _registrar_fase(fase: str, inicio: float) -> float:
+    """Guarda a duração da fase iniciada em `inicio` e devolve o instante atual (início da próxima)."""
+    agora = time.perf_counter()
+    fases_inicializacao[fase] = agora - inicio
+    tempo_inicializacao.definir(fase, valor=agora - inicio)
+    return agora
+
 # 🔄 Gerenciamento do ciclo de vida do app (Startup & Shutdown)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    inicio = time.perf_counter()
     try:
         os.makedirs("templates", exist_ok=True)  # Garante que a pasta exista
-        criar_tabelas()  # Criando tabelas se não existirem
-        print("✅ Banco de dados inicializado com sucesso!")
+        situacao = preparar_esquema()  # Conforme DB_SCHEMA_STARTUP (por padrão, só se o modelo mudou)
+        print(f"✅ Banco de dados inicializado com sucesso! (esquema {situacao})")
     except Exception as e:
         print(f"❌ Erro ao inicializar o banco de dados: {e}")
+    _registrar_fase("esquema", inicio)
+    _registrar_fase("total", _INICIO)
+    print("🚀 Pronto em " + ", ".join(f"{fase}: {segundos * 1000:.0f} ms" for fase, segundos in fases_inicializacao.items()))
+    fila_auditoria.iniciar()  # Grava em segundo plano a auditoria das alterações de funcionários
+    roteador.iniciar()  # Verifica periodicamente a saúde das réplicas de leitura (se houver)
     yield
+    await roteador.encerrar()
+    await fila_auditoria.encerrar()  # Grava o que ainda estava na fila antes de encerrar
+    encerrar_executor_senhas()  # Finaliza o pool de processos de hash de senha
 
 # 🚀 Função para criar a aplicação FastAPI
 def create_app() -> FastAPI:
@@ -25,7 +60,8 @@ def create_app() -> FastAPI:
                     "📌 **Acesse `/docs` para explorar a API interativamente.**\n\n"
                     "📌 **Acesse `/redoc` para visualizar a documentação detalhada.**",
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=RespostaORJSON if FAST_JSON_RESPONSES else JSONResponse
     )
 
     # 🔥 Middleware CORS (permite acesso de outros domínios)
@@ -35,12 +71,18 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["Content-Disposition"]
+        expose_headers=["Content-Disposition", "X-SQL-Queries", "Server-Timing", "ETag", "Last-Modified"]
     )
 
-    # 🔗 Servindo arquivos estáticos se a pasta existir
+    # 📊 Latência, SQL e pool por rota, orçamento de SQL (SQL_QUERY_BUDGET) e perfilador de lentas
+    app.add_middleware(InstrumentacaoMiddleware)
+
+    if GZIP_ENABLED:
+        app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESSION_LEVEL)
+
+    # 🔗 Servindo arquivos estáticos (pré-comprimidos, CSS/JS versionados pelo hash) se a pasta existir
     if os.path.exists("templates"):
-        app.mount("/static", StaticFiles(directory="templates", html=True), name="static")
+        app.mount("/static", ArquivosEstaticos("templates"), name="static")
 
     # 🔄 Importação de rotas
     from routes_funcionarios import router as funcionarios_router
@@ -59,6 +101,21 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "healthy"}
 
+    # 📊 Métricas no formato do Prometheus
+    if METRICS_ENABLED:
+        motores_replicas = [motor for r in roteador.replicas for motor in (r.engine, r.async_engine.sync_engine)]
+        monitorar_pools(engine, async_engine.sync_engine, *motores_replicas)
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            return Response(registro.exportar(), media_type=TIPO_CONTEUDO_PROMETHEUS)
+
+    # 📈 Estatísticas do cache de autenticação (para debug, apenas usuários autenticados)
+    @app.get("/debug/auth-cache", tags=["Debug"])
+    async def auth_cache_stats(current_user: UsuarioAutenticado = Depends(get_usuario_atual)):
+        from auth import estatisticas_cache_auth
+        return estatisticas_cache_auth()
+
     # 🔍 Verificação da estrutura da tabela funcionários (para debug)
     @app.get("/debug/check-funcionarios-structure", tags=["Debug"])
     async def check_structure():
@@ -79,4 +136,6 @@ def create_app() -> FastAPI:
     return app
 
 # 🚀 Inicializando o app
+inicio_app = _registrar_fase("importacao", _INICIO)
 app = create_app()
+_registrar_fase("criar_app", inicio_app)
@@ -0,0 +1,132 @@
+import bisect
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+# 📊 Métricas em memória no formato de exposição do Prometheus (texto 0.0.4)
+# Contadores, medidores e histogramas com rótulos; cada processo (worker) expõe os seus
+TIPO_CONTEUDO_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+BALDES_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BALDES_CONTAGEM = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Rotulos = Tuple[str, ...]
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_rotulos(nomes: Tuple[str, ...], valores: Rotulos, extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _numero(valor: float) -> str:
+    return repr(valor) if isinstance(valor, float) else str(valor)
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, descricao: str, rotulos: Iterable[str] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _cabecalho(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} {self.tipo}"]
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def incrementar(self, *rotulos: str, valor: float = 1) -> None:
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + valor
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return self._cabecalho() + [f"{self.nome}{_formatar_rotulos(self.rotulos, r)} {_numero(v)}" for r, v in itens]
+
+class Medidor(_Metrica):
+    tipo = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def somar(self, *rotulos: str, valor: float = 1) -> None:
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + valor
+
+    def definir(self, *rotulos: str, valor: float) -> None:
+        with self._lock:
+            self._valores[rotulos] = valor
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return self._cabecalho() + [f"{self.nome}{_formatar_rotulos(self.rotulos, r)} {_numero(v)}" for r, v in itens]
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nome: str, descricao: str, rotulos: Iterable[str] = (), baldes: Tuple[float, ...] = BALDES_DURACAO):
+        super().__init__(nome, descricao, rotulos)
+        self.baldes = tuple(sorted(baldes))
+        self._series: Dict[Rotulos, list] = {}  # rótulos -> [contagem por balde..., soma, total]
+
+    def observar(self, *rotulos: str, valor: float) -> None:
+        posicao = bisect.bisect_left(self.baldes, valor)
+        with self._lock:
+            serie = self._series.get(rotulos)
+            if serie is None:
+                serie = self._series[rotulos] = [0] * len(self.baldes) + [0.0, 0]
+            if posicao < len(self.baldes):
+                serie[posicao] += 1
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def _linha_balde(self, rotulos: Rotulos, limite: str, acumulado: int) -> str:
+        rotulo_limite = f'le="{limite}"'
+        return f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, rotulos, rotulo_limite)} {acumulado}"
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            itens = sorted((r, list(s)) for r, s in self._series.items())
+        linhas = self._cabecalho()
+        for rotulos, serie in itens:
+            acumulado = 0
+            for limite, quantidade in zip(self.baldes, serie):
+                acumulado += quantidade
+                linhas.append(self._linha_balde(rotulos, _numero(limite), acumulado))
+            linhas.append(self._linha_balde(rotulos, "+Inf", serie[-1]))
+            linhas.append(f"{self.nome}_sum{_formatar_rotulos(self.rotulos, rotulos)} {_numero(serie[-2])}")
+            linhas.append(f"{self.nome}_count{_formatar_rotulos(self.rotulos, rotulos)} {serie[-1]}")
+        return linhas
+
+class Registro:
+    """Conjunto de métricas exportadas juntas em /metrics."""
+
+    def __init__(self):
+        self._metricas: List[_Metrica] = []
+        self._coletores = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self._metricas.append(metrica)
+        return metrica
+
+    def coletar_ao_exportar(self, funcao) -> None:
+        """Função chamada antes de cada exportação (ex.: ler o estado atual do pool)."""
+        self._coletores.append(funcao)
+
+    def exportar(self) -> str:
+        for coletor in self._coletores:
+            coletor()
+        linhas = [linha for metrica in self._metricas for linha in metrica.exportar()]
+        return "\n".join(linhas) + "\n"
+
+registro = Registro()
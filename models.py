@@ -1,8 +1,14 @@
 from datetime import date, datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, EmailStr
-from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, TIMESTAMP, Text, ForeignKey, func
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, EmailStr, model_validator
+from sqlalchemy import (
+    BigInteger, Column, Integer, String, Date, Numeric, Boolean, TIMESTAMP, Text, ForeignKey, Index, JSON,
+    func, select
+)
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.functions import FunctionElement
 from database import Base
 
 
@@ -10,13 +16,48 @@ class BeneficiarioDB(Base):
     __tablename__ = "beneficiarios"
     
     id = Column(Integer, primary_key=True, index=True)
-    funcionario_id = Column(Integer, ForeignKey('funcionarios.id', ondelete="CASCADE"), nullable=False)
+    funcionario_id = Column(Integer, ForeignKey('funcionarios.id', ondelete="CASCADE"), nullable=False, index=True)
     nome = Column(String(100), nullable=False)
     data_nascimento = Column(Date, nullable=True)
     parentesco = Column(String(50), nullable=False)
 
     funcionario = relationship("FuncionarioDB", back_populates="beneficiarios")
 
+# 🔢 Sequência de alterações (base do feed `changed_since` de alteracoes.py), gravada pelo próprio
+# INSERT/UPDATE da linha, inclusive em lote e na desativação, sem trava compartilhada entre as escritas.
+# O feed só entrega sequências abaixo do horizonte: nenhuma transação em andamento grava abaixo dele,
+# então uma alteração confirmada depois nunca fica atrás de um token já entregue.
+# PostgreSQL: o id da transação que gravou; horizonte = xmin do snapshot (menor transação em andamento).
+# SQLite: max(sequencia) + 1 no próprio comando (as escritas são serializadas pelo lock do banco)
+class ProximaSequencia(FunctionElement):
+    """Valor de `FuncionarioDB.sequencia` para a linha gravada pela transação atual."""
+    type = BigInteger()
+    inherit_cache = True
+
+class HorizonteSequencia(FunctionElement):
+    """Menor sequência que uma transação ainda em andamento pode gravar; abaixo dela, tudo já foi confirmado."""
+    type = BigInteger()
+    inherit_cache = True
+
+@compiles(ProximaSequencia)
+@compiles(HorizonteSequencia)
+def _sequencia_nao_suportada(elemento, compilador, **kw):
+    raise CompileError(f"Feed de alterações não suportado no banco {compilador.dialect.name} (use PostgreSQL ou SQLite)")
+
+@compiles(ProximaSequencia, "sqlite")
+@compiles(HorizonteSequencia, "sqlite")
+def _sequencia_sqlite(elemento, compilador, **kw):
+    anteriores = FuncionarioDB.__table__.alias("anteriores")
+    return compilador.process(select(func.coalesce(func.max(anteriores.c.sequencia), 0) + 1).scalar_subquery(), **kw)
+
+@compiles(ProximaSequencia, "postgresql")
+def _proxima_sequencia_postgresql(elemento, compilador, **kw):
+    return "pg_current_xact_id()::text::bigint"
+
+@compiles(HorizonteSequencia, "postgresql")
+def _horizonte_sequencia_postgresql(elemento, compilador, **kw):
+    return "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
 class FuncionarioDB(Base):
     __tablename__ = "funcionarios"
     
@@ -70,12 +111,45 @@ class FuncionarioDB(Base):
     fgts_data_opcao = Column(Date, nullable=False)
     fgts_banco = Column(String(50), default="Caixa Econômica Federal")
     criado_em = Column(TIMESTAMP, server_default=func.now())
+    # Versão da linha (incrementada pelo ORM a cada UPDATE) e data da última alteração: base do
+    # ETag/Last-Modified das leituras e da concorrência otimista do PUT (If-Match)
+    atualizado_em = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    versao = Column(Integer, nullable=False, server_default="1")
+    # Sequência da última gravação da linha (inclusive INSERT/UPDATE em lote e desativação)
+    sequencia = Column(BigInteger, nullable=False, server_default="0", default=ProximaSequencia(), onupdate=ProximaSequencia())
     ativo = Column(Boolean, default=True)
     observacoes = Column(Text, nullable=True)
     tipo_desligamento = Column(String(50), nullable=True)
 
     beneficiarios = relationship("BeneficiarioDB", back_populates="funcionario", cascade="all, delete")
 
+    # eager_defaults: atualizado_em volta no próprio UPDATE (RETURNING), sem lazy load na sessão async
+    __mapper_args__ = {"version_id_col": versao, "eager_defaults": True}
+
+    # Índices dos caminhos de acesso reais (ver tests/test_planos.py):
+    # listagem paginada por id filtrando ativo e, opcionalmente, departamento; feed de alterações.
+    # A busca por nome é feita no índice em memória (busca.py), não no banco
+    __table_args__ = (
+        Index("ix_funcionarios_ativo_id", "ativo", "id"),
+        Index("ix_funcionarios_ativo_departamento_id", "ativo", "departamento", "id"),
+        Index("ix_funcionarios_sequencia_id", "sequencia", "id"),
+    )
+
+class AuditoriaFuncionarioDB(Base):
+    """Quem alterou o quê em um funcionário (gravado em lote pela fila de auditoria.py)."""
+    __tablename__ = "auditoria_funcionarios"
+
+    id = Column(Integer, primary_key=True)
+    funcionario_id = Column(Integer, ForeignKey('funcionarios.id', ondelete="CASCADE"), nullable=False)
+    acao = Column(String(20), nullable=False)  # criacao | alteracao | desativacao
+    alteracoes = Column(JSON, nullable=False)  # {campo: {"anterior": ..., "novo": ...}}
+    usuario_id = Column(Integer, nullable=True)
+    usuario_email = Column(String(100), nullable=True)
+    alterado_em = Column(TIMESTAMP, nullable=False)  # Momento da alteração, não da gravação em lote
+
+    # Histórico de um funcionário, do mais recente para o mais antigo (keyset por id)
+    __table_args__ = (Index("ix_auditoria_funcionario_id", "funcionario_id", "id"),)
+
 # ==============================
 # MODELOS Pydantic
 # ==============================
@@ -107,6 +181,19 @@ class FuncionarioBase(BaseModel):
     titulo_secao: str
     pis: str
     pis_data_cadastro: date
+    habilitacao: Optional[str] = None
+    habilitacao_categoria: Optional[str] = Field(None, max_length=2)
+    documento_militar: Optional[str] = None
+    cbo: str = Field(..., max_length=10)
+    endereco: str = Field(..., max_length=200)
+    endereco_numero: str = Field(..., max_length=10)
+    endereco_complemento: Optional[str] = None
+    bairro: str
+    municipio: str
+    uf: str = Field(..., max_length=2)
+    cep: str = Field(..., max_length=10)
+    telefone: str
+    email: str
     cargo: str
     funcao: str
     departamento: str
@@ -158,6 +245,19 @@ class FuncionarioUpdate(BaseModel):
     titulo_secao: Optional[str] = None
     pis: Optional[str] = None
     pis_data_cadastro: Optional[date] = None
+    habilitacao: Optional[str] = None
+    habilitacao_categoria: Optional[str] = Field(None, max_length=2)
+    documento_militar: Optional[str] = None
+    cbo: Optional[str] = Field(None, max_length=10)
+    endereco: Optional[str] = Field(None, max_length=200)
+    endereco_numero: Optional[str] = Field(None, max_length=10)
+    endereco_complemento: Optional[str] = None
+    bairro: Optional[str] = None
+    municipio: Optional[str] = None
+    uf: Optional[str] = Field(None, max_length=2)
+    cep: Optional[str] = Field(None, max_length=10)
+    telefone: Optional[str] = None
+    email: Optional[str] = None
     cargo: Optional[str] = None
     funcao: Optional[str] = None
     departamento: Optional[str] = None
@@ -179,8 +279,143 @@ class FuncionarioUpdate(BaseModel):
 class FuncionarioResponse(FuncionarioBase):
     id: int
     criado_em: datetime
+    atualizado_em: Optional[datetime] = None
+    versao: int = 1
+    ativo: bool
+
+class FuncionarioResumo(BaseModel):
+    """Projeção compacta usada pela tela de listagem (construída sem revalidação)."""
+    id: int
+    nome: str
+    cpf: str
+    cargo: str
+    departamento: str
     ativo: bool
 
+class FuncionarioBusca(FuncionarioResumo):
+    relevancia: float
+
+class PaginaFuncionarios(BaseModel):
+    itens: List[FuncionarioResponse]
+    next_cursor: Optional[str] = None
+
+class RegistroAuditoria(BaseModel):
+    id: int
+    funcionario_id: int
+    acao: str
+    alteracoes: Dict[str, Dict[str, Any]]
+    usuario_id: Optional[int] = None
+    usuario_email: Optional[str] = None
+    alterado_em: datetime
+
+    class Config:
+        from_attributes = True
+
+class PaginaAuditoria(BaseModel):
+    itens: List[RegistroAuditoria]
+    next_cursor: Optional[str] = None
+
+class AlteracoesFuncionarios(BaseModel):
+    itens: List[FuncionarioResponse]  # Inclui os desativados (ativo=false), para o cliente removê-los
+    token: str  # Enviar em `changed_since` na próxima consulta
+    mais: bool = False  # Há mais alterações além de `limit`: consultar de novo com o token
+
+class DepartamentoResumo(BaseModel):
+    departamento: str
+    funcionarios_ativos: int
+    folha_salarial: float
+
+class FiltroFuncionarios(BaseModel):
+    departamento: Optional[str] = None
+    cargo: Optional[str] = None
+    ativo: Optional[bool] = None
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+
+class AtualizacaoLote(BaseModel):
+    filtro: FiltroFuncionarios
+    operacao: Literal["definir_campo", "reajustar_salario", "transferir_departamento"]
+    campo: Optional[str] = Field(None, description="Coluna alterada em `definir_campo`")
+    valor: Any = Field(None, description="Novo valor em `definir_campo`")
+    percentual: Optional[float] = Field(None, gt=-100, le=1000, description="Reajuste em `reajustar_salario` (5 = +5%)")
+    departamento: Optional[str] = Field(None, min_length=1, description="Destino em `transferir_departamento`")
+    retornar_ids: bool = False
+
+    @model_validator(mode="after")
+    def verificar_operacao(self):
+        obrigatorio = {"definir_campo": "campo", "reajustar_salario": "percentual", "transferir_departamento": "departamento"}[self.operacao]
+        if getattr(self, obrigatorio) is None:
+            raise ValueError(f"`{obrigatorio}` é obrigatório para a operação `{self.operacao}`")
+        if not self.filtro.model_dump(exclude_none=True):
+            raise ValueError("Informe ao menos um filtro (departamento, cargo, ativo ou ids)")
+        return self
+
+class ResultadoLote(BaseModel):
+    afetados: int
+    ids: Optional[List[int]] = None
+
+class FolhaResumo(BaseModel):
+    departamento: Optional[str] = None
+    funcionarios: int
+    salario_base: float
+    adicional_periculosidade: float
+    adicional_insalubridade: float
+    bruto: float
+    fgts: float
+
+class FolhaPagamento(BaseModel):
+    salario_minimo: float
+    total: FolhaResumo
+    departamentos: List[FolhaResumo]
+
+class ContagemGrupo(BaseModel):
+    grupo: str
+    funcionarios: int
+
+class Headcount(BaseModel):
+    total: int
+    departamento: List[ContagemGrupo]
+    tipo_contrato: List[ContagemGrupo]
+    grau_instrucao: List[ContagemGrupo]
+
+class MovimentacaoMes(BaseModel):
+    mes: str  # AAAA-MM
+    admissoes: int
+    desligamentos: int
+    headcount: int
+    rotatividade: float  # %
+
+class Movimentacao(BaseModel):
+    meses: List[MovimentacaoMes]
+    admissoes: int
+    desligamentos: int
+    rotatividade_periodo: float  # %
+
+class PercentisSalariais(BaseModel):
+    departamento: Optional[str] = None  # None = empresa toda
+    funcionarios: int
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+
+class DistribuicaoSalarial(BaseModel):
+    faixa_salarial: float
+    total: PercentisSalariais
+    departamentos: List[PercentisSalariais]
+
+class ErroImportacao(BaseModel):
+    linha: int
+    erros: List[str]
+
+class RelatorioImportacao(BaseModel):
+    total_linhas: int
+    importados: int
+    rejeitados: int
+    lotes: int
+    duracao_segundos: float
+    erros: List[ErroImportacao] = []
+
 class UsuarioRH(BaseModel):
     email: EmailStr
     nome: str = Field(..., max_length=100)
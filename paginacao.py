@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+from typing import Callable, Iterator, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select
+from sqlalchemy.orm import Query as ConsultaORM, Session
+
+from database import SessionLocal
+from instrumentacao import acrescentar_orcamento_sql
+
+# 📄 Tamanhos padrão de página e de bloco para transmissão
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+TAMANHO_BLOCO_STREAM = 500
+
+# 🔑 Cursor opaco (keyset sobre o id)
+def codificar_cursor(ultimo_id: int) -> str:
+    """Gera um cursor opaco a partir do último id retornado na página."""
+    bruto = json.dumps({"id": ultimo_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str) -> int:
+    """Recupera o último id a partir de um cursor gerado por `codificar_cursor`."""
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        ultimo_id = json.loads(base64.urlsafe_b64decode(preenchido))["id"]
+        if not isinstance(ultimo_id, int):
+            raise ValueError("id inválido no cursor")
+        return ultimo_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+# 📑 Paginação por keyset
+def aplicar_cursor(consulta: Select, coluna_id, cursor: Optional[str], limit: int, decrescente: bool = False) -> Select:
+    """
+    Aplica paginação keyset (`id > cursor ORDER BY id LIMIT n + 1`) a uma consulta.
+    O registro extra serve apenas para saber se existe próxima página (ver `fechar_pagina`).
+    :param consulta: Consulta já filtrada.
+    :param coluna_id: Coluna usada como chave de ordenação (única e crescente).
+    :param cursor: Cursor opaco da página anterior (ou None para a primeira página).
+    :param limit: Quantidade máxima de registros na página.
+    :param decrescente: Do maior id para o menor (`id < cursor ORDER BY id DESC`), ex.: mais recentes primeiro.
+    """
+    if cursor:
+        ultimo_id = decodificar_cursor(cursor)
+        consulta = consulta.where(coluna_id < ultimo_id if decrescente else coluna_id > ultimo_id)
+    return consulta.order_by(coluna_id.desc() if decrescente else coluna_id).limit(limit + 1)
+
+def fechar_pagina(registros: List, limit: int) -> Tuple[List, Optional[str]]:
+    """
+    Separa a página dos registros buscados por `aplicar_cursor`.
+    :return: Tupla (registros da página, cursor da próxima página ou None).
+    """
+    if len(registros) <= limit:
+        return list(registros), None
+
+    registros = registros[:limit]
+    return registros, codificar_cursor(registros[-1].id)
+
+# 🌊 Leitura em blocos a partir de um cursor do servidor
+def percorrer_em_blocos(
+    montar_consulta: Callable[[Session], ConsultaORM],
+    tamanho_bloco: int = TAMANHO_BLOCO_STREAM
+) -> Iterator[List]:
+    """
+    Percorre a consulta em blocos de `tamanho_bloco` linhas usando `yield_per`.
+    Usa uma sessão própria, pois a resposta continua sendo enviada depois que a
+    sessão da requisição (get_db) já foi encerrada. Cada bloco pode custar um comando
+    extra (ex.: selectinload dos beneficiários), descontado do orçamento SQL da rota.
+    :param montar_consulta: Função que recebe a sessão e devolve a consulta ordenada.
+    :param tamanho_bloco: Quantidade de linhas buscadas por vez no cursor do servidor.
+    """
+    db = SessionLocal()
+    try:
+        bloco: List = []
+        for registro in montar_consulta(db).yield_per(tamanho_bloco):
+            bloco.append(registro)
+            if len(bloco) >= tamanho_bloco:
+                acrescentar_orcamento_sql(1)
+                yield bloco
+                bloco = []  # O identity map só guarda referências fracas: o bloco anterior é liberado
+        if bloco:
+            acrescentar_orcamento_sql(1)
+            yield bloco
+    finally:
+        db.close()
+
+def transmitir_json(
+    montar_consulta: Callable[[Session], ConsultaORM],
+    serializar: Callable[[object], str],
+    tamanho_bloco: int = TAMANHO_BLOCO_STREAM
+) -> Iterator[bytes]:
+    """
+    Gera um array JSON bloco a bloco (ver `percorrer_em_blocos`).
+    :param serializar: Função que converte um registro em texto JSON.
+    """
+    yield b"["
+    separador = ""
+    for bloco in percorrer_em_blocos(montar_consulta, tamanho_bloco):
+        yield (separador + ",".join(serializar(registro) for registro in bloco)).encode()
+        separador = ","
+    yield b"]"
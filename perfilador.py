@@ -0,0 +1,108 @@
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 🔥 Perfilador por amostragem (opcional) para requisições lentas
+# Enquanto há requisições em andamento, uma thread registra as pilhas de todas as threads a cada
+# PROFILER_INTERVAL_MS; quando uma requisição passa de PROFILER_SLOW_REQUEST_MS, as amostras do
+# seu intervalo são gravadas em PROFILER_DIR no formato "folded" (flamegraph.pl, speedscope).
+# Com requisições simultâneas, o arquivo também traz as pilhas das outras em andamento.
+# A gravação fica com a própria thread de amostragem: o event loop só enfileira a requisição lenta.
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", 5))
+PROFILER_SLOW_REQUEST_MS = float(os.getenv("PROFILER_SLOW_REQUEST_MS", 500))
+PROFILER_DIR = os.getenv("PROFILER_DIR", "perfis")
+PROFILER_MAX_SAMPLES = int(os.getenv("PROFILER_MAX_SAMPLES", 20000))
+
+Amostra = Tuple[float, str]  # (instante, pilha "thread;raiz;...;folha")
+Lenta = Tuple[float, float, str]  # (início, fim, rótulo) de uma requisição a gravar
+
+def _pilha(nome_thread: str, quadro) -> str:
+    partes = []
+    while quadro is not None:
+        codigo = quadro.f_code
+        partes.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{quadro.f_lineno})")
+        quadro = quadro.f_back
+    partes.append(nome_thread)
+    return ";".join(reversed(partes))
+
+class PerfiladorAmostragem:
+    def __init__(self, intervalo_ms: float = PROFILER_INTERVAL_MS, maximo_amostras: int = PROFILER_MAX_SAMPLES):
+        self.intervalo = intervalo_ms / 1000
+        self._amostras: Deque[Amostra] = deque(maxlen=maximo_amostras)
+        self._lentas: Deque[Lenta] = deque()
+        self._em_andamento = 0
+        self._lock = threading.Lock()
+        self._ativo = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _amostrar(self) -> None:
+        proprio = threading.get_ident()
+        while True:
+            self._ativo.wait()  # Dorme enquanto não há requisições em andamento nem arquivos a gravar
+            while self._lentas:
+                self._gravar(*self._lentas.popleft())
+            with self._lock:
+                if self._em_andamento == 0:
+                    if not self._lentas:
+                        self._ativo.clear()
+                    continue
+            nomes = {t.ident: t.name for t in threading.enumerate()}
+            agora = time.perf_counter()
+            for ident, quadro in sys._current_frames().items():
+                if ident != proprio:
+                    self._amostras.append((agora, _pilha(nomes.get(ident, str(ident)), quadro)))
+            time.sleep(self.intervalo)
+
+    def iniciar_requisicao(self) -> float:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._amostrar, name="perfilador", daemon=True)
+                self._thread.start()
+            self._em_andamento += 1
+            self._ativo.set()
+        return time.perf_counter()
+
+    def finalizar_requisicao(self, inicio: float, rotulo: str, limite_ms: float = PROFILER_SLOW_REQUEST_MS) -> bool:
+        """
+        Encerra o acompanhamento da requisição; se ela foi lenta, enfileira a gravação das pilhas amostradas.
+        :return: True se a requisição foi lenta (o arquivo é gravado em seguida pela thread de amostragem).
+        """
+        fim = time.perf_counter()
+        lenta = (fim - inicio) * 1000 >= limite_ms
+        with self._lock:
+            self._em_andamento -= 1
+            if lenta:
+                self._lentas.append((inicio, fim, rotulo))
+            if self._em_andamento == 0 and not self._lentas:
+                self._ativo.clear()
+        return lenta
+
+    def _gravar(self, inicio: float, fim: float, rotulo: str) -> Optional[str]:
+        """
+        Grava as pilhas amostradas entre `inicio` e `fim` (na thread de amostragem, fora do event loop).
+        :return: Caminho do arquivo gravado, ou None.
+        """
+        pilhas = Counter(pilha for instante, pilha in list(self._amostras) if inicio <= instante <= fim)
+        if not pilhas:
+            return None
+        try:
+            os.makedirs(PROFILER_DIR, exist_ok=True)
+            nome = re.sub(r"[^\w.-]+", "_", rotulo).strip("_")
+            caminho = os.path.join(PROFILER_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{int((fim - inicio) * 1000)}ms_{nome}.folded")
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.writelines(f"{pilha} {quantidade}\n" for pilha, quantidade in pilhas.most_common())
+        except OSError as e:
+            logger.error(f"❌ Pilhas de {rotulo} não gravadas: {e}")
+            return None
+        logger.warning(f"🐢 {rotulo} levou {(fim - inicio) * 1000:.0f} ms; pilhas em {caminho}")
+        return caminho
+
+perfilador = PerfiladorAmostragem()
@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from cache import CacheTTL
+from metricas import Contador, Medidor, registro
+
+logger = logging.getLogger(__name__)
+
+# 🔀 Réplicas de leitura: escolha da réplica, saúde (failover para o primário) e aderência após escritas
+# Um cliente que acabou de escrever lê do primário por DB_REPLICA_STICKY_SECONDS (lê a própria escrita
+# mesmo com a réplica atrasada). Réplica com erro de conexão sai do rodízio por DB_REPLICA_RETRY_SECONDS
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", 5))
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", 30))
+DB_REPLICA_HEALTH_INTERVAL_SECONDS = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL_SECONDS", 5))
+
+PRIMARIO = "primario"
+
+sessoes_leitura = registro.registrar(Contador(
+    "rh_db_sessoes_leitura_total", "Sessões de leitura por destino (réplica ou primário)", ("destino",)))
+replica_disponivel = registro.registrar(Medidor(
+    "rh_db_replica_disponivel", "1 se a réplica está no rodízio de leituras", ("replica",)))
+
+class Replica:
+    """Motores (síncrono e assíncrono) de uma réplica e seu estado de saúde."""
+
+    def __init__(self, nome: str, engine: Engine, async_engine: AsyncEngine):
+        self.nome = nome
+        self.engine = engine
+        self.async_engine = async_engine
+        self.indisponivel_ate = 0.0
+        for motor in (engine, async_engine.sync_engine):
+            if hasattr(motor.pool, "nome_pool"):
+                motor.pool.nome_pool = f"{nome}_{motor.pool.nome_pool}"  # Séries próprias em /metrics
+            event.listen(motor, "handle_error", self._ao_erro)
+
+    @property
+    def disponivel(self) -> bool:
+        return time.monotonic() >= self.indisponivel_ate
+
+    def marcar_indisponivel(self, motivo) -> None:
+        if self.disponivel:
+            logger.warning(f"⚠️ Réplica {self.nome} fora do rodízio por {DB_REPLICA_RETRY_SECONDS:.0f}s: {motivo}")
+        self.indisponivel_ate = time.monotonic() + DB_REPLICA_RETRY_SECONDS
+
+    def _ao_erro(self, contexto) -> None:
+        # Só falhas do servidor/conexão; erros do comando (ex.: constraint) não dizem nada da saúde
+        if contexto.is_disconnect or isinstance(contexto.sqlalchemy_exception, OperationalError):
+            self.marcar_indisponivel(contexto.original_exception)
+
+    async def verificar(self) -> None:
+        """SELECT 1 na réplica: devolve-a ao rodízio se respondeu, retira se falhou."""
+        try:
+            async with self.async_engine.connect() as conexao:
+                await conexao.execute(text("SELECT 1"))
+            self.indisponivel_ate = 0.0
+        except Exception as e:
+            self.marcar_indisponivel(e)
+
+class Roteador:
+    """Rodízio entre as réplicas disponíveis; sem nenhuma, as leituras vão para o primário."""
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self.aderencia = CacheTTL(tamanho_maximo=10000, ttl=DB_REPLICA_STICKY_SECONDS)
+        self._rodizio = itertools.count()
+        self._tarefa: Optional[asyncio.Task] = None
+        registro.coletar_ao_exportar(self._coletar)
+
+    def _coletar(self) -> None:
+        for replica in self.replicas:
+            replica_disponivel.definir(replica.nome, valor=1 if replica.disponivel else 0)
+
+    def marcar_escrita(self, cliente: Optional[str]) -> None:
+        """O cliente escreveu no primário: suas leituras vão para ele durante a janela de aderência."""
+        if cliente and self.replicas:
+            self.aderencia.definir(cliente, True)
+
+    def escolher(self, cliente: Optional[str] = None) -> Optional[Replica]:
+        """Réplica para a próxima sessão de leitura, ou None (primário)."""
+        replica = None
+        if self.replicas and not (cliente and self.aderencia.obter(cliente)):
+            disponiveis = [r for r in self.replicas if r.disponivel]
+            if disponiveis:
+                replica = disponiveis[next(self._rodizio) % len(disponiveis)]
+        sessoes_leitura.incrementar(replica.nome if replica else PRIMARIO)
+        return replica
+
+    def iniciar(self) -> None:
+        """Verifica a saúde das réplicas a cada DB_REPLICA_HEALTH_INTERVAL_SECONDS (chamado no startup)."""
+        if self.replicas and self._tarefa is None:
+            self._tarefa = asyncio.create_task(self._monitorar(), name="saude_replicas")
+
+    async def encerrar(self) -> None:
+        if self._tarefa is not None and self._tarefa.get_loop() is asyncio.get_running_loop():
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    async def _monitorar(self) -> None:
+        while True:
+            for replica in self.replicas:
+                await replica.verificar()
+            await asyncio.sleep(DB_REPLICA_HEALTH_INTERVAL_SECONDS)
+
+class SessaoRoteada(Session):
+    """
+    Sessão das rotas de leitura: as consultas vão para a réplica em `info["replica"]`. Flush e
+    INSERT/UPDATE/DELETE vão para o primário (o bind da sessão) e a prendem nele até o fim, assim
+    como a réplica sair do rodízio no meio da requisição.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica: Optional[Replica] = self.info.get("replica")
+        if replica is not None and not self._flushing and not getattr(clause, "is_dml", False) and replica.disponivel:
+            return replica.async_engine.sync_engine if self.info.get("assincrono") else replica.engine
+        self.info["replica"] = None
+        return super().get_bind(mapper, clause=clause, **kw)
@@ -1,101 +1,443 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Header, HTTPException, status, Query, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from models import FuncionarioCreate, FuncionarioResponse, FuncionarioUpdate, FuncionarioDB
-from database import get_db
-from auth import get_usuario_atual
-from database import UsuarioRH
+from sqlalchemy.orm.exc import StaleDataError
+from pydantic_core import to_json
+from models import (
+    BeneficiarioBase, BeneficiarioDB, FuncionarioCreate, FuncionarioResponse, FuncionarioResumo, FuncionarioUpdate, FuncionarioDB,
+    PaginaFuncionarios, RelatorioImportacao, DepartamentoResumo, FuncionarioBusca, FolhaPagamento,
+    AtualizacaoLote, ResultadoLote, Headcount, Movimentacao, DistribuicaoSalarial, PaginaAuditoria,
+    AlteracoesFuncionarios
+)
+from database import get_async_db, get_async_db_leitura, get_db
+from instrumentacao import orcamento_sql
+from serializacao import FAST_JSON_RESPONSES, RespostaORJSON, funcionario_confiavel, para_json
+from cache_http import cabecalhos_validacao, etag_confere, etag_funcionario, etag_lista, nao_modificado
+from auth import UsuarioAutenticado, get_usuario_admin, get_usuario_atual
+from paginacao import LIMITE_MAXIMO, LIMITE_PADRAO, fechar_pagina, transmitir_json
+from consultas import CARREGAR_BENEFICIARIOS, consulta_funcionario, consulta_historico, filtrar_funcionarios, pagina_funcionarios
+from exportacao import COLUNAS_EXPORTACAO, FORMATOS_EXPORTACAO, transmitir_exportacao
+from importacao import TAMANHO_LOTE_PADRAO, detectar_formato, importar_funcionarios as importar_arquivo
+from departamentos import invalidar_departamentos, obter_resumo_departamentos
+from atualizacao_lote import executar_atualizacao
+from busca import garantir_indice, indice_busca, registro_do_funcionario
+from indicadores import RegistroIndicadores, garantir_indicadores, indicadores, registro_indicadores
+from auditoria import diferencas, fila_auditoria
+from alteracoes import alteracoes_desde, token_atual
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.get("/funcionarios", response_model=List[FuncionarioResponse])
-def listar_funcionarios(
-    db: Session = Depends(get_db),
+ALTERADO_POR_OUTRO = "Funcionário alterado por outra requisição; recarregue os dados e tente novamente"
+
+def _apos_alteracao(funcionario: Optional[FuncionarioDB] = None, antes: Optional[RegistroIndicadores] = None) -> None:
+    """
+    Atualiza os dados derivados depois de qualquer escrita em funcionários.
+    :param funcionario: Registro alterado; se None (escritas em lote), os índices são recarregados.
+    :param antes: `registro_indicadores` tirado antes da alteração (None se o funcionário é novo).
+    """
+    invalidar_departamentos()
+    if funcionario is not None:
+        indice_busca.atualizar(registro_do_funcionario(funcionario))
+        indicadores.atualizar(antes, registro_indicadores(funcionario))
+    else:
+        indice_busca.invalidar()
+        indicadores.invalidar()
+
+async def _gravar_beneficiarios(
+    db: AsyncSession, funcionario_id: int, beneficiarios: List[BeneficiarioBase], substituir: bool = False
+) -> None:
+    """
+    Grava os beneficiários com um único INSERT (executemany), sem a ida ao banco por linha que o
+    ORM faz para recuperar as chaves no SQLite. Roda na transação do funcionário.
+    :param substituir: Apaga antes os beneficiários atuais (PUT substitui a lista inteira).
+    """
+    if substituir:
+        await db.execute(delete(BeneficiarioDB).where(BeneficiarioDB.funcionario_id == funcionario_id))
+    if beneficiarios:
+        await db.execute(
+            insert(BeneficiarioDB),
+            [{**b.model_dump(), "funcionario_id": funcionario_id} for b in beneficiarios]
+        )
+
+def _serializar_funcionario(funcionario: FuncionarioDB) -> str:
+    if FAST_JSON_RESPONSES:
+        return para_json(funcionario_confiavel(funcionario)).decode()
+    return FuncionarioResponse.model_validate(funcionario, from_attributes=True).model_dump_json()
+
+# 🎯 Projeções parciais (parâmetro `fields`)
+CAMPO_RESUMO = "resumo"
+CAMPOS_RESUMO = list(FuncionarioResumo.model_fields)
+
+def _colunas_solicitadas(fields: str) -> List[str]:
+    """Converte o parâmetro `fields` em nomes de colunas válidos (o `id` é sempre incluído)."""
+    if fields.strip() == CAMPO_RESUMO:
+        return CAMPOS_RESUMO
+
+    colunas_validas = FuncionarioDB.__table__.columns.keys()
+    campos = [c.strip() for c in fields.split(",") if c.strip()]
+    invalidos = [c for c in campos if c not in colunas_validas]
+    if invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos: {', '.join(invalidos)}"
+        )
+    return ["id"] + [c for c in dict.fromkeys(campos) if c != "id"]
+
+def _serializador_parcial(fields: str):
+    if fields.strip() == CAMPO_RESUMO:
+        # Linhas vindas do banco são confiáveis: dispensa a validação do FuncionarioBase
+        return lambda linha: FuncionarioResumo.model_construct(**linha._mapping)
+    # Numeric sai como número, igual ao FuncionarioResponse
+    return lambda linha: {k: float(v) if isinstance(v, Decimal) else v for k, v in linha._mapping.items()}
+
+async def _validadores_pagina(db: AsyncSession, departamento, ativo, limit, cursor, fields) -> Tuple[str, Optional[datetime]]:
+    """
+    ETag e Last-Modified de uma página a partir só de (id, versão, datas), sem carregar as linhas
+    completas: se o cliente já tem a página, a resposta 304 não busca nem serializa o corpo.
+    """
+    consulta = pagina_funcionarios(
+        select(FuncionarioDB.id, FuncionarioDB.versao, FuncionarioDB.atualizado_em, FuncionarioDB.criado_em),
+        departamento, ativo, cursor, limit
+    )
+    linhas = (await db.execute(consulta)).all()
+    etag = etag_lista((departamento, ativo, limit, cursor, fields), ((l.id, l.versao) for l in linhas))
+    return etag, max((l.atualizado_em or l.criado_em for l in linhas), default=None)
+
+@router.get("/funcionarios", response_model=PaginaFuncionarios, dependencies=[Depends(orcamento_sql(4))])
+async def listar_funcionarios(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_leitura),
+    departamento: Optional[str] = None,
+    ativo: Optional[bool] = Query(True, description="Filtrar funcionários ativos ou inativos"),
+    limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de funcionários por página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em `next_cursor` pela página anterior"),
+    stream: bool = Query(False, description="Transmite todos os funcionários filtrados como um array JSON, em blocos"),
+    fields: Optional[str] = Query(None, description="`resumo` ou lista de colunas separadas por vírgula (ex.: `nome,cargo`)"),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    cabecalhos = {}
+    if not stream:
+        etag, ultima_alteracao = await _validadores_pagina(db, departamento, ativo, limit, cursor, fields)
+        if etag_confere(if_none_match, etag):
+            return nao_modificado(etag, ultima_alteracao)
+        cabecalhos = cabecalhos_validacao(etag, ultima_alteracao)
+
+    if fields:
+        return await _listar_campos(db, departamento, ativo, limit, cursor, stream, fields, cabecalhos)
+
+    if stream:
+        return StreamingResponse(
+            transmitir_json(
+                lambda sessao: filtrar_funcionarios(
+                    sessao.query(FuncionarioDB).options(CARREGAR_BENEFICIARIOS), departamento, ativo
+                ).order_by(FuncionarioDB.id),
+                _serializar_funcionario
+            ),
+            media_type="application/json"
+        )
+
+    consulta = pagina_funcionarios(select(FuncionarioDB).options(CARREGAR_BENEFICIARIOS), departamento, ativo, cursor, limit)
+    registros = (await db.scalars(consulta)).all()
+    itens, next_cursor = fechar_pagina(registros, limit)
+    if FAST_JSON_RESPONSES:
+        # Retornar a resposta pronta dispensa a revalidação pelo response_model
+        conteudo = {"itens": [funcionario_confiavel(f) for f in itens], "next_cursor": next_cursor}
+        return RespostaORJSON(conteudo, headers=cabecalhos)
+    response.headers.update(cabecalhos)
+    return {"itens": itens, "next_cursor": next_cursor}
+
+async def _listar_campos(
+    db: AsyncSession, departamento, ativo, limit, cursor, stream, fields: str, cabecalhos: dict
+) -> Response:
+    """Lista apenas as colunas solicitadas, selecionadas no próprio SQL."""
+    colunas = [getattr(FuncionarioDB, c) for c in _colunas_solicitadas(fields)]
+    serializar = _serializador_parcial(fields)
+
+    if stream:
+        return StreamingResponse(
+            transmitir_json(
+                lambda sessao: filtrar_funcionarios(sessao.query(*colunas), departamento, ativo).order_by(FuncionarioDB.id),
+                lambda linha: to_json(serializar(linha)).decode()
+            ),
+            media_type="application/json"
+        )
+
+    linhas = (await db.execute(pagina_funcionarios(select(*colunas), departamento, ativo, cursor, limit))).all()
+    linhas, next_cursor = fechar_pagina(linhas, limit)
+    conteudo = to_json({"itens": [serializar(linha) for linha in linhas], "next_cursor": next_cursor})
+    return Response(content=conteudo, media_type="application/json", headers=cabecalhos)
+
+@router.get("/funcionarios/exportar", dependencies=[Depends(orcamento_sql(2))])
+def exportar_funcionarios(
     departamento: Optional[str] = None,
     ativo: Optional[bool] = Query(True, description="Filtrar funcionários ativos ou inativos"),
-    current_user: UsuarioRH = Depends(get_usuario_atual)
+    formato: str = Query("csv", pattern="^(csv|ndjson)$", description="`csv` ou `ndjson`"),
+    gzip: bool = Query(False, description="Comprime o arquivo em gzip durante a transmissão"),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    colunas = [getattr(FuncionarioDB, c) for c in COLUNAS_EXPORTACAO]
+    nome_arquivo = f"funcionarios.{formato}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        transmitir_exportacao(
+            lambda sessao: filtrar_funcionarios(sessao.query(*colunas), departamento, ativo).order_by(FuncionarioDB.id),
+            formato,
+            gzip
+        ),
+        media_type="application/gzip" if gzip else FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'}
+    )
+
+@router.get("/funcionarios/search", response_model=List[FuncionarioBusca], dependencies=[Depends(orcamento_sql(2))])
+async def pesquisar_funcionarios(
+    q: str = Query(..., min_length=1, description="Texto buscado em nome, CPF, cargo e departamento (sem acentos, por prefixo e aproximado)"),
+    limit: int = Query(20, ge=1, le=100, description="Quantidade máxima de resultados"),
+    ativo: Optional[bool] = Query(True, description="Filtrar funcionários ativos ou inativos"),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
 ):
-    query = db.query(FuncionarioDB)
-    if departamento:
-        query = query.filter(FuncionarioDB.departamento == departamento)
-    if ativo is not None:
-        query = query.filter(FuncionarioDB.ativo == ativo)
-    return query.all()
+    indice = await garantir_indice()
+    return indice.buscar(q, limit, ativo)
 
-@router.get("/funcionarios/{id}", response_model=FuncionarioResponse)
-def buscar_funcionario(
+@router.get("/funcionarios/alteracoes", response_model=AlteracoesFuncionarios, dependencies=[Depends(orcamento_sql(3))])
+async def alteracoes_funcionarios(
+    changed_since: Optional[str] = Query(None, description="`token` da consulta anterior; sem ele, só devolve o token atual"),
+    limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de funcionários"),
+    db: AsyncSession = Depends(get_async_db_leitura),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    """
+    Funcionários criados, alterados ou desativados depois de `changed_since`, inclusive por escritas
+    em lote. Fluxo do cliente: pegar o token, carregar a lista e, depois, aplicar só as alterações.
+    """
+    if not changed_since:
+        return {"itens": [], "token": await token_atual(db), "mais": False}
+    itens, token, mais = await alteracoes_desde(db, changed_since, limit)
+    return {"itens": itens, "token": token, "mais": mais}
+
+@router.get("/funcionarios/{id}", response_model=FuncionarioResponse, dependencies=[Depends(orcamento_sql(3))])
+async def buscar_funcionario(
     id: int,
-    db: Session = Depends(get_db),
-    current_user: UsuarioRH = Depends(get_usuario_atual)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_leitura),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
 ):
-    funcionario = db.query(FuncionarioDB).get(id)
+    funcionario = await db.scalar(consulta_funcionario(id))
     if not funcionario:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Funcionário não encontrado")
+
+    etag = etag_funcionario(id, funcionario.versao)
+    ultima_alteracao = funcionario.atualizado_em or funcionario.criado_em
+    if etag_confere(if_none_match, etag):
+        return nao_modificado(etag, ultima_alteracao)
+    if FAST_JSON_RESPONSES:
+        return RespostaORJSON(funcionario_confiavel(funcionario), headers=cabecalhos_validacao(etag, ultima_alteracao))
+    response.headers.update(cabecalhos_validacao(etag, ultima_alteracao))
     return funcionario
 
-@router.post("/funcionarios", response_model=FuncionarioResponse, status_code=status.HTTP_201_CREATED)
-def criar_funcionario(
+@router.post(
+    "/funcionarios", response_model=FuncionarioResponse, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(orcamento_sql(5))]
+)
+async def criar_funcionario(
     funcionario: FuncionarioCreate,
-    db: Session = Depends(get_db),
-    current_user: UsuarioRH = Depends(get_usuario_atual)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
 ):
     try:
-        db_funcionario = FuncionarioDB(**funcionario.dict())
+        db_funcionario = FuncionarioDB(**funcionario.model_dump(exclude={"beneficiarios"}))
         db.add(db_funcionario)
-        db.commit()
-        db.refresh(db_funcionario)
+        await db.flush()  # Gera o id; funcionário e beneficiários são gravados na mesma transação
+        await _gravar_beneficiarios(db, db_funcionario.id, funcionario.beneficiarios)
+        await db.commit()
+        db_funcionario = await db.scalar(consulta_funcionario(db_funcionario.id, recarregar=True))
+        _apos_alteracao(db_funcionario)
+        await fila_auditoria.registrar(db_funcionario.id, "criacao", {}, current_user)
         return db_funcionario
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Erro ao criar funcionário: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Erro ao criar funcionário")
 
-@router.put("/funcionarios/{id}", response_model=FuncionarioResponse)
-def atualizar_funcionario(
+@router.post("/funcionarios/importar", response_model=RelatorioImportacao, dependencies=[Depends(orcamento_sql(None))])
+def importar_funcionarios(
+    arquivo: UploadFile = File(..., description="Arquivo CSV ou NDJSON com um funcionário por linha"),
+    formato: Optional[str] = Query(None, description="`csv` ou `ndjson` (padrão: deduzido pela extensão)"),
+    tamanho_lote: int = Query(TAMANHO_LOTE_PADRAO, ge=1, le=10000, description="Linhas inseridas por transação"),
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    try:
+        formato = detectar_formato(arquivo.filename, formato)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    relatorio = importar_arquivo(db, arquivo.file, formato, tamanho_lote)
+    if relatorio["importados"]:
+        _apos_alteracao()
+    logger.info(f"Importação concluída: {relatorio['importados']} importados, {relatorio['rejeitados']} rejeitados")
+    return relatorio
+
+@router.patch("/funcionarios", response_model=ResultadoLote, dependencies=[Depends(orcamento_sql(2))])
+async def atualizar_funcionarios_em_lote(
+    pedido: AtualizacaoLote,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_usuario_admin)
+):
+    """
+    Aplica uma operação (definir campo, reajuste salarial ou transferência de departamento) a todos
+    os funcionários do filtro com um único UPDATE. Restrito a administradores.
+    """
+    try:
+        resultado = await executar_atualizacao(db, pedido)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Erro na atualização em lote: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Erro na atualização em lote")
+
+    if resultado["afetados"]:
+        _apos_alteracao()
+    logger.info(f"Atualização em lote ({pedido.operacao}): {resultado['afetados']} funcionários")
+    return resultado
+
+@router.put("/funcionarios/{id}", response_model=FuncionarioResponse, dependencies=[Depends(orcamento_sql(8))])
+async def atualizar_funcionario(
     id: int,
     funcionario: FuncionarioUpdate,
-    db: Session = Depends(get_db),
-    current_user: UsuarioRH = Depends(get_usuario_atual)
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag lido no GET; se a versão mudou desde então, responde 412"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
 ):
+    # Concorrência otimista: sem lock de linha; o UPDATE confere a versão lida (version_id_col)
     try:
-        db_funcionario = db.query(FuncionarioDB).filter(FuncionarioDB.id == id).with_for_update().one()
-        
-        update_data = funcionario.dict(exclude_unset=True)
+        db_funcionario = await db.scalar(consulta_funcionario(id))
+        if not db_funcionario:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Funcionário não encontrado")
+        if if_match and not etag_confere(if_match, etag_funcionario(id, db_funcionario.versao)):
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=ALTERADO_POR_OUTRO)
+
+        antes = registro_indicadores(db_funcionario)
+        update_data = funcionario.model_dump(exclude_unset=True, exclude={"beneficiarios"})
+        alteracoes = diferencas(db_funcionario, update_data, funcionario.beneficiarios)
         for key, value in update_data.items():
             setattr(db_funcionario, key, value)
-        
-        db.commit()
-        db.refresh(db_funcionario)
+        if funcionario.beneficiarios is not None:
+            await _gravar_beneficiarios(db, id, funcionario.beneficiarios, substituir=True)
+        db_funcionario.atualizado_em = func.now()  # Nova versão mesmo quando só os beneficiários mudam
+
+        await db.commit()
+        db_funcionario = await db.scalar(consulta_funcionario(id, recarregar=True))
+        _apos_alteracao(db_funcionario, antes)
+        if alteracoes:
+            await fila_auditoria.registrar(id, "alteracao", alteracoes, current_user)
+        response.headers.update(cabecalhos_validacao(
+            etag_funcionario(id, db_funcionario.versao), db_funcionario.atualizado_em
+        ))
         return db_funcionario
+    except HTTPException:
+        await db.rollback()
+        raise
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=ALTERADO_POR_OUTRO)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Erro ao atualizar funcionário {id}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Erro ao atualizar funcionário")
 
-@router.delete("/funcionarios/{id}", status_code=status.HTTP_200_OK)
-def deletar_funcionario(
+@router.delete("/funcionarios/{id}", status_code=status.HTTP_200_OK, dependencies=[Depends(orcamento_sql(3))])
+async def deletar_funcionario(
     id: int,
-    db: Session = Depends(get_db),
-    current_user: UsuarioRH = Depends(get_usuario_atual)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
 ):
     try:
-        funcionario = db.query(FuncionarioDB).get(id)
+        funcionario = await db.get(FuncionarioDB, id)
         if not funcionario:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Funcionário não encontrado")
         
+        antes = registro_indicadores(funcionario)
+        alteracoes = diferencas(funcionario, {"ativo": False})
         funcionario.ativo = False
-        db.commit()
+        await db.commit()
+        _apos_alteracao(funcionario, antes)
+        if alteracoes:
+            await fila_auditoria.registrar(id, "desativacao", alteracoes, current_user)
         return {"mensagem": "Funcionário desativado com sucesso"}
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Erro ao desativar funcionário {id}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Erro ao desativar funcionário")
 
-@router.get("/departamentos", response_model=List[str])
-def listar_departamentos(
-    db: Session = Depends(get_db),
-    current_user: UsuarioRH = Depends(get_usuario_atual)
+@router.get("/funcionarios/{id}/historico", response_model=PaginaAuditoria, dependencies=[Depends(orcamento_sql(2))])
+async def historico_funcionario(
+    id: int,
+    limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em `next_cursor` pela página anterior"),
+    db: AsyncSession = Depends(get_async_db_leitura),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    """
+    Alterações do funcionário, da mais recente para a mais antiga, com o diff de cada campo e quem alterou.
+    A auditoria é gravada em segundo plano: uma alteração aparece aqui em até AUDIT_FLUSH_INTERVAL_MS.
+    """
+    registros = (await db.scalars(consulta_historico(id, cursor, limit))).all()
+    itens, next_cursor = fechar_pagina(registros, limit)
+    return {"itens": itens, "next_cursor": next_cursor}
+
+@router.get("/departamentos", response_model=List[str], dependencies=[Depends(orcamento_sql(2))])
+async def listar_departamentos(
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    return [d["departamento"] for d in await obter_resumo_departamentos()]
+
+@router.get("/departamentos/resumo", response_model=List[DepartamentoResumo], dependencies=[Depends(orcamento_sql(2))])
+async def resumo_departamentos(
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    """Departamentos com total de funcionários ativos e folha salarial (servido do cache)."""
+    return await obter_resumo_departamentos()
+
+@router.get("/folha", response_model=FolhaPagamento, dependencies=[Depends(orcamento_sql(2))])
+async def calcular_folha(
+    departamento: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db_leitura),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    """Estimativa da folha mensal dos funcionários ativos: total da empresa e por departamento."""
+    from folha import obter_folha  # NumPy só é carregado na primeira chamada, não na inicialização
+    return await obter_folha(db, departamento)
+
+@router.get("/indicadores/headcount", response_model=Headcount, dependencies=[Depends(orcamento_sql(4))])
+async def indicadores_headcount(
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    """Funcionários ativos por departamento, tipo de contrato e grau de instrução (servido do cache)."""
+    return (await garantir_indicadores()).headcount()
+
+@router.get("/indicadores/movimentacao", response_model=Movimentacao, dependencies=[Depends(orcamento_sql(4))])
+async def indicadores_movimentacao(
+    meses: int = Query(12, ge=1, le=120, description="Quantidade de meses, terminando no mês atual"),
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
+):
+    """Admissões e desligamentos por mês (data_admissao/data_demissao), headcount e rotatividade."""
+    return (await garantir_indicadores()).movimentacao(meses)
+
+@router.get("/indicadores/salarios", response_model=DistribuicaoSalarial, dependencies=[Depends(orcamento_sql(4))])
+async def indicadores_salarios(
+    current_user: UsuarioAutenticado = Depends(get_usuario_atual)
 ):
-    return [d[0] for d in db.query(FuncionarioDB.departamento).distinct().all() if d[0]]
\ No newline at end of file
+    """Percentis do salário mensal dos ativos (horistas: valor da hora x horas mensais), total e por departamento."""
+    return (await garantir_indicadores()).salarios()
@@ -1,52 +1,56 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import List
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from database import UsuarioRH, get_db
+from database import UsuarioRH, get_async_db
 from models import UsuarioRHCreate, Token, UsuarioRH as UsuarioRHModel
 from auth import (
-    criar_hash_senha,
-    verificar_senha,
+    criar_hash_senha_async,
+    verificar_senha_async,
+    limite_login,
     criar_access_token,
-    get_usuario_admin
+    consulta_usuario,
+    get_usuario_admin,
+    UsuarioAutenticado
 )
 
 router = APIRouter()
 
 @router.post("/rh/cadastrar", status_code=status.HTTP_201_CREATED)
-def cadastrar_usuario_rh(
+async def cadastrar_usuario_rh(
     usuario: UsuarioRHCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Cadastro de usuários no RH"""
     
     db_usuario = UsuarioRH(
         email=usuario.email,
         nome=usuario.nome,
-        senha_hash=criar_hash_senha(usuario.senha),
+        senha_hash=await criar_hash_senha_async(usuario.senha),
         nivel_acesso=usuario.nivel_acesso
     )
     db.add(db_usuario)
     try:
-        db.commit()
+        await db.commit()
         return {"mensagem": "Usuário RH cadastrado com sucesso"}
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email já cadastrado"
         )
 
 @router.post("/rh/login", response_model=Token)
-def login_rh(
+async def login_rh(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Autenticação de usuário e geração do token JWT"""
     
-    usuario = db.query(UsuarioRH).filter(UsuarioRH.email == form_data.username).first()
+    usuario = await db.scalar(consulta_usuario(form_data.username))
     
     if not usuario:
         raise HTTPException(
@@ -54,24 +58,33 @@ def login_rh(
             detail="Usuário não encontrado"
         )
 
-    if not verificar_senha(form_data.password, usuario.senha_hash):
+    # Limita quantos logins disputam o pool de hash ao mesmo tempo
+    async with limite_login:
+        senha_valida, novo_hash = await verificar_senha_async(form_data.password, usuario.senha_hash)
+
+    if not senha_valida:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Senha incorreta"
         )
-    
+
     access_token = criar_access_token(
-        data={"sub": usuario.email, "nivel": usuario.nivel_acesso}
+        data={"sub": usuario.email, "nivel": usuario.nivel_acesso, "id": usuario.id, "nome": usuario.nome}
     )
+
+    # Rehash transparente quando os parâmetros de custo do bcrypt (BCRYPT_ROUNDS) mudam
+    if novo_hash:
+        usuario.senha_hash = novo_hash
+        await db.commit()
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/rh/usuarios", response_model=List[UsuarioRHModel])
-def listar_usuarios_rh(
-    db: Session = Depends(get_db),
-    current_user: UsuarioRH = Depends(get_usuario_admin)
+async def listar_usuarios_rh(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_usuario_admin)
 ):
     """Listagem de usuários RH (apenas para administradores)"""
     
-    usuarios = db.query(UsuarioRH).all()
+    usuarios = (await db.scalars(select(UsuarioRH))).all()
     return usuarios
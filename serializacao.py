@@ -0,0 +1,45 @@
+import os
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+from models import BeneficiarioBase, FuncionarioDB, FuncionarioResponse
+
+# ⚡ Serialização rápida (opcional): orjson + linhas do banco sem revalidação pelo pydantic
+# A validação continua nas entradas (FuncionarioCreate/Update); o que sai do banco já é confiável
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+CAMPOS_FUNCIONARIO = tuple(FuncionarioResponse.model_fields)
+CAMPOS_BENEFICIARIO = tuple(BeneficiarioBase.model_fields)
+
+def _padrao(valor: Any) -> Any:
+    # Numeric sai como número, igual ao FuncionarioResponse (campos float)
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+def para_json(conteudo: Any) -> bytes:
+    return orjson.dumps(conteudo, default=_padrao)
+
+class RespostaORJSON(JSONResponse):
+    """JSONResponse renderizada com orjson (datas, UUID e Decimal nativos; várias vezes mais rápida que json.dumps)."""
+
+    def render(self, content: Any) -> bytes:
+        return para_json(content)
+
+def _atributos(objeto, campos: tuple) -> dict:
+    # Valores já carregados ficam no __dict__ da instância; getattr (descritor do ORM) só para os demais
+    estado = objeto.__dict__
+    return {campo: estado[campo] if campo in estado else getattr(objeto, campo) for campo in campos}
+
+def funcionario_confiavel(funcionario: FuncionarioDB) -> dict:
+    """
+    Mesmo conteúdo e ordem de campos de `FuncionarioResponse`, lido direto dos atributos do ORM.
+    Os beneficiários precisam estar carregados (selectinload).
+    """
+    dados = _atributos(funcionario, CAMPOS_FUNCIONARIO)
+    dados["beneficiarios"] = [  # Substitui a lista de objetos mantendo a posição da chave
+        _atributos(beneficiario, CAMPOS_BENEFICIARIO) for beneficiario in funcionario.beneficiarios
+    ]
+    return dados
@@ -0,0 +1,41 @@
+// Indicadores agregados no servidor: o painel não precisa baixar o cadastro inteiro
+async function buscarIndicador(caminho) {
+    const response = await fetch(`${API_URL}/indicadores/${caminho}`, {
+        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+    });
+    if (!response.ok) throw new Error(`Erro ao carregar ${caminho}`);
+    return response.json();
+}
+
+function formatarMoeda(valor) {
+    return valor.toLocaleString('pt-BR', { style: 'currency', currency: 'BRL' });
+}
+
+async function carregarIndicadores() {
+    try {
+        const [headcount, salarios, movimentacao] = await Promise.all([
+            buscarIndicador('headcount'), buscarIndicador('salarios'), buscarIndicador('movimentacao?meses=12')
+        ]);
+
+        document.getElementById('headcountTotal').textContent =
+            `${headcount.total} funcionários ativos · mediana salarial ${formatarMoeda(salarios.total.p50)}`;
+        const percentis = Object.fromEntries(salarios.departamentos.map(d => [d.departamento, d]));
+        document.querySelector('#headcountTable tbody').innerHTML = headcount.departamento.map(d => {
+            const p = percentis[d.grupo] || { p25: 0, p50: 0, p75: 0 };
+            return `<tr><td>${d.grupo || '--'}</td><td>${d.funcionarios}</td>` +
+                `<td>${formatarMoeda(p.p25)}</td><td>${formatarMoeda(p.p50)}</td><td>${formatarMoeda(p.p75)}</td></tr>`;
+        }).join('');
+
+        document.getElementById('rotatividadePeriodo').textContent =
+            `${movimentacao.admissoes} admissões, ${movimentacao.desligamentos} desligamentos, ` +
+            `rotatividade no período: ${movimentacao.rotatividade_periodo}%`;
+        document.querySelector('#movimentacaoTable tbody').innerHTML = movimentacao.meses.map(m =>
+            `<tr><td>${m.mes}</td><td>${m.admissoes}</td><td>${m.desligamentos}</td>` +
+            `<td>${m.headcount}</td><td>${m.rotatividade}%</td></tr>`
+        ).join('');
+    } catch (error) {
+        document.getElementById('headcountTotal').textContent = 'Erro ao carregar indicadores.';
+    }
+}
+
+carregarIndicadores();
@@ -56,6 +56,8 @@ document.addEventListener("DOMContentLoaded", async () => {
 
     if (!response.ok) throw new Error("Erro ao carregar dados do funcionário");
 
+    // Versão lida: enviada no If-Match para não sobrescrever alterações feitas por outra pessoa
+    const etag = response.headers.get("ETag");
     const funcionario = await response.json();
 
     const setValue = (id, val) => {
@@ -206,10 +208,17 @@ document.addEventListener("DOMContentLoaded", async () => {
           headers: {
             "Content-Type": "application/json",
             Authorization: `Bearer ${localStorage.getItem("token")}`,
+            ...(etag ? { "If-Match": etag } : {}),
           },
           body: JSON.stringify(formData),
         });
 
+        if (updateResponse.status === 412) {
+          alert("Este funcionário foi alterado por outra pessoa. Os dados serão recarregados.");
+          window.location.reload();
+          return;
+        }
+
         if (!updateResponse.ok) {
           const errorData = await updateResponse.json().catch(() => ({}));
           console.error("Erro detalhado:", errorData);
@@ -1,10 +1,18 @@
 let isLoading = false;
+let proximoCursor = null;
+let filtrosAtuais = { departamento: '', status: '' };
+// Cópia local da lista (id -> funcionário) e token do feed de alterações: depois da primeira carga,
+// só o que mudou é buscado (GET /funcionarios/alteracoes). Guardada na sessão para a volta da edição
+let funcionariosLocais = new Map();
+let tokenAlteracoes = null;
+const CHAVE_LISTA = 'listaFuncionarios';
 
 const elements = {
     tableBody: document.querySelector('#funcionariosTable tbody'),
     departamentoFilter: document.getElementById('departamentoFilter'),
     loadingIndicator: document.getElementById('loadingIndicator') || { style: {} },
-    filterButton: document.getElementById('filterButton')
+    filterButton: document.getElementById('filterButton'),
+    carregarMaisButton: document.getElementById('carregarMaisButton')
 };
 
 function showLoading(show) {
@@ -16,13 +24,72 @@ function showError(message) {
     elements.tableBody.innerHTML = `<tr><td colspan="4" class="error-message">${message}</td></tr>`;
 }
 
-function renderizarFuncionarios(funcionarios) {
-    if (!funcionarios || funcionarios.length === 0) {
+function atualizarCarregarMais() {
+    if (elements.carregarMaisButton) elements.carregarMaisButton.style.display = proximoCursor ? 'inline-block' : 'none';
+}
+
+function cabecalhosAuth() {
+    return { 'Authorization': `Bearer ${localStorage.getItem('token')}` };
+}
+
+function salvarLista() {
+    sessionStorage.setItem(CHAVE_LISTA, JSON.stringify({
+        filtros: filtrosAtuais, token: tokenAlteracoes, cursor: proximoCursor, itens: [...funcionariosLocais.values()]
+    }));
+}
+
+function renderizarLista() {
+    const itens = [...funcionariosLocais.values()].sort((a, b) => a.id - b.id);
+    renderizarFuncionarios(itens);
+    atualizarCarregarMais();
+}
+
+function atendeFiltros(func) {
+    const ativo = filtrosAtuais.status === '' ? true : filtrosAtuais.status === 'true';
+    return func.ativo === ativo && (!filtrosAtuais.departamento || func.departamento === filtrosAtuais.departamento);
+}
+
+async function obterTokenAlteracoes() {
+    const response = await fetch(`${API_URL}/funcionarios/alteracoes`, { headers: cabecalhosAuth() });
+    if (!response.ok) throw new Error('Erro ao consultar alterações');
+    return (await response.json()).token;
+}
+
+// Aplica à cópia local os funcionários criados, alterados ou desativados desde o último token
+async function aplicarAlteracoes() {
+    if (!tokenAlteracoes) return;
+    // Com páginas ainda não carregadas, ids além da última página chegam pelo "Carregar mais"
+    const ids = [...funcionariosLocais.keys()];
+    const limiteCarregado = proximoCursor ? Math.max(0, ...ids) : Infinity;
+    let mais = true;
+    while (mais) {
+        const url = new URL(`${API_URL}/funcionarios/alteracoes`);
+        url.searchParams.append('changed_since', tokenAlteracoes);
+        const response = await fetch(url, { headers: cabecalhosAuth() });
+        if (!response.ok) throw new Error('Erro ao consultar alterações');
+        const alteracoes = await response.json();
+        alteracoes.itens.forEach(func => {
+            if (atendeFiltros(func) && func.id <= limiteCarregado) {
+                funcionariosLocais.set(func.id, { id: func.id, nome: func.nome, cpf: func.cpf, cargo: func.cargo,
+                                                  departamento: func.departamento, ativo: func.ativo });
+            } else {
+                funcionariosLocais.delete(func.id);
+            }
+        });
+        tokenAlteracoes = alteracoes.token;
+        mais = alteracoes.mais;
+    }
+    salvarLista();
+    renderizarLista();
+}
+
+function renderizarFuncionarios(funcionarios, acrescentar = false) {
+    if (!acrescentar && (!funcionarios || funcionarios.length === 0)) {
         elements.tableBody.innerHTML = `<tr><td colspan="4" class="no-data">Nenhum funcionário encontrado</td></tr>`;
         return;
     }
 
-    elements.tableBody.innerHTML = '';
+    if (!acrescentar) elements.tableBody.innerHTML = '';
     funcionarios.forEach(func => {
         const row = document.createElement('tr');
         row.innerHTML = `
@@ -38,28 +105,32 @@ function renderizarFuncionarios(funcionarios) {
     });
 }
 
-async function carregarFuncionarios(departamento = '', status = '') {
-    if (sessionStorage.getItem('shouldReload')) {
-        sessionStorage.removeItem('shouldReload');
-        departamento = '';
-        status = '';
-    }
-
+async function carregarFuncionarios(departamento = '', status = '', cursor = null) {
     if (isLoading) return;
     try {
         isLoading = true;
         showLoading(true);
+        filtrosAtuais = { departamento, status };
+        if (!cursor) {
+            // Token antes da lista: o que mudar durante a carga volta no próximo feed
+            tokenAlteracoes = await obterTokenAlteracoes();
+            funcionariosLocais = new Map();
+        }
         const url = new URL(`${API_URL}/funcionarios`);
         if (departamento) url.searchParams.append('departamento', departamento);
         if (status !== '') url.searchParams.append('ativo', status === 'true');
+        if (cursor) url.searchParams.append('cursor', cursor);
+        url.searchParams.append('fields', 'resumo');
         url.searchParams.append('_', Date.now());
 
-        const response = await fetch(url, {
-            headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
-        });
+        const response = await fetch(url, { headers: cabecalhosAuth() });
 
         if (!response.ok) throw new Error('Erro ao carregar funcionários');
-        renderizarFuncionarios(await response.json());
+        const pagina = await response.json();
+        proximoCursor = pagina.next_cursor;
+        pagina.itens.forEach(func => funcionariosLocais.set(func.id, func));
+        salvarLista();
+        renderizarLista();
     } catch (error) {
         showError('Erro ao carregar funcionários. Tente novamente.');
     } finally {
@@ -112,8 +183,7 @@ window.desativarFuncionario = async function(id) {
             headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
         });
         if (!response.ok) throw new Error('Erro ao desativar funcionário');
-        sessionStorage.setItem('shouldReload', 'true');
-        await carregarFuncionarios();
+        await aplicarAlteracoes();
         alert('Funcionário desativado com sucesso!');
     } catch (error) {
         alert(error.message || 'Erro ao desativar funcionário');
@@ -122,6 +192,11 @@ window.desativarFuncionario = async function(id) {
     }
 }
 
+function carregarMaisFuncionarios() {
+    if (!proximoCursor) return;
+    carregarFuncionarios(filtrosAtuais.departamento, filtrosAtuais.status, proximoCursor);
+}
+
 function filtrarFuncionarios() {
     const departamento = elements.departamentoFilter.value;
     const status = document.getElementById("ativoFilter").value;
@@ -157,11 +232,26 @@ if (document.getElementById('cadastroForm')) {
     });
 }
 
+// Volta da edição/cadastro: reaproveita a lista da sessão e aplica só as alterações
+async function restaurarLista() {
+    const salva = JSON.parse(sessionStorage.getItem(CHAVE_LISTA) || 'null');
+    sessionStorage.removeItem('shouldReload');
+    if (!salva || !salva.token) return false;
+    filtrosAtuais = salva.filtros;
+    tokenAlteracoes = salva.token;
+    proximoCursor = salva.cursor;
+    funcionariosLocais = new Map(salva.itens.map(func => [func.id, func]));
+    if (elements.departamentoFilter) elements.departamentoFilter.value = filtrosAtuais.departamento;
+    if (document.getElementById('ativoFilter')) document.getElementById('ativoFilter').value = filtrosAtuais.status;
+    await aplicarAlteracoes();
+    return true;
+}
+
 async function inicializarPagina() {
     try {
         showLoading(true);
         await carregarDepartamentos();
-        await carregarFuncionarios();
+        if (!(await restaurarLista().catch(() => false))) await carregarFuncionarios();
     } catch (error) {
         showError('Erro ao carregar dados. Tente recarregar a página.');
     } finally {
@@ -172,6 +262,9 @@ async function inicializarPagina() {
 // Ao carregar a página
 window.onload = () => {
     inicializarPagina();
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') aplicarAlteracoes().catch(() => {});
+    });
     if (elements.departamentoFilter && elements.filterButton) {
         elements.departamentoFilter.addEventListener('keypress', (e) => {
             if (e.key === 'Enter') filtrarFuncionarios();
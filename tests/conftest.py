@@ -0,0 +1,100 @@
+import asyncio
+import os
+import tempfile
+from typing import List
+
+# ⚙️ Ambiente dos testes: definido antes de importar o app (os módulos leem o ambiente na importação)
+# Pool mínimo (1 + 1) para que qualquer requisição que espere uma segunda conexão trave nos testes
+_PASTA_BANCO = tempfile.mkdtemp(prefix="rh-testes-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_PASTA_BANCO}/testes.db",
+    "DATABASE_REPLICA_URLS": "",
+    "DB_POOL_SIZE": "1",
+    "DB_MAX_OVERFLOW": "1",
+    "DB_ASYNC_SESSIONS": "auto",
+    "SQL_QUERY_BUDGET": "raise",
+    "BCRYPT_ROUNDS": "4",
+    "PASSWORD_HASH_OFFLOAD": "false",
+    "AUTH_TRUST_TOKEN_CLAIMS_SECONDS": "0",
+    "FAST_JSON_RESPONSES": "false",
+    "PROFILER_ENABLED": "false",
+})
+
+import httpx
+import pytest
+
+import database
+
+SENHA = "senha-dos-testes"
+
+def dados_funcionario(i: int, **campos) -> dict:
+    """Corpo válido de POST /funcionarios (CPF único por `i`); `campos` substitui os valores padrão."""
+    dados = {
+        "cpf": f"{i // 1000 % 1000:03d}.{i % 1000:03d}.000-{i % 100:02d}", "nome": f"Funcionário {i}",
+        "data_nascimento": "1990-01-01", "municipio_nascimento": "São Paulo", "uf_nascimento": "SP",
+        "nome_mae": "Mãe", "nome_pai": "Pai", "nacionalidade": "Brasileira", "estado_civil": "Solteiro",
+        "rg_numero": "1", "rg_data_emissao": "2008-01-01", "rg_orgao_emissor": "SSP", "ctps_numero": "1",
+        "ctps_serie": "1", "ctps_uf": "SP", "ctps_data_emissao": "2010-01-01", "titulo_eleitor": "1",
+        "titulo_zona": "1", "titulo_secao": "1", "pis": "1", "pis_data_cadastro": "2010-01-01", "cbo": "1",
+        "endereco": "Rua A", "endereco_numero": "1", "bairro": "Centro", "municipio": "São Paulo", "uf": "SP",
+        "cep": "01000-000", "telefone": "11999999999", "email": f"funcionario{i}@empresa.com",
+        "cargo": "Analista", "funcao": "Analista", "departamento": "TI", "data_admissao": "2020-01-01",
+        "salario": 3000 + i, "tipo_pagamento": "Mensal", "horas_mensais": 220, "tipo_contrato": "CLT",
+        "adicional_periculosidade": 0, "adicional_insalubridade": 0, "grau_instrucao": "Superior",
+        "fgts_data_opcao": "2020-01-01", "beneficiarios": [],
+    }
+    dados.update(campos)
+    return dados
+
+async def criar_funcionarios(cliente: httpx.AsyncClient, quantidade: int, inicio: int = 1, **campos) -> List[dict]:
+    """Cria funcionários pela API (POST /funcionarios) e devolve as respostas."""
+    criados = []
+    for i in range(inicio, inicio + quantidade):
+        resposta = await cliente.post("/api/v1/funcionarios", json=dados_funcionario(i, **campos))
+        assert resposta.status_code == 201, resposta.text
+        criados.append(resposta.json())
+    return criados
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def banco(monkeypatch):
+    """Banco vazio, caches em memória zerados e vagas de sessão novas (ligadas ao event loop do teste)."""
+    import models  # noqa: F401  (registra as tabelas no metadata)
+    from auth import cache_tokens, cache_usuarios
+    from busca import indice_busca
+    from departamentos import invalidar_departamentos
+    from indicadores import indicadores
+
+    database.Base.metadata.drop_all(bind=database.engine)
+    database.Base.metadata.create_all(bind=database.engine)
+    monkeypatch.setattr(database, "_vagas_sessoes", asyncio.Semaphore(database.DB_POOL_SIZE + database.DB_MAX_OVERFLOW))
+    for cache in (cache_tokens, cache_usuarios, database.roteador.aderencia):
+        cache.limpar()
+    invalidar_departamentos()
+    indice_busca.invalidar()
+    indicadores.invalidar()
+    yield database
+    database.engine.dispose()
+
+@pytest.fixture
+async def cliente(banco):
+    """Cliente HTTP do app (httpx.ASGITransport, com o lifespan) autenticado como administrador."""
+    from main import app
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testes") as cliente:
+            cliente.headers["Authorization"] = await autenticar(cliente, "admin@rh.com", "admin")
+            yield cliente
+    await database.async_engine.dispose()  # Conexões aiosqlite ficam presas ao event loop do teste
+
+async def autenticar(cliente: httpx.AsyncClient, email: str, nivel_acesso: str = "user") -> str:
+    """Cadastra um usuário RH e devolve o valor do cabeçalho Authorization com o token dele."""
+    resposta = await cliente.post("/api/v1/rh/cadastrar", json={
+        "email": email, "nome": email.split("@")[0], "senha": SENHA, "nivel_acesso": nivel_acesso
+    })
+    assert resposta.status_code == 201, resposta.text
+    resposta = await cliente.post("/api/v1/rh/login", data={"username": email, "password": SENHA})
+    assert resposta.status_code == 200, resposta.text
+    return f"Bearer {resposta.json()['access_token']}"
@@ -0,0 +1,107 @@
+import os
+import threading
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+import database
+from alteracoes import alteracoes_desde, token_atual
+from conftest import criar_funcionarios, dados_funcionario
+from models import FuncionarioCreate, FuncionarioDB
+
+pytestmark = pytest.mark.anyio
+
+FEED = "/api/v1/funcionarios/alteracoes"
+
+async def test_feed_entrega_criacoes_edicoes_e_desativacoes_desde_o_token(cliente):
+    await criar_funcionarios(cliente, 3)
+    token = (await cliente.get(FEED)).json()["token"]
+
+    assert (await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"})).status_code == 200
+    assert (await cliente.delete("/api/v1/funcionarios/2")).status_code == 200
+    await criar_funcionarios(cliente, 1, inicio=4)
+
+    pagina = (await cliente.get(FEED, params={"changed_since": token})).json()
+    assert [(f["id"], f["cargo"], f["ativo"]) for f in pagina["itens"]] == [
+        (1, "Gerente", True), (2, "Analista", False), (4, "Analista", True)
+    ]
+    assert pagina["mais"] is False
+
+    vazia = (await cliente.get(FEED, params={"changed_since": pagina["token"]})).json()
+    assert vazia == {"itens": [], "token": pagina["token"], "mais": False}
+
+async def test_feed_pagina_uma_atualizacao_em_lote_pelo_id(cliente):
+    await criar_funcionarios(cliente, 5)
+    token = (await cliente.get(FEED)).json()["token"]
+    lote = {"filtro": {"departamento": "TI"}, "operacao": "reajustar_salario", "percentual": 10}
+    assert (await cliente.patch("/api/v1/funcionarios", json=lote)).json()["afetados"] == 5
+
+    paginas = []
+    while True:
+        pagina = (await cliente.get(FEED, params={"changed_since": token, "limit": 2})).json()
+        paginas.append([f["id"] for f in pagina["itens"]])
+        token = pagina["token"]
+        if not pagina["mais"]:
+            break
+    assert paginas == [[1, 2], [3, 4], [5]]
+
+async def test_token_invalido(cliente):
+    assert (await cliente.get(FEED, params={"changed_since": "lixo"})).status_code == 400
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def motor(request, banco):
+    """
+    Motor com pool padrão (duas escritas e uma leitura ao mesmo tempo): o SQLite dos testes ou,
+    com TEST_POSTGRES_URL, um PostgreSQL de testes (tabelas recriadas).
+    """
+    if request.param == "sqlite":
+        motor = create_engine(database.DATABASE_URL, connect_args={"timeout": 5})
+    else:
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL não definida")
+        motor = create_engine(url)
+        database.Base.metadata.drop_all(bind=motor)
+        database.Base.metadata.create_all(bind=motor)
+    yield motor
+    motor.dispose()
+
+async def test_transacoes_sobrepostas_nao_ficam_para_tras_do_token(motor):
+    with Session(motor) as sessao:
+        for i in (1, 2):
+            sessao.add(FuncionarioDB(**FuncionarioCreate(**dados_funcionario(i)).model_dump(exclude={"beneficiarios"})))
+        sessao.commit()
+
+    def leitor():
+        return database.SessaoEmThread(Session(motor, expire_on_commit=False))
+
+    async with leitor() as db:
+        token = await token_atual(db)
+
+    # A grava primeiro e confirma por último; B começa depois e (no PostgreSQL) confirma antes de A
+    transacao_a = Session(motor)
+    transacao_a.execute(update(FuncionarioDB).where(FuncionarioDB.id == 1).values(cargo="Gerente"))
+
+    def transacao_b():
+        with Session(motor) as sessao:
+            sessao.execute(update(FuncionarioDB).where(FuncionarioDB.id == 2).values(cargo="Diretor"))
+            sessao.commit()
+
+    escritor_b = threading.Thread(target=transacao_b)
+    escritor_b.start()
+    escritor_b.join(0.5)  # No SQLite, B espera o lock de A
+
+    entregues = []
+    async with leitor() as db:
+        itens, token, _ = await alteracoes_desde(db, token, 100)
+    entregues += [f.id for f in itens]
+
+    transacao_a.commit()
+    transacao_a.close()
+    escritor_b.join()
+    async with leitor() as db:
+        itens, token, _ = await alteracoes_desde(db, token, 100)
+    entregues += [f.id for f in itens]
+
+    assert sorted(entregues) == [1, 2]
@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import autenticar, criar_funcionarios
+
+pytestmark = pytest.mark.anyio
+
+LISTA = "/api/v1/funcionarios"
+
+async def funcionarios(cliente, **params) -> dict:
+    itens = (await cliente.get(LISTA, params={"limit": 100, **params})).json()["itens"]
+    return {f["id"]: f for f in itens}
+
+async def test_reajuste_e_transferencia_so_nos_funcionarios_do_filtro(cliente):
+    await criar_funcionarios(cliente, 2, salario=1000)
+    await criar_funcionarios(cliente, 1, inicio=3, departamento="RH", salario=1000)
+    etag = (await cliente.get(f"{LISTA}/1")).headers["ETag"]
+
+    resposta = await cliente.patch(LISTA, json={
+        "filtro": {"departamento": "TI"}, "operacao": "reajustar_salario", "percentual": 7.5, "retornar_ids": True
+    })
+    assert resposta.json() == {"afetados": 2, "ids": [1, 2]}
+    assert {id: f["salario"] for id, f in (await funcionarios(cliente)).items()} == {1: 1075.0, 2: 1075.0, 3: 1000.0}
+    # A versão sobe: ETags lidos antes da atualização deixam de valer
+    assert (await cliente.put(f"{LISTA}/1", json={"cargo": "Gerente"}, headers={"If-Match": etag})).status_code == 412
+
+    resposta = await cliente.patch(LISTA, json={
+        "filtro": {"ids": [2, 3]}, "operacao": "transferir_departamento", "departamento": "Financeiro"
+    })
+    assert resposta.json() == {"afetados": 2, "ids": None}
+    assert [f["departamento"] for f in (await funcionarios(cliente)).values()] == ["TI", "Financeiro", "Financeiro"]
+
+async def test_definir_campo_valida_como_o_put(cliente):
+    await criar_funcionarios(cliente, 2)
+    lote = {"filtro": {"ativo": True}, "operacao": "definir_campo"}
+
+    assert (await cliente.patch(LISTA, json={**lote, "campo": "cargo", "valor": "Coordenador"})).json()["afetados"] == 2
+    assert {f["cargo"] for f in (await funcionarios(cliente)).values()} == {"Coordenador"}
+
+    for campo, valor in (("cpf", "000.000.000-00"), ("nao_existe", 1), ("nome", None), ("salario", "abc")):
+        resposta = await cliente.patch(LISTA, json={**lote, "campo": campo, "valor": valor})
+        assert resposta.status_code == 400, (campo, resposta.text)
+
+async def test_pedido_sem_filtro_ou_sem_parametro_da_operacao_e_recusado(cliente):
+    await criar_funcionarios(cliente, 1)
+    assert (await cliente.patch(LISTA, json={"filtro": {}, "operacao": "reajustar_salario", "percentual": 5})).status_code == 422
+    assert (await cliente.patch(LISTA, json={"filtro": {"ativo": True}, "operacao": "reajustar_salario"})).status_code == 422
+    assert (await funcionarios(cliente))[1]["salario"] == 3001.0
+
+async def test_atualizacao_em_lote_e_restrita_a_administradores(cliente):
+    await criar_funcionarios(cliente, 1)
+    usuario = await autenticar(cliente, "usuario@rh.com")
+    resposta = await cliente.patch(LISTA, headers={"Authorization": usuario}, json={
+        "filtro": {"ativo": True}, "operacao": "reajustar_salario", "percentual": 50
+    })
+    assert resposta.status_code == 403
@@ -0,0 +1,65 @@
+import anyio
+import pytest
+from sqlalchemy import func, select
+
+import auditoria
+import database
+from auditoria import FilaAuditoria
+from conftest import criar_funcionarios
+from models import AuditoriaFuncionarioDB
+
+pytestmark = pytest.mark.anyio
+
+async def historico(cliente, id: int, quantidade: int, **params) -> dict:
+    """Histórico do funcionário assim que a fila gravar `quantidade` registros (gravação em segundo plano)."""
+    with anyio.fail_after(5):
+        while True:
+            pagina = (await cliente.get(f"/api/v1/funcionarios/{id}/historico", params=params)).json()
+            if len(pagina["itens"]) >= quantidade:
+                return pagina
+            await anyio.sleep(auditoria.AUDIT_FLUSH_INTERVAL_MS / 1000)
+
+async def test_historico_com_o_diff_e_quem_alterou(cliente):
+    await criar_funcionarios(cliente, 1)
+    await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Gerente", "nome": "Funcionário 1"})
+    await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"})  # Nada muda: não audita
+    await cliente.delete("/api/v1/funcionarios/1")
+
+    itens = (await historico(cliente, 1, 3))["itens"]
+    assert [(i["acao"], i["usuario_email"]) for i in itens] == [
+        ("desativacao", "admin@rh.com"), ("alteracao", "admin@rh.com"), ("criacao", "admin@rh.com")
+    ]
+    assert itens[1]["alteracoes"] == {"cargo": {"anterior": "Analista", "novo": "Gerente"}}
+    assert itens[0]["alteracoes"] == {"ativo": {"anterior": True, "novo": False}}
+
+    primeira = await historico(cliente, 1, 1, limit=2)
+    resto = (await cliente.get("/api/v1/funcionarios/1/historico", params={"cursor": primeira["next_cursor"]})).json()
+    assert [i["acao"] for i in primeira["itens"] + resto["itens"]] == ["desativacao", "alteracao", "criacao"]
+    assert resto["next_cursor"] is None
+
+async def test_fila_grava_as_alteracoes_do_intervalo_em_um_lote(cliente, monkeypatch):
+    await criar_funcionarios(cliente, 1)
+    fila, lotes = FilaAuditoria(), []
+    gravar = fila._gravar
+
+    async def gravar_medindo(itens):
+        lotes.append(len(itens))
+        await gravar(itens)
+
+    monkeypatch.setattr(fila, "_gravar", gravar_medindo)
+    fila.iniciar()
+    for _ in range(10):
+        await fila.registrar(1, "alteracao", {"cargo": {"anterior": "A", "novo": "B"}}, None)
+    assert fila.pendentes > 0  # A rota só enfileirou
+    await fila.encerrar()
+
+    assert lotes == [10]
+    async with database.AsyncSessionLocal() as db:
+        total = await db.scalar(select(func.count()).select_from(AuditoriaFuncionarioDB).where(AuditoriaFuncionarioDB.acao == "alteracao"))
+    assert total == 10
+
+async def test_sem_a_tarefa_a_fila_grava_na_hora(cliente):
+    await criar_funcionarios(cliente, 1)
+    await FilaAuditoria().registrar(1, "alteracao", {}, None)
+    async with database.AsyncSessionLocal() as db:
+        assert await db.scalar(select(func.count()).select_from(AuditoriaFuncionarioDB).where(AuditoriaFuncionarioDB.acao == "alteracao")) == 1
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import auth
+import database
+from conftest import autenticar
+
+pytestmark = pytest.mark.anyio
+
+LOTE = {"filtro": {"ids": [999]}, "operacao": "reajustar_salario", "percentual": 1}
+
+@pytest.fixture
+def motor(banco):
+    motor = create_engine(database.DATABASE_URL, connect_args={"timeout": 5})
+    yield motor
+    motor.dispose()
+
+async def test_promocao_vale_apos_o_commit_mesmo_com_leitura_durante_a_transacao(cliente, motor):
+    token = await autenticar(cliente, "usuario@rh.com")
+    assert (await cliente.patch("/api/v1/funcionarios", json=LOTE, headers={"Authorization": token})).status_code == 403
+
+    with Session(motor) as sessao:
+        usuario = sessao.scalar(select(database.UsuarioRH).where(database.UsuarioRH.email == "usuario@rh.com"))
+        usuario.nivel_acesso = "admin"
+        sessao.flush()
+        # Requisição entre o flush e o commit: lê o nível antigo e o guarda no cache
+        auth.cache_usuarios.limpar()
+        assert (await cliente.get("/api/v1/funcionarios", headers={"Authorization": token})).status_code == 200
+        assert auth.cache_usuarios.obter("usuario@rh.com").nivel_acesso == "user"
+        sessao.commit()
+
+    assert auth.cache_usuarios.obter("usuario@rh.com") is None
+    assert (await cliente.patch("/api/v1/funcionarios", json=LOTE, headers={"Authorization": token})).status_code == 200
+
+async def test_rollback_nao_invalida_o_cache(cliente, motor):
+    token = await autenticar(cliente, "usuario@rh.com")
+    await cliente.get("/api/v1/funcionarios", headers={"Authorization": token})
+
+    with Session(motor) as sessao:
+        usuario = sessao.scalar(select(database.UsuarioRH).where(database.UsuarioRH.email == "usuario@rh.com"))
+        usuario.nivel_acesso = "admin"
+        sessao.flush()
+        sessao.rollback()
+        assert "usuarios_alterados" not in sessao.info
+
+    assert auth.cache_usuarios.obter("usuario@rh.com").nivel_acesso == "user"
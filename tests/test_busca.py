@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from busca import IndiceBusca
+from conftest import criar_funcionarios
+
+pytestmark = pytest.mark.anyio
+
+BUSCA = "/api/v1/funcionarios/search"
+
+def registro(id: int, nome: str, cargo: str = "Analista", ativo: bool = True) -> dict:
+    return {"id": id, "nome": nome, "cpf": f"000.000.000-{id:02d}", "cargo": cargo, "departamento": "TI", "ativo": ativo}
+
+async def ids_encontrados(cliente, q: str, **params) -> list:
+    resposta = await cliente.get(BUSCA, params={"q": q, **params})
+    assert resposta.status_code == 200, resposta.text
+    return [item["id"] for item in resposta.json()]
+
+async def test_busca_sem_acentos_por_prefixo_e_aproximada(cliente):
+    await criar_funcionarios(cliente, 1, inicio=1, nome="João da Silva")
+    await criar_funcionarios(cliente, 1, inicio=2, nome="Joana Prado", cargo="Gerente")
+    await criar_funcionarios(cliente, 1, inicio=3, nome="Maria Souza", cargo="Joalheira")
+
+    assert await ids_encontrados(cliente, "JOAO") == [1, 2]  # Exato antes do aproximado ("joana")
+    # Prefixo no nome (peso 3) vem antes do prefixo no cargo (peso 1,5)
+    encontrados = await ids_encontrados(cliente, "joa")
+    assert sorted(encontrados[:2]) == [1, 2] and encontrados[2:] == [3]
+    assert await ids_encontrados(cliente, "silvs") == [1]
+    assert await ids_encontrados(cliente, "joana gerente") == [2]
+    assert await ids_encontrados(cliente, "000.002") == [2]
+
+async def test_escritas_entram_no_indice_sem_recarga(cliente):
+    await criar_funcionarios(cliente, 2)
+    assert await ids_encontrados(cliente, "diretor") == []
+
+    await cliente.put("/api/v1/funcionarios/2", json={"cargo": "Diretor"})
+    assert await ids_encontrados(cliente, "diretor") == [2]
+
+    await cliente.delete("/api/v1/funcionarios/2")
+    assert await ids_encontrados(cliente, "diretor") == []
+    assert await ids_encontrados(cliente, "diretor", ativo=False) == [2]
+
+def test_busca_usa_o_indice_atual_enquanto_a_recarga_monta_o_novo():
+    indice = IndiceBusca()
+    indice.carregar([registro(1, "Ana")])
+    liberar = threading.Event()
+
+    def registros_lentos():
+        yield registro(1, "Ana")
+        liberar.wait(5)
+        yield registro(2, "Bruno")
+
+    recarga = threading.Thread(target=indice.carregar, args=(registros_lentos(),))
+    recarga.start()
+    inicio = time.monotonic()
+    assert [r["id"] for r in indice.buscar("ana")] == [1]
+    indice.atualizar(registro(3, "Carla"))
+    assert time.monotonic() - inicio < 1
+    liberar.set()
+    recarga.join()
+    assert [r["id"] for r in indice.buscar("bruno")] == [2]
+
+def test_escritas_durante_a_recarga_sao_reaplicadas_ao_indice_novo():
+    indice = IndiceBusca()
+    indice.carregar([registro(1, "Ana")])
+    geracao = indice.iniciar_carga()
+    indice.atualizar(registro(1, "Ana", cargo="Gerente"))  # Depois do SELECT da recarga
+    indice.carregar([registro(1, "Ana")], geracao)
+    assert [r["cargo"] for r in indice.buscar("ana")] == ["Gerente"]
+    assert not indice.precisa_carregar
+
+def test_invalidacao_durante_a_recarga_forca_outra_recarga():
+    indice = IndiceBusca()
+    geracao = indice.iniciar_carga()
+    indice.invalidar()  # Ex.: importação concluída depois do SELECT da recarga
+    indice.carregar([registro(1, "Ana")], geracao)
+    assert indice.precisa_carregar
+
+def test_similaridade_aproximada_e_o_coeficiente_de_dice_dos_trigramas():
+    indice = IndiceBusca()
+    indice.carregar([registro(1, "Silva"), registro(2, "Ananas")])
+    # "silvs" x "silva": 4 trigramas comuns de 6 + 6 -> 2/3; nota = 0,6 x 2/3 x peso do nome (3)
+    assert indice.buscar("silvs")[0]["relevancia"] == 1.2
+    # "ananas" tem 7 janelas mas 6 trigramas distintos ("ana" repete): "ananaz" divide 4 -> 2/3
+    assert indice.buscar("ananaz")[0]["relevancia"] == 1.2
@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import criar_funcionarios
+
+pytestmark = pytest.mark.anyio
+
+async def test_put_com_if_match_antigo_responde_412_sem_erro_de_sessao(cliente, capsys):
+    await criar_funcionarios(cliente, 1)
+    etag = (await cliente.get("/api/v1/funcionarios/1")).headers["ETag"]
+    assert (await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"})).status_code == 200
+
+    resposta = await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Diretor"}, headers={"If-Match": etag})
+    assert resposta.status_code == 412
+    assert (await cliente.get("/api/v1/funcionarios/1")).json()["cargo"] == "Gerente"
+    assert "Erro na sessão do banco de dados" not in capsys.readouterr().out
+
+async def test_get_de_funcionario_responde_304_ate_a_proxima_escrita(cliente):
+    await criar_funcionarios(cliente, 1)
+    resposta = await cliente.get("/api/v1/funcionarios/1")
+    etag = resposta.headers["ETag"]
+    assert resposta.headers["Cache-Control"] == "private, no-cache"
+    assert "Last-Modified" in resposta.headers
+
+    nao_modificado = await cliente.get("/api/v1/funcionarios/1", headers={"If-None-Match": f'W/{etag}, "outro"'})
+    assert nao_modificado.status_code == 304
+    assert nao_modificado.content == b"" and nao_modificado.headers["ETag"] == etag
+
+    await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"})
+    resposta = await cliente.get("/api/v1/funcionarios/1", headers={"If-None-Match": etag})
+    assert resposta.status_code == 200 and resposta.headers["ETag"] != etag
+
+async def test_etag_da_pagina_muda_com_a_escrita_de_um_item_dela(cliente):
+    await criar_funcionarios(cliente, 4)
+    etag = (await cliente.get("/api/v1/funcionarios", params={"limit": 2})).headers["ETag"]
+    assert (await cliente.get("/api/v1/funcionarios", params={"limit": 2}, headers={"If-None-Match": etag})).status_code == 304
+    # Outra consulta (outro limite) tem outro ETag
+    assert (await cliente.get("/api/v1/funcionarios", params={"limit": 3}, headers={"If-None-Match": etag})).status_code == 200
+
+    # A página lê limit + 1 linhas (a extra decide o next_cursor): o 4 fica de fora
+    await cliente.put("/api/v1/funcionarios/4", json={"cargo": "Gerente"})
+    assert (await cliente.get("/api/v1/funcionarios", params={"limit": 2}, headers={"If-None-Match": etag})).status_code == 304
+    await cliente.put("/api/v1/funcionarios/2", json={"cargo": "Gerente"})
+    assert (await cliente.get("/api/v1/funcionarios", params={"limit": 2}, headers={"If-None-Match": etag})).status_code == 200
+
+async def test_put_com_if_match_atual_grava_e_devolve_o_novo_etag(cliente):
+    await criar_funcionarios(cliente, 1)
+    etag = (await cliente.get("/api/v1/funcionarios/1")).headers["ETag"]
+
+    resposta = await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"}, headers={"If-Match": etag})
+    assert resposta.status_code == 200
+    novo = resposta.headers["ETag"]
+    assert novo != etag
+    assert (await cliente.get("/api/v1/funcionarios/1")).headers["ETag"] == novo
+    # Sem If-Match a escrita não é condicional
+    assert (await cliente.put("/api/v1/funcionarios/1", json={"cargo": "Diretor"})).status_code == 200
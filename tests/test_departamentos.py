@@ -0,0 +1,41 @@
+import pytest
+
+import database
+from conftest import criar_funcionarios
+from departamentos import cache_departamentos, invalidar_departamentos, obter_resumo_departamentos
+
+pytestmark = pytest.mark.anyio
+
+RESUMO = "/api/v1/departamentos/resumo"
+
+async def test_resumo_acompanha_as_escritas(cliente):
+    await criar_funcionarios(cliente, 2, salario=1000)
+    await criar_funcionarios(cliente, 1, inicio=3, departamento="RH", salario=2000)
+    assert (await cliente.get(RESUMO)).json() == [
+        {"departamento": "RH", "funcionarios_ativos": 1, "folha_salarial": 2000.0},
+        {"departamento": "TI", "funcionarios_ativos": 2, "folha_salarial": 2000.0},
+    ]
+
+    await cliente.delete("/api/v1/funcionarios/3")
+    await cliente.put("/api/v1/funcionarios/1", json={"salario": 1500})
+    assert (await cliente.get(RESUMO)).json() == [
+        {"departamento": "RH", "funcionarios_ativos": 0, "folha_salarial": 0.0},
+        {"departamento": "TI", "funcionarios_ativos": 2, "folha_salarial": 2500.0},
+    ]
+    assert (await cliente.get("/api/v1/departamentos")).json() == ["RH", "TI"]
+
+async def test_resumo_agregado_antes_de_uma_invalidacao_nao_fica_no_cache(cliente, monkeypatch):
+    await criar_funcionarios(cliente, 1)
+    sessao_primario = database.sessao_primario
+
+    def sessao_com_escrita_concorrente():
+        invalidar_departamentos()  # Outra requisição escreve enquanto esta agrega
+        return sessao_primario()
+
+    monkeypatch.setattr(database, "sessao_primario", sessao_com_escrita_concorrente)
+    assert [d["departamento"] for d in await obter_resumo_departamentos()] == ["TI"]
+    assert cache_departamentos.obter("resumo") is None
+
+    monkeypatch.setattr(database, "sessao_primario", sessao_primario)
+    await obter_resumo_departamentos()
+    assert cache_departamentos.obter("resumo") is not None
@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+import os
+
+import httpx
+import pytest
+
+from estaticos import ArquivosEstaticos
+
+pytestmark = pytest.mark.anyio
+
+CSS = b"body { color: #333; }\n" * 100  # Acima de STATIC_COMPRESS_MIN_SIZE
+JS = b"console.log('rh');\n"
+
+@pytest.fixture
+def pasta(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css" / "styles.css").write_bytes(CSS)
+    (tmp_path / "js" / "auth.js").write_bytes(JS)
+    (tmp_path / "index.html").write_text(
+        '<link href="css/styles.css" rel="stylesheet"><script src="js/auth.js?v=1"></script>'
+        '<script src="https://cdn.exemplo.com/lib.js"></script>'
+    )
+    return tmp_path
+
+def versionado(caminho: str, conteudo: bytes) -> str:
+    base, extensao = os.path.splitext(caminho)
+    return f"{base}.{hashlib.blake2b(conteudo, digest_size=5).hexdigest()}{extensao}"
+
+def cliente_de(estaticos: ArquivosEstaticos) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=estaticos), base_url="http://testes")
+
+async def test_html_cita_o_nome_versionado_servido_com_cache_imutavel(pasta):
+    estaticos = ArquivosEstaticos(str(pasta))
+    css = versionado("css/styles.css", CSS)
+    assert estaticos.versoes == {"css/styles.css": css, "js/auth.js": versionado("js/auth.js", JS)}
+
+    async with cliente_de(estaticos) as cliente:
+        html = await cliente.get("/")
+        # Com query string ou externo, a referência fica como está
+        assert html.text == (f'<link href="{css}" rel="stylesheet"><script src="js/auth.js?v=1"></script>'
+                             '<script src="https://cdn.exemplo.com/lib.js"></script>')
+        assert html.headers["Cache-Control"] == "no-cache"
+
+        imutavel = await cliente.get(f"/{css}", headers={"Accept-Encoding": "identity"})
+        assert imutavel.content == CSS
+        assert imutavel.headers["Cache-Control"].endswith("immutable")
+        original = await cliente.get("/css/styles.css", headers={"Accept-Encoding": "identity"})
+        assert original.headers["Cache-Control"] == "no-cache"
+        assert original.headers["ETag"] == imutavel.headers["ETag"]
+
+async def test_gzip_pelo_accept_encoding_e_304_pelo_etag(pasta):
+    async with cliente_de(ArquivosEstaticos(str(pasta))) as cliente:
+        comprimido = await cliente.get("/css/styles.css", headers={"Accept-Encoding": "gzip"})
+        assert comprimido.headers["Content-Encoding"] == "gzip" and comprimido.headers["Vary"] == "Accept-Encoding"
+        assert comprimido.content == CSS  # httpx descomprime
+        assert int(comprimido.headers["Content-Length"]) == len(gzip.compress(CSS, compresslevel=9, mtime=0))
+
+        recusado = await cliente.get("/css/styles.css", headers={"Accept-Encoding": "gzip;q=0"})
+        assert "Content-Encoding" not in recusado.headers and recusado.headers["ETag"] != comprimido.headers["ETag"]
+
+        etag = comprimido.headers["ETag"]
+        nao_modificado = await cliente.get("/css/styles.css", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert nao_modificado.status_code == 304 and nao_modificado.content == b""
+
+        # Arquivo pequeno: só a versão sem compressão, sem Vary
+        pequeno = await cliente.get("/js/auth.js", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in pequeno.headers and "Vary" not in pequeno.headers
+
+async def test_head_metodos_e_inexistentes(pasta):
+    async with cliente_de(ArquivosEstaticos(str(pasta))) as cliente:
+        head = await cliente.head("/js/auth.js")
+        assert head.status_code == 200 and head.content == b"" and head.headers["Content-Length"] == str(len(JS))
+        assert (await cliente.post("/js/auth.js")).status_code == 405
+        assert (await cliente.get("/js/nao_existe.js")).status_code == 404
+
+async def test_recarga_gera_novo_nome_quando_o_conteudo_muda(pasta):
+    estaticos = ArquivosEstaticos(str(pasta), recarregar=True)
+    antigo = estaticos.versoes["css/styles.css"]
+    novo_css = CSS + b"h1 { margin: 0; }\n"
+    (pasta / "css" / "styles.css").write_bytes(novo_css)
+    os.utime(pasta / "css" / "styles.css", ns=(1, 1))  # mtime diferente mesmo em sistemas de arquivos lentos
+
+    async with cliente_de(estaticos) as cliente:
+        html = (await cliente.get("/index.html")).text
+        novo = versionado("css/styles.css", novo_css)
+        assert novo != antigo and f'href="{novo}"' in html
+        assert (await cliente.get(f"/{antigo}")).status_code == 404
@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import criar_funcionarios
+
+pytestmark = pytest.mark.anyio
+
+FOLHA = "/api/v1/folha"
+
+def resumo(departamento, funcionarios, base, periculosidade, insalubridade, bruto, fgts) -> dict:
+    return {"departamento": departamento, "funcionarios": funcionarios, "salario_base": base,
+            "adicional_periculosidade": periculosidade, "adicional_insalubridade": insalubridade,
+            "bruto": bruto, "fgts": fgts}
+
+@pytest.fixture
+async def quadro(cliente):
+    # Mensalista com periculosidade (30% do salário base)
+    await criar_funcionarios(cliente, 1, inicio=1, salario=3000, adicional_periculosidade=30)
+    # Horista com insalubridade (20% do salário mínimo): base = 20 x 220 horas
+    await criar_funcionarios(cliente, 1, inicio=2, departamento="Produção", tipo_pagamento="Por hora",
+                             salario=20, horas_mensais=220, adicional_insalubridade=20)
+    # Aprendiz: FGTS de 2%
+    await criar_funcionarios(cliente, 1, inicio=3, salario=1000, tipo_contrato="Aprendiz")
+    # Desligado: fora da folha
+    await criar_funcionarios(cliente, 1, inicio=4, salario=9999)
+    await cliente.delete("/api/v1/funcionarios/4")
+    return cliente
+
+async def test_folha_da_empresa_e_por_departamento(quadro):
+    folha = (await quadro.get(FOLHA)).json()
+    assert folha["salario_minimo"] == 1518.0
+    assert folha["total"] == resumo(None, 3, 8400.0, 900.0, 303.6, 9603.6, 708.29)
+    assert folha["departamentos"] == [
+        resumo("Produção", 1, 4400.0, 0.0, 303.6, 4703.6, 376.29),
+        resumo("TI", 2, 4000.0, 900.0, 0.0, 4900.0, 332.0),
+    ]
+
+async def test_folha_de_um_departamento(quadro):
+    folha = (await quadro.get(FOLHA, params={"departamento": "TI"})).json()
+    assert folha["total"] == resumo(None, 2, 4000.0, 900.0, 0.0, 4900.0, 332.0)
+    assert [d["departamento"] for d in folha["departamentos"]] == ["TI"]
+
+async def test_folha_sem_funcionarios(cliente):
+    folha = (await cliente.get(FOLHA)).json()
+    assert folha["total"] == resumo(None, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    assert folha["departamentos"] == []
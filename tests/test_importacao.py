@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import dados_funcionario
+
+pytestmark = pytest.mark.anyio
+
+IMPORTAR = "/api/v1/funcionarios/importar"
+
+async def importar(cliente, nome: str, conteudo: str, **params) -> dict:
+    resposta = await cliente.post(IMPORTAR, params=params, files={"arquivo": (nome, conteudo.encode())})
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+async def test_lote_com_cpf_duplicado_e_refeito_linha_a_linha(cliente):
+    linhas = [dados_funcionario(1), dados_funcionario(2), dados_funcionario(3, cpf=dados_funcionario(1)["cpf"]),
+              dados_funcionario(4)]
+    conteudo = "\n".join(json.dumps(linha) for linha in linhas) + "\n{quebrado\n\n" + json.dumps(dados_funcionario(5, salario=-1))
+
+    relatorio = await importar(cliente, "funcionarios.ndjson", conteudo, tamanho_lote=10)
+    assert (relatorio["total_linhas"], relatorio["importados"], relatorio["rejeitados"]) == (6, 3, 3)
+    assert [erro["linha"] for erro in relatorio["erros"]] == [3, 5, 7]
+    assert "JSON inválido" in relatorio["erros"][1]["erros"][0]
+    assert relatorio["erros"][2]["erros"][0].startswith("salario")
+
+    itens = (await cliente.get("/api/v1/funcionarios")).json()["itens"]
+    assert [f["nome"] for f in itens] == ["Funcionário 1", "Funcionário 2", "Funcionário 4"]
+    # A importação invalida o índice de busca: os importados já aparecem
+    assert [f["nome"] for f in (await cliente.get("/api/v1/funcionarios/search", params={"q": "funcionario"})).json()] \
+        == ["Funcionário 1", "Funcionário 2", "Funcionário 4"]
+
+async def test_csv_em_varios_lotes_com_beneficiarios(cliente):
+    beneficiario = {"nome": "Filho", "data_nascimento": "2015-05-05", "parentesco": "Filho"}
+    linhas = [dados_funcionario(i, beneficiarios=[beneficiario] if i == 2 else []) for i in (1, 2, 3)]
+    saida = io.StringIO()
+    escritor = csv.DictWriter(saida, fieldnames=list(linhas[0]))
+    escritor.writeheader()
+    for linha in linhas:
+        escritor.writerow({**linha, "beneficiarios": json.dumps(linha["beneficiarios"])})
+
+    relatorio = await importar(cliente, "funcionarios.csv", saida.getvalue(), tamanho_lote=2)
+    assert (relatorio["importados"], relatorio["lotes"], relatorio["erros"]) == (3, 2, [])
+    assert [b["nome"] for b in (await cliente.get("/api/v1/funcionarios/2")).json()["beneficiarios"]] == ["Filho"]
+
+async def test_formato_nao_suportado(cliente):
+    resposta = await cliente.post(IMPORTAR, files={"arquivo": ("funcionarios.xlsx", b"x")})
+    assert resposta.status_code == 400
@@ -0,0 +1,41 @@
+import pytest
+
+import database
+from conftest import criar_funcionarios
+from indicadores import RegistroIndicadores, garantir_indicadores, indicadores
+
+pytestmark = pytest.mark.anyio
+
+HEADCOUNT = "/api/v1/indicadores/headcount"
+
+def grupos(headcount: dict, dimensao: str) -> dict:
+    return {g["grupo"]: g["funcionarios"] for g in headcount[dimensao]}
+
+async def test_headcount_acompanha_as_escritas_sem_reagregar(cliente):
+    await criar_funcionarios(cliente, 2)
+    assert (await cliente.get(HEADCOUNT)).json()["total"] == 2
+    carregado_em = indicadores.carregado_em
+
+    await criar_funcionarios(cliente, 1, inicio=3, departamento="RH")
+    await cliente.put("/api/v1/funcionarios/1", json={"departamento": "RH"})
+    await cliente.delete("/api/v1/funcionarios/2")
+    headcount = (await cliente.get(HEADCOUNT)).json()
+    assert headcount["total"] == 2 and grupos(headcount, "departamento") == {"RH": 2}
+    assert indicadores.carregado_em == carregado_em  # Diferenças aplicadas em memória
+
+async def test_escrita_durante_a_agregacao_marca_os_indicadores_para_recarga(cliente, monkeypatch):
+    await criar_funcionarios(cliente, 1)
+    sessao_primario = database.sessao_primario
+    novo = RegistroIndicadores(True, "RH", "CLT", "Superior", 1, (2020, 1), None)
+
+    def sessao_com_escrita_concorrente():
+        indicadores.atualizar(None, novo)  # Outra requisição grava enquanto esta agrega
+        return sessao_primario()
+
+    monkeypatch.setattr(database, "sessao_primario", sessao_com_escrita_concorrente)
+    await garantir_indicadores()
+    assert indicadores.precisa_carregar
+
+    monkeypatch.setattr(database, "sessao_primario", sessao_primario)
+    await garantir_indicadores()
+    assert not indicadores.precisa_carregar and indicadores.headcount()["total"] == 1
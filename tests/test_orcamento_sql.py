@@ -0,0 +1,40 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from instrumentacao import InstrumentacaoMiddleware, OrcamentoSQLExcedido, orcamento_sql
+
+engine = create_engine("sqlite://")
+
+def criar_app(modo_orcamento: str) -> FastAPI:
+    """App mínimo com uma rota de orçamento 2 que executa `n` comandos SQL."""
+    app = FastAPI()
+    app.add_middleware(InstrumentacaoMiddleware, modo_orcamento=modo_orcamento, metricas=False, perfilar=False)
+
+    @app.get("/comandos/{n}", dependencies=[Depends(orcamento_sql(2))])
+    def executar(n: int):
+        with engine.connect() as conexao:
+            for _ in range(n):
+                conexao.execute(text("SELECT 1"))
+        return {"comandos": n}
+
+    return app
+
+def test_dentro_do_orcamento_responde_normalmente():
+    resposta = TestClient(criar_app("raise")).get("/comandos/2")
+    assert resposta.status_code == 200
+    assert resposta.headers["x-sql-queries"] == "2"
+
+def test_orcamento_excedido_falha_antes_de_enviar_a_resposta():
+    with pytest.raises(OrcamentoSQLExcedido, match="executou 3 comandos SQL"):
+        TestClient(criar_app("raise")).get("/comandos/3")
+
+def test_orcamento_excedido_chega_ao_cliente_como_erro():
+    resposta = TestClient(criar_app("raise"), raise_server_exceptions=False).get("/comandos/3")
+    assert resposta.status_code == 500
+
+def test_modo_log_apenas_avisa(caplog):
+    resposta = TestClient(criar_app("log")).get("/comandos/3")
+    assert resposta.status_code == 200
+    assert "executou 3 comandos SQL (orçamento: 2)" in caplog.text
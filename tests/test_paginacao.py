@@ -0,0 +1,52 @@
+import pytest
+
+from conftest import criar_funcionarios
+
+pytestmark = pytest.mark.anyio
+
+LISTA = "/api/v1/funcionarios"
+
+async def percorrer(cliente, **params) -> list:
+    """Segue os next_cursor até o fim e devolve os ids de cada página."""
+    paginas, cursor = [], None
+    while True:
+        resposta = await cliente.get(LISTA, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resposta.status_code == 200, resposta.text
+        pagina = resposta.json()
+        paginas.append([f["id"] for f in pagina["itens"]])
+        cursor = pagina["next_cursor"]
+        if cursor is None:
+            return paginas
+
+async def test_next_cursor_percorre_todos_os_funcionarios_uma_vez(cliente):
+    await criar_funcionarios(cliente, 5)
+    assert await percorrer(cliente, limit=2) == [[1, 2], [3, 4], [5]]
+    # Página exata: sem next_cursor, sem página vazia no fim
+    assert await percorrer(cliente, limit=5) == [[1, 2, 3, 4, 5]]
+
+async def test_cursor_segue_os_filtros_e_nao_repete_com_insercoes_no_meio(cliente):
+    await criar_funcionarios(cliente, 2, departamento="RH")
+    await criar_funcionarios(cliente, 3, inicio=3)
+    await cliente.delete("/api/v1/funcionarios/4")
+
+    primeira = (await cliente.get(LISTA, params={"departamento": "TI", "limit": 1})).json()
+    assert [f["id"] for f in primeira["itens"]] == [3]
+    await criar_funcionarios(cliente, 1, inicio=6)
+    resto = (await cliente.get(LISTA, params={"departamento": "TI", "cursor": primeira["next_cursor"]})).json()
+    assert [f["id"] for f in resto["itens"]] == [5, 6]
+    assert await percorrer(cliente, ativo=False) == [[4]]
+
+async def test_cursor_invalido_e_limite_fora_da_faixa(cliente):
+    assert (await cliente.get(LISTA, params={"cursor": "nao-e-cursor"})).status_code == 400
+    assert (await cliente.get(LISTA, params={"limit": 0})).status_code == 422
+    assert (await cliente.get(LISTA, params={"limit": 1001})).status_code == 422
+
+async def test_fields_e_stream(cliente):
+    await criar_funcionarios(cliente, 3)
+    pagina = (await cliente.get(LISTA, params={"fields": "nome,cargo", "limit": 2})).json()
+    assert pagina["itens"] == [{"id": 1, "nome": "Funcionário 1", "cargo": "Analista"},
+                               {"id": 2, "nome": "Funcionário 2", "cargo": "Analista"}]
+    assert pagina["next_cursor"] is not None
+
+    todos = (await cliente.get(LISTA, params={"stream": True})).json()
+    assert [f["id"] for f in todos] == [1, 2, 3]
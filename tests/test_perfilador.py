@@ -0,0 +1,39 @@
+import threading
+import time
+
+import perfilador
+from perfilador import PerfiladorAmostragem
+
+def test_requisicao_lenta_e_gravada_pela_thread_de_amostragem(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfilador, "PROFILER_DIR", str(tmp_path))
+    amostrador, gravacoes = PerfiladorAmostragem(intervalo_ms=1), []
+    gravar = amostrador._gravar
+
+    def gravar_registrando(*args):
+        caminho = gravar(*args)
+        gravacoes.append((threading.current_thread().name, caminho))
+        return caminho
+
+    monkeypatch.setattr(amostrador, "_gravar", gravar_registrando)
+    inicio = amostrador.iniciar_requisicao()
+    time.sleep(0.05)
+    assert amostrador.finalizar_requisicao(inicio, "GET /funcionarios/{id}", limite_ms=10)
+
+    limite = time.monotonic() + 5
+    while not gravacoes and time.monotonic() < limite:
+        time.sleep(0.01)
+    [(thread, caminho)] = gravacoes
+    assert thread == "perfilador"
+    assert caminho.endswith("_GET_funcionarios_id.folded")
+    linhas = open(caminho, encoding="utf-8").read().splitlines()
+    assert linhas and all(linha.rsplit(" ", 1)[1].isdigit() for linha in linhas)
+    assert any("test_requisicao_lenta" in linha for linha in linhas)  # A pilha da thread principal
+
+def test_requisicao_rapida_nao_grava(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfilador, "PROFILER_DIR", str(tmp_path))
+    amostrador = PerfiladorAmostragem(intervalo_ms=1)
+    inicio = amostrador.iniciar_requisicao()
+    assert not amostrador.finalizar_requisicao(inicio, "GET /", limite_ms=10_000)
+    time.sleep(0.05)
+    assert list(tmp_path.iterdir()) == []
+    assert not amostrador._ativo.is_set()  # Sem requisições nem gravações: a thread volta a dormir
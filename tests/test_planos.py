@@ -0,0 +1,72 @@
+"""
+Planos de execução das consultas quentes: EXPLAIN QUERY PLAN no SQLite dos testes e, com
+TEST_POSTGRES_URL, EXPLAIN com enable_seqscan=off num PostgreSQL de testes. Nenhuma consulta
+quente pode varrer uma tabela inteira.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+import database
+from alteracoes import consulta_alteracoes
+from auth import consulta_usuario
+from consultas import CARREGAR_BENEFICIARIOS, consulta_funcionario, consulta_historico, pagina_funcionarios
+from departamentos import consulta_resumo_departamentos
+from indicadores import consultas_indicadores
+from models import BeneficiarioDB, FuncionarioDB
+
+# 🔥 Consultas das rotas, montadas pelos mesmos construtores que elas usam
+_PAGINA = select(FuncionarioDB).options(CARREGAR_BENEFICIARIOS)
+CONSULTAS = {
+    "listar_ativos_pagina": pagina_funcionarios(_PAGINA, None, True, None, 100),
+    "listar_ativos_por_departamento": pagina_funcionarios(_PAGINA, "TI", True, None, 100),
+    "listar_inativos_por_departamento": pagina_funcionarios(_PAGINA, "TI", False, None, 100),
+    "buscar_por_id": consulta_funcionario(1),
+    # A consulta que o selectinload de CARREGAR_BENEFICIARIOS emite para uma página
+    "beneficiarios_dos_funcionarios": select(BeneficiarioDB).where(BeneficiarioDB.funcionario_id.in_([1, 2, 3])),
+    "alteracoes_desde": consulta_alteracoes((1, None), 100),
+    "historico_funcionario": consulta_historico(1, None, 100),
+    "usuario_por_email": consulta_usuario("admin@rh.com"),
+    "resumo_departamentos": consulta_resumo_departamentos(),
+    **{f"indicadores_{nome}": consulta for nome, consulta in consultas_indicadores().items()},
+}
+
+# 📊 Únicas exceções: agregações dos caches de departamentos e indicadores, que leem a tabela
+# inteira por natureza, uma vez por TTL
+VARREDURA_PERMITIDA = {"resumo_departamentos", "indicadores_ativos", "indicadores_admissoes", "indicadores_desligamentos"}
+
+@pytest.fixture(scope="module", params=["sqlite", "postgresql"])
+def motor(request, tmp_path_factory):
+    if request.param == "sqlite":
+        motor = create_engine(f"sqlite:///{tmp_path_factory.mktemp('planos')}/planos.db")
+    else:
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL não definida")
+        motor = create_engine(url)
+        database.Base.metadata.drop_all(bind=motor)
+    database.Base.metadata.create_all(bind=motor)
+    yield motor
+    motor.dispose()
+
+def explicar(motor, consulta) -> list:
+    """Linhas do plano de execução da consulta."""
+    sql = str(consulta.compile(dialect=motor.dialect, compile_kwargs={"literal_binds": True}))
+    with motor.connect() as conexao:
+        if motor.dialect.name == "sqlite":
+            return [linha[-1] for linha in conexao.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        # Em tabelas pequenas o PostgreSQL prefere Seq Scan; desligar mostra se existe índice utilizável
+        conexao.execute(text("SET LOCAL enable_seqscan = off"))
+        return [linha[0] for linha in conexao.execute(text(f"EXPLAIN {sql}"))]
+
+def varreduras_completas(motor, plano: list) -> list:
+    if motor.dialect.name == "sqlite":
+        return [linha for linha in plano if linha.startswith("SCAN ")]  # SEARCH = acesso por índice
+    return [linha for linha in plano if "Seq Scan" in linha]
+
+@pytest.mark.parametrize("nome", CONSULTAS)
+def test_consulta_quente_nao_varre_a_tabela(motor, nome):
+    plano = explicar(motor, CONSULTAS[nome])
+    if nome not in VARREDURA_PERMITIDA:
+        assert not varreduras_completas(motor, plano), "\n".join(plano)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import database
+from conftest import autenticar, criar_funcionarios, dados_funcionario
+from models import FuncionarioCreate, FuncionarioDB
+from replicas import Replica, Roteador
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(params=[False, True], ids=["em_thread", "assincronas"])
+def replica(request, banco, tmp_path, monkeypatch):
+    """Réplica SQLite própria, com o funcionário 1 no cargo "Réplica" (o primário tem "Analista")."""
+    monkeypatch.setattr(database, "SESSOES_ASSINCRONAS", request.param)
+    url = f"sqlite:///{tmp_path}/replica.db"
+    replica = Replica("replica1", database.criar_engine(url), database.criar_engine_assincrono(url))
+    database.Base.metadata.create_all(bind=replica.engine)
+    with Session(replica.engine) as sessao:
+        sessao.add(FuncionarioDB(**FuncionarioCreate(**dados_funcionario(1, cargo="Réplica")).model_dump(exclude={"beneficiarios"})))
+        sessao.commit()
+    yield replica
+    replica.engine.dispose()
+
+@pytest.fixture
+async def com_replica(cliente, replica, monkeypatch):
+    await criar_funcionarios(cliente, 1)  # Ainda sem réplicas: não prende o cliente ao primário
+    monkeypatch.setattr(database.roteador, "replicas", [replica])
+    yield cliente
+    await replica.async_engine.dispose()
+
+async def cargo(cliente, **cabecalhos) -> str:
+    resposta = await cliente.get("/api/v1/funcionarios/1", headers=cabecalhos)
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()["cargo"]
+
+async def test_leituras_vao_para_a_replica_e_escritas_para_o_primario(com_replica, replica):
+    assert await cargo(com_replica) == "Réplica"
+    assert (await com_replica.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"})).status_code == 200
+    for motor, esperado in ((database.engine, "Gerente"), (replica.engine, "Réplica")):
+        with Session(motor) as sessao:
+            assert sessao.get(FuncionarioDB, 1).cargo == esperado
+
+async def test_cliente_que_escreveu_le_do_primario_durante_a_aderencia(com_replica):
+    outro = await autenticar(com_replica, "outro@rh.com")
+    await com_replica.put("/api/v1/funcionarios/1", json={"cargo": "Gerente"})
+
+    assert await cargo(com_replica) == "Gerente"  # Lê a própria escrita
+    assert await cargo(com_replica, Authorization=outro) == "Réplica"  # Outros clientes seguem na réplica
+
+    database.roteador.aderencia.limpar()  # Fim da janela DB_REPLICA_STICKY_SECONDS
+    assert await cargo(com_replica) == "Réplica"
+
+async def test_replica_fora_do_rodizio_manda_as_leituras_ao_primario(com_replica, replica):
+    replica.marcar_indisponivel("teste")
+    assert await cargo(com_replica) == "Analista"
+
+    await replica.verificar()  # Respondeu ao SELECT 1: volta ao rodízio
+    assert await cargo(com_replica) == "Réplica"
+
+def test_erro_de_conexao_retira_a_replica_do_rodizio(tmp_path):
+    url = f"sqlite:///{tmp_path}/nao_existe/replica.db"
+    replica = Replica("replica1", database.criar_engine(url), database.criar_engine_assincrono(url))
+    with pytest.raises(OperationalError):
+        with replica.engine.connect():
+            pass
+    assert not replica.disponivel
+    assert Roteador([replica]).escolher() is None  # Sem réplica disponível: primário
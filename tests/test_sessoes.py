@@ -0,0 +1,42 @@
+import anyio
+import pytest
+from sqlalchemy import func, select
+
+import auth
+import database
+from cache import CacheTTL
+from conftest import dados_funcionario
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(params=[False, True], ids=["em_thread", "assincronas"])
+def modo_sessoes(request, monkeypatch):
+    monkeypatch.setattr(database, "SESSOES_ASSINCRONAS", request.param)
+    return request.param
+
+async def test_escritas_concorrentes_alem_do_pool_nao_travam(cliente, modo_sessoes, monkeypatch):
+    # Sem cache de usuários, toda requisição consulta o usuário antes da rota, como no primeiro acesso
+    monkeypatch.setattr(auth, "cache_usuarios", CacheTTL(ttl=0))
+    vagas = database.DB_POOL_SIZE + database.DB_MAX_OVERFLOW
+    respostas = []
+
+    async def criar(i: int) -> None:
+        respostas.append(await cliente.post("/api/v1/funcionarios", json=dados_funcionario(i)))
+
+    with anyio.fail_after(15):
+        async with anyio.create_task_group() as tarefas:
+            for i in range(vagas * 8):
+                tarefas.start_soon(criar, i)
+
+    assert [r.status_code for r in respostas] == [201] * vagas * 8
+    assert len({r.json()["id"] for r in respostas}) == vagas * 8
+
+async def test_vaga_do_pool_fica_reservada_so_durante_a_transacao(banco):
+    vagas, total = database._vagas_sessoes, database.DB_POOL_SIZE + database.DB_MAX_OVERFLOW
+    async with database.SessaoEmThread(database.SessionRotas()) as db:
+        assert vagas._value == total  # Sessão aberta e ociosa não segura conexão
+        await db.scalar(select(func.count()).select_from(database.UsuarioRH))
+        assert vagas._value == total - 1
+        await db.commit()
+        assert vagas._value == total
+    assert vagas._value == total